@@ -27,6 +27,7 @@ ROOT_PROMPT = """
     1. Greet the user and request a brand name. This brand is a required input to move forward.
     2. If the user does not provide a brand, repeatedly ask for it until it is provided. Do not proceed until you have a brand name.
     3. Once brand name has been provided go on to the next step.
+    4. If the user provides several brands for a batch report, skip the <Steps> and call `comparison_root_agent` to compare all the brands at once.
     </Gather Brand Name>
 
     <Steps>
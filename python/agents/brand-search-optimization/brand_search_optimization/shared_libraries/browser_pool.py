@@ -0,0 +1,233 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Defines a pool of headless browsers shared by agent sessions."""
+
+import shutil
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+import selenium
+from selenium.webdriver.chrome.options import Options
+
+from . import constants
+
+
+class Browser:
+    """A pooled web driver, with its own profile directory."""
+
+    def __init__(self, driver, profile_dir: Optional[str] = None):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.pages = 0
+        self.last_session: Optional[str] = None
+        self.last_used = time.monotonic()
+        # Per-session state, e.g. the last page outline sent to the model.
+        self.session_state: dict = {}
+
+    def get(self, url: str):
+        """Navigates to a URL, counting the page towards recycling."""
+        self.pages += 1
+        self.last_used = time.monotonic()
+        self.driver.get(url)
+
+    def clear_session(self):
+        """Clears the cookies and storage left by the previous session, and its page."""
+        if hasattr(self.driver, "execute_cdp_cmd"):  # Chrome: all origins at once.
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            self.driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"}
+            )
+        self.driver.delete_all_cookies()
+        self.driver.execute_script(
+            "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+        )
+        self.driver.get("about:blank")
+
+    def is_healthy(self) -> bool:
+        try:
+            self.driver.current_url  # Fails once the browser is gone.
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+def create_chrome_browser() -> Browser:
+    """Starts a Chrome browser with a fresh profile directory."""
+    if constants.DISABLE_WEB_DRIVER:
+        raise RuntimeError("The web driver is disabled by DISABLE_WEB_DRIVER.")
+    profile_dir = tempfile.mkdtemp(prefix="selenium-")
+    options = Options()
+    if constants.BROWSER_HEADLESS:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920x1080")
+    options.add_argument(f"user-data-dir={profile_dir}")
+    return Browser(selenium.webdriver.Chrome(options=options), profile_dir)
+
+
+class BrowserPool:
+    """
+    Lends browsers to sessions, one session per browser at a time.
+
+    Browsers are started lazily, up to max_browsers. A session gets back its
+    previous browser if it is idle, so browsing carries on across turns; a
+    browser lent to another session is cleared of the previous session's
+    cookies and storage first. A browser is health-checked when lent, and
+    replaced after max_pages pages. Leases unused for lease_ttl_secs, e.g. of
+    sessions whose agent never finished, are reclaimed.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Browser] = create_chrome_browser,
+        max_browsers: int = constants.BROWSER_POOL_SIZE,
+        max_pages: int = constants.BROWSER_MAX_PAGES,
+        lease_ttl_secs: float = constants.BROWSER_LEASE_TTL_SECS,
+    ):
+        self.factory = factory
+        self.max_browsers = max_browsers
+        self.max_pages = max_pages
+        self.lease_ttl_secs = lease_ttl_secs
+        self._idle: list[Browser] = []
+        self._leases: dict[str, Browser] = {}
+        self._size = 0
+        self._available = threading.Condition()
+
+    def _take_idle(self, session_id: str) -> Optional[Browser]:
+        for browser in self._idle:
+            if browser.last_session == session_id:
+                self._idle.remove(browser)
+                return browser
+        return self._idle.pop() if self._idle else None
+
+    def _put_back(self, browser: Browser) -> bool:
+        """Returns a lent browser to the idle ones; returns whether to quit it instead."""
+        self._available.notify()
+        if browser.pages < self.max_pages:
+            self._idle.append(browser)
+            return False
+        self._size -= 1
+        return True
+
+    def _reclaim_expired(self) -> list[Browser]:
+        """Ends the leases unused for lease_ttl_secs; returns the browsers to quit."""
+        now = time.monotonic()
+        recycled = []
+        for session_id, browser in list(self._leases.items()):
+            if now - browser.last_used >= self.lease_ttl_secs:
+                del self._leases[session_id]
+                if self._put_back(browser):
+                    recycled.append(browser)
+        return recycled
+
+    def acquire(self, session_id: str, timeout: Optional[float] = None) -> Browser:
+        """
+        Returns the browser lent to a session, lending one if needed.
+
+        Blocks until a browser is available; call from a worker thread.
+
+        Args:
+            session_id: The session to lend the browser to.
+            timeout: Seconds to wait for a browser, or None to wait forever.
+
+        Returns:
+            The session's browser.
+
+        Raises:
+            TimeoutError: if no browser became available in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        recycled = []
+        with self._available:
+            browser = self._leases.get(session_id)
+            if browser is not None:
+                browser.last_used = time.monotonic()
+                return browser
+            while True:
+                recycled += self._reclaim_expired()
+                if self._idle or self._size < self.max_browsers:
+                    break
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    raise TimeoutError("No browser available.")
+                # Wake up for the next lease to expire, if before the deadline.
+                waits = [
+                    lent.last_used + self.lease_ttl_secs - now
+                    for lent in self._leases.values()
+                ]
+                if deadline is not None:
+                    waits.append(deadline - now)
+                self._available.wait(max(min(waits), 0) if waits else None)
+            browser = self._take_idle(session_id)
+            if browser is None:
+                self._size += 1  # Reserved, the browser starts outside the lock.
+
+        for expired in recycled:
+            expired.quit()
+        if browser is not None and not browser.is_healthy():
+            browser.quit()
+            browser = None
+        if browser is not None and browser.last_session not in (None, session_id):
+            try:
+                browser.clear_session()
+            except Exception as e:
+                print(f"Error clearing browser session, replacing the browser: {e}")
+                browser.quit()
+                browser = None
+        if browser is None:
+            try:
+                browser = self.factory()
+            except Exception:
+                with self._available:
+                    self._size -= 1
+                    self._available.notify()
+                raise
+
+        with self._available:
+            if browser.last_session != session_id:
+                browser.session_state = {}
+            browser.last_session = session_id
+            browser.last_used = time.monotonic()
+            self._leases[session_id] = browser
+        return browser
+
+    def release(self, session_id: str):
+        """Returns the browser lent to a session, if any, to the pool."""
+        with self._available:
+            browser = self._leases.pop(session_id, None)
+            if browser is None or not self._put_back(browser):
+                return
+        browser.quit()  # Recycled: a new browser starts on the next demand.
+
+    def close(self):
+        """Quits all idle browsers; lent ones are quit when released."""
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self.max_pages = 0
+        for browser in idle:
+            browser.quit()
+
+
+browser_pool = BrowserPool()
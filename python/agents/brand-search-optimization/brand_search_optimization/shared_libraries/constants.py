@@ -27,6 +27,24 @@ LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "global")
 MODEL = os.getenv("MODEL", "gemini-2.5-flash")
 DATASET_ID = os.getenv("DATASET_ID", "products_data_agent")
 TABLE_ID = os.getenv("TABLE_ID", "shoe_items")
+# Seconds between syncs of the in-memory product index from the table; 0 disables the index.
+PRODUCT_INDEX_SYNC_SECS = int(os.getenv("PRODUCT_INDEX_SYNC_SECS", "3600"))
 DISABLE_WEB_DRIVER = int(os.getenv("DISABLE_WEB_DRIVER", "0"))
+# Browsers shared by concurrent sessions, and pages a browser loads before it is replaced.
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "4"))
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+BROWSER_HEADLESS = int(os.getenv("BROWSER_HEADLESS", "1"))
+# Seconds a tool waits for a free browser, and after which an unused lease is reclaimed.
+BROWSER_ACQUIRE_TIMEOUT_SECS = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT_SECS", "120"))
+BROWSER_LEASE_TTL_SECS = float(os.getenv("BROWSER_LEASE_TTL_SECS", "600"))
+# Screenshots are saved as artifacts in this format (png, jpeg or webp), downscaled to the width (0 keeps it).
+SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "webp").lower()
+SCREENSHOT_FORMAT = {"jpg": "jpeg"}.get(SCREENSHOT_FORMAT, SCREENSHOT_FORMAT)
+if SCREENSHOT_FORMAT not in ("png", "jpeg", "webp"):
+    raise ValueError(
+        f"SCREENSHOT_FORMAT must be png, jpeg or webp, not {SCREENSHOT_FORMAT!r}."
+    )
+SCREENSHOT_MAX_WIDTH = int(os.getenv("SCREENSHOT_MAX_WIDTH", "1280"))
+SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", "80"))
 WHL_FILE_NAME = os.getenv("ADK_WHL_FILE", "")
 STAGING_BUCKET = os.getenv("STAGING_BUCKET", "")
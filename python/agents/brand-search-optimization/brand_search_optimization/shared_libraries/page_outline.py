@@ -0,0 +1,236 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Distills web pages into compact outlines of their content and controls."""
+
+from dataclasses import dataclass
+import hashlib
+from html.parser import HTMLParser
+import re
+from typing import Optional
+
+from selenium.webdriver.common.by import By
+
+MAX_ITEMS = 400
+MAX_TEXT = 120
+
+_SKIPPED_TAGS = frozenset(
+    {"script", "style", "noscript", "template", "svg", "iframe", "canvas"}
+)
+_VOID_TAGS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+     "meta", "source", "track", "wbr"}
+)
+_HEADINGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+_CONTROLS = frozenset({"button", "select", "textarea"})
+_PRODUCT_CLASS_RE = re.compile(r"title|product[-_]?name|item[-_]?name", re.I)
+_HIDDEN_STYLE_RE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+
+
+@dataclass(frozen=True)
+class OutlineItem:
+    """An element of a page outline."""
+
+    id: str  # Stable across page loads, as long as the element is unchanged.
+    kind: str  # title, heading, product, link, button, input, select or textarea.
+    text: str
+    detail: str = ""  # The link target, or the id and type of an input.
+    locator: tuple[str, str] = (By.TAG_NAME, "body")
+
+    def render(self) -> str:
+        line = f'[{self.id}] {self.kind} "{self.text}"'
+        return f"{line} {self.detail}" if self.detail else line
+
+
+def _clean(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= MAX_TEXT else text[: MAX_TEXT - 1] + "…"
+
+
+def _xpath_literal(text: str) -> str:
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat('" + "', \"'\", '".join(text.split("'")) + "')"
+
+
+def _is_hidden(attrs: dict) -> bool:
+    return (
+        "hidden" in attrs
+        or attrs.get("aria-hidden") == "true"
+        or attrs.get("type") == "hidden"
+        or bool(_HIDDEN_STYLE_RE.search(attrs.get("style") or ""))
+    )
+
+
+class _OutlineParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items: list[tuple[str, str, str, tuple[str, str]]] = []
+        self._stack: list[str] = []  # Open tags.
+        self._skip_depth: Optional[int] = None  # Stack depth of a skipped subtree.
+        self._captures: list[dict] = []  # Open elements collecting their text.
+
+    def _emit(self, kind: str, text: str, detail: str, locator: tuple[str, str]):
+        text = _clean(text)
+        if text and len(self.items) < MAX_ITEMS:
+            self.items.append((kind, text, detail, locator))
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_depth is not None:
+            if tag not in _VOID_TAGS:
+                self._stack.append(tag)
+            return
+        attrs = {name: value or "" for name, value in attrs}
+        if tag in _SKIPPED_TAGS or _is_hidden(attrs):
+            if tag not in _VOID_TAGS:
+                self._skip_depth = len(self._stack)
+                self._stack.append(tag)
+            return
+
+        if tag == "img" and attrs.get("alt"):
+            for capture in self._captures:
+                capture["text"].append(f" {attrs['alt']} ")
+        if tag == "input":
+            label = (
+                attrs.get("aria-label")
+                or attrs.get("placeholder")
+                or attrs.get("value")
+                or attrs.get("name")
+                or "input"
+            )
+            detail = " ".join(
+                f"{key}={attrs[key]}" for key in ("id", "name", "type") if attrs.get(key)
+            )
+            self._emit("input", label, detail, self._locator(tag, attrs, label))
+        if tag in _VOID_TAGS:
+            return
+
+        self._stack.append(tag)
+        kind = None
+        if tag == "title":
+            kind = "title"
+        elif tag == "a" and attrs.get("href"):
+            kind = "link"
+        elif tag in _CONTROLS or attrs.get("role") == "button":
+            kind = "button" if tag not in ("select", "textarea") else tag
+        elif attrs.get("itemprop") in ("name", "title") or any(
+            _PRODUCT_CLASS_RE.search(token) for token in attrs.get("class", "").split()
+        ):
+            kind = "product"
+        elif tag in _HEADINGS:
+            kind = "heading"
+        if kind:
+            self._captures.append(
+                {
+                    "depth": len(self._stack),
+                    "kind": kind,
+                    "attrs": attrs,
+                    "tag": tag,
+                    "text": [attrs.get("aria-label", "")] if kind != "product" else [],
+                }
+            )
+
+    def handle_endtag(self, tag):
+        if tag not in self._stack:
+            return  # A stray end tag.
+        while self._stack:
+            depth = len(self._stack)
+            if self._skip_depth is not None and depth - 1 == self._skip_depth:
+                self._skip_depth = None
+            if self._captures and self._captures[-1]["depth"] == depth:
+                self._close(self._captures.pop())
+            if self._stack.pop() == tag:
+                return
+
+    def handle_data(self, data):
+        if self._skip_depth is None:
+            for capture in self._captures:
+                capture["text"].append(data)
+
+    def _locator(self, tag: str, attrs: dict, text: str) -> tuple[str, str]:
+        if attrs.get("id"):
+            return (By.ID, attrs["id"])
+        if tag == "a" and attrs.get("href"):
+            return (By.XPATH, f"//a[@href={_xpath_literal(attrs['href'])}]")
+        if tag == "input" and attrs.get("name"):
+            return (By.NAME, attrs["name"])
+        return (By.XPATH, f"//{tag}[normalize-space()={_xpath_literal(text)}]")
+
+    def _close(self, capture: dict):
+        text = _clean("".join(capture["text"]))
+        attrs = capture["attrs"]
+        detail = ""
+        if capture["kind"] == "link":
+            detail = f"-> {attrs['href'][:MAX_TEXT]}"
+        elif attrs.get("id"):
+            detail = f"id={attrs['id']}"
+        self._emit(
+            capture["kind"], text, detail, self._locator(capture["tag"], attrs, text)
+        )
+
+    def close(self):
+        super().close()
+        while self._captures:
+            self._close(self._captures.pop())
+
+
+def distill(html: str) -> list[OutlineItem]:
+    """
+    Distills a page into its headings, product titles, links and controls.
+
+    Scripts, styles and hidden elements are dropped. Each element gets an id
+    derived from its content, so ids stay the same across scrolls and reloads.
+
+    Args:
+        html: The page source.
+
+    Returns:
+        The outline items, in page order; at most MAX_ITEMS.
+    """
+    parser = _OutlineParser()
+    parser.feed(html)
+    parser.close()
+    items, seen = [], {}
+    for kind, text, detail, locator in parser.items:
+        key = hashlib.sha1(f"{kind}|{text}|{detail}".encode()).hexdigest()[:6]
+        seen[key] = seen.get(key, 0) + 1
+        item_id = key if seen[key] == 1 else f"{key}-{seen[key]}"
+        items.append(OutlineItem(item_id, kind, text, detail, locator))
+    return items
+
+
+def render(items: list[OutlineItem]) -> str:
+    """Renders an outline, one element per line."""
+    return "\n".join(item.render() for item in items)
+
+
+def render_diff(previous: list[OutlineItem], current: list[OutlineItem]) -> str:
+    """
+    Renders the changes between two outlines of a page.
+
+    Args:
+        previous: The outline sent before.
+        current: The outline now.
+
+    Returns:
+        The added elements prefixed with "+" and the removed ones with "-".
+    """
+    previous_ids = {item.id for item in previous}
+    current_ids = {item.id for item in current}
+    lines = [f"+ {item.render()}" for item in current if item.id not in previous_ids]
+    lines += [f"- {item.render()}" for item in previous if item.id not in current_ids]
+    return "\n".join(lines)
@@ -0,0 +1,79 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Encodes browser screenshots in memory for artifacts."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+
+from PIL import Image
+
+from . import constants
+
+# Pillow format names by file extension.
+FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+_FORMAT_ALIASES = {"jpg": "jpeg"}
+
+_encoder = ThreadPoolExecutor(
+    max_workers=constants.BROWSER_POOL_SIZE, thread_name_prefix="screenshot"
+)
+
+
+def encode_screenshot(
+    png: bytes,
+    image_format: str = constants.SCREENSHOT_FORMAT,
+    max_width: int = constants.SCREENSHOT_MAX_WIDTH,
+    quality: int = constants.SCREENSHOT_QUALITY,
+) -> tuple[bytes, str]:
+    """
+    Downscales and re-encodes a PNG screenshot.
+
+    Args:
+        png: The PNG bytes, as captured by the browser.
+        image_format: png, jpeg (or jpg) or webp.
+        max_width: The maximum width in pixels; 0 keeps the original size.
+        quality: The JPEG or WebP quality, from 1 to 100.
+
+    Returns:
+        The encoded bytes and their mime type.
+
+    Raises:
+        ValueError: If the image format is not supported.
+    """
+    image_format = image_format.lower()
+    image_format = _FORMAT_ALIASES.get(image_format, image_format)
+    if image_format not in FORMATS:
+        raise ValueError(
+            f"Unsupported screenshot format {image_format!r}; use png, jpeg or webp."
+        )
+    if image_format == "png" and not max_width:
+        return png, "image/png"
+    image = Image.open(io.BytesIO(png))
+    if max_width and image.width > max_width:
+        height = round(image.height * max_width / image.width)
+        image = image.resize((max_width, height), Image.Resampling.LANCZOS)
+    if image_format == "jpeg":
+        image = image.convert("RGB")  # JPEG has no alpha channel.
+    output = io.BytesIO()
+    image.save(output, format=FORMATS[image_format], quality=quality)
+    return output.getvalue(), f"image/{image_format}"
+
+
+async def encode_screenshot_async(png: bytes, **kwargs) -> tuple[bytes, str]:
+    """Runs encode_screenshot in a worker thread, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _encoder, lambda: encode_screenshot(png, **kwargs)
+    )
@@ -15,6 +15,7 @@
 from google.adk.agents.llm_agent import Agent
 
 from ...shared_libraries import constants
+from ...tools import batch_comparison
 from . import prompt
 
 
@@ -23,6 +24,7 @@ comparison_generator_agent = Agent(
     name="comparison_generator_agent",
     description="A helpful agent to generate comparison.",
     instruction=prompt.COMPARISON_AGENT_PROMPT,
+    tools=[batch_comparison.compare_brands_batch],
 )
 
 comparsion_critic_agent = Agent(
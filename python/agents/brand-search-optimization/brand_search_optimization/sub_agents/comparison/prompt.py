@@ -17,6 +17,9 @@ COMPARISON_AGENT_PROMPT = """
     1. Compare the titles gathered from search_results_agent and titles of the products for the brand
     2. Show what products you are comparing side by side in a markdown format
     3. Comparison should show the missing keywords and suggest improvement
+    4. If you are asked to compare several brands at once, call `compare_brands_batch` with all the brands.
+       It computes the keyword coverage, title overlap and missing terms of every product.
+       Show its tables as is, and write the narrative: the weakest brands and titles, and how to improve them
 """
 
 COMPARISON_CRITIC_AGENT_PROMPT = """
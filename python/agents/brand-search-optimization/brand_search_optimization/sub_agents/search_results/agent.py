@@ -12,128 +12,217 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import time
 import warnings
 
 import selenium
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools.load_artifacts_tool import load_artifacts_tool
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
-from PIL import Image
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 
-from ...shared_libraries import constants
+from ...shared_libraries import constants, page_outline, screenshots
+from ...shared_libraries.browser_pool import browser_pool
 from . import prompt
 
 warnings.filterwarnings("ignore", category=UserWarning)
 
-if not constants.DISABLE_WEB_DRIVER:
-    options = Options()
-    options.add_argument("--window-size=1920x1080")
-    options.add_argument("--verbose")
-    options.add_argument("user-data-dir=/tmp/selenium")
 
-    driver = selenium.webdriver.Chrome(options=options)
+async def _in_browser(tool_context: ToolContext, action):
+    """Runs action(driver) on the session's pooled browser, in a worker thread."""
+    session_id = tool_context._invocation_context.session.id
 
+    def run():
+        browser = browser_pool.acquire(
+            session_id, timeout=constants.BROWSER_ACQUIRE_TIMEOUT_SECS
+        )
+        return action(browser)
+
+    return await asyncio.to_thread(run)
+
+
+def release_browser(callback_context: CallbackContext):
+    """Returns the session's browser to the pool once the agent is done."""
+    browser_pool.release(callback_context._invocation_context.session.id)
 
-def go_to_url(url: str) -> str:
+
+async def go_to_url(url: str, tool_context: ToolContext) -> str:
     """Navigates the browser to the given URL."""
     print(f"🌐 Navigating to URL: {url}")  # Added print statement
-    driver.get(url.strip())
+    await _in_browser(tool_context, lambda browser: browser.get(url.strip()))
     return f"Navigated to URL: {url}"
 
 
-async def take_screenshot(tool_context: ToolContext) -> dict:
-    """Takes a screenshot and saves it with the given filename. called 'load artifacts' after to load the image"""
+async def _save_screenshot(
+    tool_context: ToolContext, png: bytes, name: str = "screenshot"
+) -> dict:
+    image, mime_type = await screenshots.encode_screenshot_async(png)
     timestamp = time.strftime("%Y%m%d-%H%M%S")
-    filename = f"screenshot_{timestamp}.png"
-    print(f"📸 Taking screenshot and saving as: {filename}")
-    driver.save_screenshot(filename)
+    filename = f"{name}_{timestamp}.{mime_type.split('/')[1]}"
+    print(f"📸 Saving screenshot as artifact: {filename} ({len(image)} bytes)")
+    await tool_context.save_artifact(
+        filename, types.Part.from_bytes(data=image, mime_type=mime_type)
+    )
+    return {"status": "ok", "filename": filename}
 
-    image = Image.open(filename)
 
-    await tool_context.save_artifact(
-        filename,
-        types.Part.from_bytes(data=image.tobytes(), mime_type="image/png"),
+async def take_screenshot(tool_context: ToolContext) -> dict:
+    """Takes a screenshot of the current page and saves it as an artifact. called 'load artifacts' after to load the image"""
+    png = await _in_browser(
+        tool_context, lambda browser: browser.driver.get_screenshot_as_png()
     )
+    return await _save_screenshot(tool_context, png)
 
-    return {"status": "ok", "filename": filename}
 
+async def take_element_screenshot(element_id: str, tool_context: ToolContext) -> dict:
+    """Takes a screenshot of just the element with the given id from the page outline, e.g. a product grid. called 'load artifacts' after to load the image"""
+
+    def capture(browser):
+        items = browser.session_state.get("outline") or []
+        item = next((item for item in items if item.id == element_id), None)
+        if item is None:
+            return None
+        try:
+            return browser.driver.find_element(*item.locator).screenshot_as_png
+        except selenium.common.exceptions.NoSuchElementException:
+            return None
+
+    png = await _in_browser(tool_context, capture)
+    if png is None:
+        return {"status": "error", "message": "Element not found, get the outline first."}
+    return await _save_screenshot(tool_context, png, name=f"element_{element_id}")
 
-def click_at_coordinates(x: int, y: int) -> str:
+
+async def click_at_coordinates(x: int, y: int, tool_context: ToolContext) -> str:
     """Clicks at the specified coordinates on the screen."""
-    driver.execute_script(f"window.scrollTo({x}, {y});")
-    driver.find_element(By.TAG_NAME, "body").click()
 
+    def click(browser):
+        browser.driver.execute_script(f"window.scrollTo({x}, {y});")
+        browser.driver.find_element(By.TAG_NAME, "body").click()
+
+    await _in_browser(tool_context, click)
 
-def find_element_with_text(text: str) -> str:
+
+async def find_element_with_text(text: str, tool_context: ToolContext) -> str:
     """Finds an element on the page with the given text."""
     print(f"🔍 Finding element with text: '{text}'")  # Added print statement
 
-    try:
-        element = driver.find_element(By.XPATH, f"//*[text()='{text}']")
-        if element:
-            return "Element found."
-        else:
+    def find(browser):
+        try:
+            element = browser.driver.find_element(By.XPATH, f"//*[text()='{text}']")
+            if element:
+                return "Element found."
+            else:
+                return "Element not found."
+        except selenium.common.exceptions.NoSuchElementException:
             return "Element not found."
-    except selenium.common.exceptions.NoSuchElementException:
-        return "Element not found."
-    except selenium.common.exceptions.ElementNotInteractableException:
-        return "Element not interactable, cannot click."
+        except selenium.common.exceptions.ElementNotInteractableException:
+            return "Element not interactable, cannot click."
+
+    return await _in_browser(tool_context, find)
 
 
-def click_element_with_text(text: str) -> str:
+async def click_element_with_text(text: str, tool_context: ToolContext) -> str:
     """Clicks on an element on the page with the given text."""
     print(f"🖱️ Clicking element with text: '{text}'")  # Added print statement
 
-    try:
-        element = driver.find_element(By.XPATH, f"//*[text()='{text}']")
-        element.click()
-        return f"Clicked element with text: {text}"
-    except selenium.common.exceptions.NoSuchElementException:
-        return "Element not found, cannot click."
-    except selenium.common.exceptions.ElementNotInteractableException:
-        return "Element not interactable, cannot click."
-    except selenium.common.exceptions.ElementClickInterceptedException:
-        return "Element click intercepted, cannot click."
+    def click(browser):
+        try:
+            element = browser.driver.find_element(By.XPATH, f"//*[text()='{text}']")
+            element.click()
+            return f"Clicked element with text: {text}"
+        except selenium.common.exceptions.NoSuchElementException:
+            return "Element not found, cannot click."
+        except selenium.common.exceptions.ElementNotInteractableException:
+            return "Element not interactable, cannot click."
+        except selenium.common.exceptions.ElementClickInterceptedException:
+            return "Element click intercepted, cannot click."
 
+    return await _in_browser(tool_context, click)
 
-def enter_text_into_element(text_to_enter: str, element_id: str) -> str:
+
+async def enter_text_into_element(
+    text_to_enter: str, element_id: str, tool_context: ToolContext
+) -> str:
     """Enters text into an element with the given ID."""
     print(
         f"📝 Entering text '{text_to_enter}' into element with ID: {element_id}"
     )  # Added print statement
 
-    try:
-        input_element = driver.find_element(By.ID, element_id)
-        input_element.send_keys(text_to_enter)
-        return (
-            f"Entered text '{text_to_enter}' into element with ID: {element_id}"
-        )
-    except selenium.common.exceptions.NoSuchElementException:
-        return "Element with given ID not found."
-    except selenium.common.exceptions.ElementNotInteractableException:
-        return "Element not interactable, cannot click."
+    def enter_text(browser):
+        try:
+            input_element = browser.driver.find_element(By.ID, element_id)
+            input_element.send_keys(text_to_enter)
+            return (
+                f"Entered text '{text_to_enter}' into element with ID: {element_id}"
+            )
+        except selenium.common.exceptions.NoSuchElementException:
+            return "Element with given ID not found."
+        except selenium.common.exceptions.ElementNotInteractableException:
+            return "Element not interactable, cannot click."
 
+    return await _in_browser(tool_context, enter_text)
 
-def scroll_down_screen() -> str:
+
+async def scroll_down_screen(tool_context: ToolContext) -> str:
     """Scrolls down the screen by a moderate amount."""
     print("⬇️ scroll the screen")  # Added print statement
-    driver.execute_script("window.scrollBy(0, 500)")
+    await _in_browser(
+        tool_context,
+        lambda browser: browser.driver.execute_script("window.scrollBy(0, 500)"),
+    )
     return "Scrolled down the screen."
 
 
-def get_page_source() -> str:
-    LIMIT = 1000000
-    """Returns the current page source."""
-    print("📄 Getting page source...")  # Added print statement
-    return driver.page_source[0:LIMIT]
+async def get_page_outline(tool_context: ToolContext) -> str:
+    """
+    Returns a compact outline of the current page: its title, headings, product titles, links and controls, each with a stable element id.
+
+    After scrolling or clicking on the same page, only the elements added (+) or removed (-) since the last outline are returned.
+    """
+    print("📄 Getting page outline...")  # Added print statement
+
+    def outline(browser):
+        url = browser.driver.current_url
+        items = page_outline.distill(browser.driver.page_source)
+        previous = browser.session_state.get("outline")
+        browser.session_state["outline"] = items
+        if previous is None or browser.session_state.get("outline_url") != url:
+            browser.session_state["outline_url"] = url
+            return f"Outline of {url}:\n{page_outline.render(items)}"
+        changes = page_outline.render_diff(previous, items)
+        return f"Changes to the outline of {url}:\n{changes or 'None.'}"
+
+    return await _in_browser(tool_context, outline)
+
+
+async def click_element_with_id(element_id: str, tool_context: ToolContext) -> str:
+    """Clicks on the element with the given id from the page outline."""
+    print(f"🖱️ Clicking element with id: '{element_id}'")  # Added print statement
+
+    def click(browser):
+        items = browser.session_state.get("outline") or []
+        item = next((item for item in items if item.id == element_id), None)
+        if item is None:
+            return "Element id not in the page outline, get the outline first."
+        try:
+            browser.driver.find_element(*item.locator).click()
+            return f"Clicked element {element_id}: {item.text}"
+        except selenium.common.exceptions.NoSuchElementException:
+            return "Element not found, cannot click."
+        except selenium.common.exceptions.ElementNotInteractableException:
+            return "Element not interactable, cannot click."
+        except selenium.common.exceptions.ElementClickInterceptedException:
+            return "Element click intercepted, cannot click."
+
+    return await _in_browser(tool_context, click)
 
 
 def analyze_webpage_and_determine_action(
-    page_source: str, user_task: str, tool_context: ToolContext
+    page_outline: str, user_task: str, tool_context: ToolContext
 ) -> str:
     """Analyzes the webpage and determines the next action (scroll, click, etc.)."""
     print(
@@ -144,36 +233,37 @@ def analyze_webpage_and_determine_action(
     You are an expert web page analyzer.
     You have been tasked with controlling a web browser to achieve a user's goal.
     The user's task is: {user_task}
-    Here is the current HTML source code of the webpage:
-    ```html
-    {page_source}
+    Here is the current outline of the webpage, one element per line as
+    [<element_id>] <kind> "<text>" <details>, or the changes since the last
+    outline, prefixed with + for added and - for removed elements:
+    ```
+    {page_outline}
     ```
 
     Based on the webpage content and the user's task, determine the next best action to take.
-    Consider actions like: completing page source, scrolling down to see more content, clicking on links or buttons to navigate, or entering text into input fields.
+    Consider actions like: scrolling down to see more content, clicking on links or buttons to navigate, or entering text into input fields.
 
     Think step-by-step:
     1. Briefly analyze the user's task and the webpage content.
-    2. If source code appears to be incomplete, complete it to make it valid html. Keep the product titles as is. Only complete missing html syntax
+    2. Identify the product titles on the page. Keep the product titles as is.
     3. Identify potential interactive elements on the page (links, buttons, input fields, etc.).
     4. Determine if scrolling is necessary to reveal more content.
     5. Decide on the most logical next action to progress towards completing the user's task.
 
     Your response should be a concise action plan, choosing from these options:
-    - "COMPLETE_PAGE_SOURCE": If source code appears to be incomplete, complte it to make it valid html
     - "SCROLL_DOWN": If more content needs to be loaded by scrolling.
-    - "CLICK: <element_text>": If a specific element with text <element_text> should be clicked. Replace <element_text> with the actual text of the element.
-    - "ENTER_TEXT: <element_id>, <text_to_enter>": If text needs to be entered into an input field. Replace <element_id> with the ID of the input element and <text_to_enter> with the text to enter.
+    - "CLICK: <element_id>": If a specific element of the outline should be clicked. Replace <element_id> with the id of the element.
+    - "ENTER_TEXT: <element_id>, <text_to_enter>": If text needs to be entered into an input field. Replace <element_id> with the HTML id of the input element, shown as id=<element_id> in the outline, and <text_to_enter> with the text to enter.
     - "TASK_COMPLETED": If you believe the user's task is likely completed on this page.
     - "STUCK": If you are unsure what to do next or cannot progress further.
     - "ASK_USER": If you need clarification from the user on what to do next.
 
-    If you choose "CLICK" or "ENTER_TEXT", ensure the element text or ID is clearly identifiable from the webpage source. If multiple similar elements exist, choose the most relevant one based on the user's task.
+    If you choose "CLICK" or "ENTER_TEXT", ensure the element is clearly identifiable from the page outline. If multiple similar elements exist, choose the most relevant one based on the user's task.
     If you are unsure, or if none of the above actions seem appropriate, default to "ASK_USER".
 
     Example Responses:
     - SCROLL_DOWN
-    - CLICK: Learn more
+    - CLICK: 3f9a2c
     - ENTER_TEXT: search_box_id, Gemini API
     - TASK_COMPLETED
     - STUCK
@@ -192,12 +282,15 @@ search_results_agent = Agent(
     tools=[
         go_to_url,
         take_screenshot,
+        take_element_screenshot,
         find_element_with_text,
         click_element_with_text,
         enter_text_into_element,
         scroll_down_screen,
-        get_page_source,
+        get_page_outline,
+        click_element_with_id,
         load_artifacts_tool,
         analyze_webpage_and_determine_action,
     ],
+    after_agent_callback=release_browser,
 )
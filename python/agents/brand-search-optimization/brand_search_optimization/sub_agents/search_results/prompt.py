@@ -27,7 +27,7 @@ SEARCH_RESULT_AGENT_PROMPT = """
     </Navigation & Searching>
 
     <Gather Information> 
-        - getting titles of the top 3 products by analyzing the webpage
+        - getting titles of the top 3 products by analyzing the page outline; after scrolling or clicking, the outline only lists the changes
         - Do not make up 3 products
         - Show title of the products in a markdown format
     </Gather Information>
@@ -41,7 +41,7 @@ SEARCH_RESULT_AGENT_PROMPT = """
     Please follow these steps to accomplish the task at hand:
     1. Follow all steps in the <Ask website> to get website name
     2. Follow the steps in <Navigation & Searching> for searching
-    3. Then follow steps in <Gather Information> to gather required information from page source and relay this to user
+    3. Then follow steps in <Gather Information> to gather required information from the page outline and relay this to user
     4. Please adhere to <Key Constraints> when you attempt to answer the user's query.
     5. Transfer titles to the next agent
 """
@@ -0,0 +1,323 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Defines the batch comparison of many brands' product titles with search results"""
+
+import abc
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import functools
+import re
+from typing import Optional
+from urllib.parse import quote_plus
+
+from google.adk.tools import ToolContext
+from google.genai import types
+
+from ..shared_libraries import constants, page_outline
+from ..shared_libraries.browser_pool import BrowserPool, browser_pool
+from . import bq_connector
+
+SEARCH_URL = "https://www.google.com/search?hl=en&tbm=shop&q={keyword}"
+TOP_RESULTS = 3
+KEYWORDS_PER_BRAND = 3
+MISSING_TERMS = 5
+STOPWORDS = frozenset(
+    "a an and at by for from in of on or the to with".split()
+)
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+@functools.lru_cache(maxsize=65536)
+def tokenize(text: str) -> frozenset[str]:
+    """Returns the distinct lower-case words of a text, without stopwords."""
+    return frozenset(_WORD_RE.findall(text.casefold())) - STOPWORDS
+
+
+def candidate_keywords(
+    products: list[dict], brand: str, max_keywords: int = KEYWORDS_PER_BRAND
+) -> list[str]:
+    """
+    Picks the search keywords for a brand from the words of its product titles.
+
+    Generic words and word pairs shared by most titles rank first; words of the
+    brand name are left out.
+
+    Args:
+        products: The brand's products.
+        brand: The brand name.
+        max_keywords: The number of keywords to return.
+
+    Returns:
+        The keywords, most frequent first.
+    """
+    brand_words = tokenize(brand)
+    counts = Counter()
+    for product in products:
+        words = [
+            w
+            for w in _WORD_RE.findall(product["Title"].casefold())
+            if w not in STOPWORDS and w not in brand_words
+        ]
+        counts.update(set(words))
+        counts.update({f"{a} {b}" for a, b in zip(words, words[1:])})
+    # Prefer word pairs over single words at equal counts, then sort by name.
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1], -kv[0].count(" "), kv[0]))
+    return [keyword for keyword, _ in ranked[:max_keywords]]
+
+
+class SearchResultCollector(abc.ABC):
+    """Collects the titles of the top search results for keywords."""
+
+    @abc.abstractmethod
+    async def collect(self, keyword: str) -> list[str]:
+        """Returns the product titles of the top search results for a keyword."""
+
+
+class BrowserSearchCollector(SearchResultCollector):
+    """Searches Google Shopping with browsers from the pool."""
+
+    def __init__(self, pool: BrowserPool = browser_pool, top_results: int = TOP_RESULTS):
+        self.pool = pool
+        self.top_results = top_results
+
+    def _collect(self, keyword: str) -> list[str]:
+        lease = f"batch:{keyword}"
+        browser = self.pool.acquire(
+            lease, timeout=constants.BROWSER_ACQUIRE_TIMEOUT_SECS
+        )
+        try:
+            browser.get(SEARCH_URL.format(keyword=quote_plus(keyword)))
+            items = page_outline.distill(browser.driver.page_source)
+        finally:
+            self.pool.release(lease)
+        titles = [item.text for item in items if item.kind == "product"]
+        if not titles:  # Pages without marked up titles: the longer link texts.
+            titles = [
+                item.text
+                for item in items
+                if item.kind == "link" and len(item.text.split()) >= 3
+            ]
+        return titles[: self.top_results]
+
+    async def collect(self, keyword: str) -> list[str]:
+        return await asyncio.to_thread(self._collect, keyword)
+
+
+@dataclass
+class ProductScore:
+    """How well a product title matches the search results for a keyword."""
+
+    brand: str
+    title: str
+    keyword: str
+    coverage: float  # Share of the keyword's words in the title.
+    overlap: float  # Best word overlap (Jaccard) with a top result's title.
+    missing_terms: list[str]  # Frequent words of the top results not in the title.
+
+
+@dataclass
+class BatchReport:
+    """The scores of all products, and the search results they were scored against."""
+
+    scores: list[ProductScore] = field(default_factory=list)
+    results: dict[str, list[str]] = field(default_factory=dict)
+    # Brands whose product lookup failed, and keywords whose search failed.
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def brand_summary(self) -> list[dict]:
+        """Returns the mean coverage and overlap, and the most missed terms, per brand."""
+        by_brand: dict[str, list[ProductScore]] = {}
+        for score in self.scores:
+            by_brand.setdefault(score.brand, []).append(score)
+        summary = []
+        for brand, scores in by_brand.items():
+            missing = Counter(term for s in scores for term in s.missing_terms)
+            summary.append(
+                {
+                    "brand": brand,
+                    "products": len({s.title for s in scores}),
+                    "coverage": sum(s.coverage for s in scores) / len(scores),
+                    "overlap": sum(s.overlap for s in scores) / len(scores),
+                    "missing_terms": [t for t, _ in missing.most_common(MISSING_TERMS)],
+                }
+            )
+        return summary
+
+    def to_markdown(self, max_rows: Optional[int] = None) -> str:
+        """Renders the brand summary, then the product scores, weakest first."""
+        lines = [
+            "| Brand | Products | Keyword coverage | Title overlap | Most missed terms |",
+            "|---|---|---|---|---|",
+        ]
+        for row in self.brand_summary():
+            lines.append(
+                f"| {row['brand']} | {row['products']} | {row['coverage']:.0%}"
+                f" | {row['overlap']:.0%} | {', '.join(row['missing_terms'])} |"
+            )
+        scores = sorted(self.scores, key=lambda s: (s.coverage + s.overlap, s.title))
+        lines += [
+            "",
+            "| Brand | Title | Keyword | Coverage | Overlap | Missing terms |",
+            "|---|---|---|---|---|---|",
+        ]
+        for s in scores[:max_rows]:
+            lines.append(
+                f"| {s.brand} | {s.title} | {s.keyword} | {s.coverage:.0%}"
+                f" | {s.overlap:.0%} | {', '.join(s.missing_terms)} |"
+            )
+        if self.errors:
+            lines += ["", "Failed lookups and searches: " + ", ".join(sorted(self.errors))]
+        return "\n".join(lines)
+
+
+def score_titles(
+    brand: str, titles: list[str], keyword: str, results: list[str]
+) -> list[ProductScore]:
+    """
+    Scores product titles against the top search results of a keyword.
+
+    The words of each title and result are tokenized once, so scoring is a few
+    set operations per pair.
+
+    Args:
+        brand: The brand of the products.
+        titles: The product titles.
+        keyword: The search keyword.
+        results: The titles of the top search results.
+
+    Returns:
+        One score per title.
+    """
+    keyword_words = tokenize(keyword)
+    brand_words = tokenize(brand)
+    result_words = [tokenize(result) for result in results]
+    frequency = Counter(word for words in result_words for word in words)
+    # Words in at least half of the results, but not brand names.
+    common = [
+        word
+        for word, count in sorted(frequency.items(), key=lambda kv: (-kv[1], kv[0]))
+        if 2 * count >= len(results) and word not in brand_words
+    ]
+    scores = []
+    for title in titles:
+        words = tokenize(title)
+        coverage = (
+            len(keyword_words & words) / len(keyword_words) if keyword_words else 0.0
+        )
+        overlap = max(
+            (len(words & other) / len(words | other) for other in result_words if other),
+            default=0.0,
+        )
+        missing = [word for word in common if word not in words][:MISSING_TERMS]
+        scores.append(ProductScore(brand, title, keyword, coverage, overlap, missing))
+    return scores
+
+
+async def compare_brands(
+    brands: list[str],
+    collector: SearchResultCollector,
+    products_by_brand: Optional[dict[str, list[dict]]] = None,
+    keywords_by_brand: Optional[dict[str, list[str]]] = None,
+    max_products: int = 1000,
+    concurrency: int = constants.BROWSER_POOL_SIZE,
+) -> BatchReport:
+    """
+    Compares the product titles of many brands with the top search results.
+
+    Keywords are deduplicated across brands, and each is searched once, with
+    up to `concurrency` searches at a time.
+
+    Args:
+        brands: The brands. Brands whose products cannot be looked up are
+            skipped, and the failure is recorded in the report errors.
+        collector: Collects the top search results for a keyword.
+        products_by_brand: The products per brand; looked up in the product
+            table when missing.
+        keywords_by_brand: The keywords per brand; picked from the product
+            titles with candidate_keywords when missing.
+        max_products: The maximum number of products per brand.
+        concurrency: The maximum number of concurrent searches.
+
+    Returns:
+        The report.
+    """
+    products_by_brand = dict(products_by_brand or {})
+    keywords_by_brand = dict(keywords_by_brand or {})
+    report = BatchReport()
+    # The lookups block on BigQuery, so they run in worker threads, together.
+    missing = list(dict.fromkeys(b for b in brands if b not in products_by_brand))
+    found = await asyncio.gather(
+        *(
+            asyncio.to_thread(bq_connector.find_products, brand, max_products)
+            for brand in missing
+        ),
+        return_exceptions=True,
+    )
+    for brand, products in zip(missing, found):
+        if isinstance(products, Exception):  # One failing lookup must not stop the batch.
+            report.errors[brand] = str(products)
+        else:
+            products_by_brand[brand] = products
+    brands = [brand for brand in brands if brand in products_by_brand]
+    for brand in brands:
+        if brand not in keywords_by_brand:
+            keywords_by_brand[brand] = candidate_keywords(products_by_brand[brand], brand)
+
+    keywords = {}
+    for brand in brands:
+        for keyword in keywords_by_brand[brand]:
+            keywords.setdefault(" ".join(keyword.casefold().split()), keyword)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def search(key: str):
+        async with semaphore:
+            try:
+                report.results[key] = await collector.collect(keywords[key])
+            except Exception as e:  # One failing search must not stop the batch.
+                report.errors[key] = str(e)
+
+    await asyncio.gather(*(search(key) for key in keywords))
+
+    for brand in brands:
+        titles = [product["Title"] for product in products_by_brand[brand]]
+        for keyword in keywords_by_brand[brand]:
+            results = report.results.get(" ".join(keyword.casefold().split()))
+            if results:
+                report.scores.extend(score_titles(brand, titles, keyword, results))
+    return report
+
+
+async def compare_brands_batch(brands: list[str], tool_context: ToolContext) -> str:
+    """
+    Compares the product titles of several brands with the top Google Shopping results for their keywords, in one batch.
+
+    Args:
+        brands: The brand names.
+
+    Returns:
+        str: A markdown summary per brand and the weakest product titles, with keyword coverage, title overlap and missing terms. The full report is saved as the artifact batch_comparison.md.
+    """
+    if bq_connector.client is None:
+        return "BigQuery client initialization failed. Cannot look up the products."
+    report = await compare_brands(brands, BrowserSearchCollector())
+    await tool_context.save_artifact(
+        "batch_comparison.md",
+        types.Part.from_bytes(
+            data=report.to_markdown().encode("utf-8"), mime_type="text/markdown"
+        ),
+    )
+    return report.to_markdown(max_rows=20)
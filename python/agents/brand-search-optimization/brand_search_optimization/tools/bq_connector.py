@@ -14,11 +14,18 @@
 
 """Defines tools for brand search optimization agent"""
 
+import bisect
+import threading
+import time
+
 from google.cloud import bigquery
 from google.adk.tools import ToolContext
 
 from ..shared_libraries import constants
 
+PRODUCT_COLUMNS = ("Title", "Description", "Attributes", "Brand")
+MAX_RESULTS = 3
+
 # Initialize the BigQuery client outside the function
 try:
     client = bigquery.Client()  # Initialize client once
@@ -27,12 +34,206 @@ except Exception as e:
     client = None  # Set client to None if initialization fails
 
 
+def _table() -> str:
+    return f"{constants.PROJECT}.{constants.DATASET_ID}.{constants.TABLE_ID}"
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class ProductIndex:
+    """
+    An in-memory index of the product table, searchable by Brand and Title.
+
+    Substring searches use a trigram index, and queries shorter than three
+    characters a sorted prefix index. The index is rebuilt from the table with
+    one full scan per sync.
+    """
+
+    def __init__(self, fields: tuple[str, ...] = ("Brand", "Title")):
+        self.fields = fields
+        self.synced_at = 0.0
+        self._lock = threading.Lock()
+        self._sync_thread = None
+        self._first_sync_done = threading.Event()
+        self._load([])
+
+    def _load(self, rows: list[dict]):
+        trigrams = {field: {} for field in self.fields}
+        prefixes = {field: [] for field in self.fields}
+        for row_id, row in enumerate(rows):
+            for field in self.fields:
+                value = row[field].casefold()
+                for trigram in _trigrams(value):
+                    trigrams[field].setdefault(trigram, set()).add(row_id)
+                prefixes[field].extend((word, row_id) for word in value.split())
+        for entries in prefixes.values():
+            entries.sort()
+        # Swapped in at once, so concurrent searches see either index.
+        self._index = (rows, trigrams, prefixes)
+
+    def load(self, rows: list[dict]):
+        """Replaces the indexed products with rows holding PRODUCT_COLUMNS."""
+        self._load(
+            [
+                {column: str(row.get(column) or "") for column in PRODUCT_COLUMNS}
+                for row in rows
+            ]
+        )
+        self.synced_at = time.time()
+
+    def sync(self, bq_client: bigquery.Client) -> bool:
+        """
+        Reloads the index from the product table.
+
+        Args:
+            bq_client: The BigQuery client.
+
+        Returns:
+            Whether the sync succeeded; on failure the previous index is kept.
+        """
+        query = f"SELECT {', '.join(PRODUCT_COLUMNS)} FROM {_table()}"
+        try:
+            rows = [
+                {column: getattr(row, column) for column in PRODUCT_COLUMNS}
+                for row in bq_client.query(query).result()
+            ]
+        except Exception as e:
+            print(f"Error syncing product index: {e}")
+            return False
+        self.load(rows)
+        return True
+
+    def start_sync(self, bq_client: bigquery.Client, interval_secs: int) -> bool:
+        """
+        Syncs now, then every interval_secs, in a daemon thread.
+
+        The first sync is a full table scan, so it runs in the thread too and
+        callers are not blocked by it.
+
+        Returns:
+            Whether the index is loaded, i.e. a sync has succeeded.
+        """
+        with self._lock:
+            if self._sync_thread is None:
+
+                def run():
+                    self.sync(bq_client)
+                    self._first_sync_done.set()
+                    while True:
+                        time.sleep(interval_secs)
+                        self.sync(bq_client)
+
+                self._sync_thread = threading.Thread(
+                    target=run, name="product-index-sync", daemon=True
+                )
+                self._sync_thread.start()
+        return self.synced_at > 0
+
+    def wait_synced(self, timeout: float | None = None) -> bool:
+        """Waits for the first sync started by start_sync. Returns whether the index is loaded."""
+        self._first_sync_done.wait(timeout)
+        return self.synced_at > 0
+
+    def search(
+        self, text: str, limit: int = MAX_RESULTS, fields: tuple[str, ...] = ("Brand",)
+    ) -> list[dict]:
+        """
+        Finds the products whose fields contain the text, ignoring case.
+
+        Args:
+            text: The text to search for, e.g. a brand name.
+            limit: The maximum number of products to return.
+            fields: The fields to search, from the indexed fields.
+
+        Returns:
+            The matching products, in table order.
+        """
+        rows, trigrams, prefixes = self._index
+        key = " ".join(text.casefold().split())
+        matches = set()
+        for field in fields:
+            if len(key) >= 3:
+                postings = [trigrams[field].get(t, set()) for t in _trigrams(key)]
+                candidates = set.intersection(*postings)
+            else:
+                entries = prefixes[field]
+                start = bisect.bisect_left(entries, (key,))
+                candidates = set()
+                for word, row_id in entries[start:]:
+                    if not word.startswith(key):
+                        break
+                    candidates.add(row_id)
+            matches.update(
+                row_id for row_id in candidates if key in rows[row_id][field].casefold()
+            )
+        return [rows[row_id] for row_id in sorted(matches)[:limit]]
+
+
+product_index = ProductIndex()
+
+
+def _query_products(brand: str, limit: int) -> list[dict]:
+    """Queries the product table for a brand, for when the index is unavailable."""
+    query = f"""
+        SELECT
+            {", ".join(PRODUCT_COLUMNS)}
+        FROM
+            {_table()}
+        WHERE LOWER(Brand) LIKE CONCAT('%', LOWER(@brand), '%')
+        LIMIT @limit
+    """
+    query_job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("brand", "STRING", brand),
+            bigquery.ScalarQueryParameter("limit", "INT64", limit),
+        ]
+    )
+    results = client.query(query, job_config=query_job_config).result()
+    return [
+        {column: getattr(row, column) for column in PRODUCT_COLUMNS}
+        for row in results
+    ]
+
+
+def find_products(brand: str, limit: int = MAX_RESULTS) -> list[dict]:
+    """
+    Finds the products of a brand, from the index when it is enabled and loaded.
+
+    Until the first sync of the index completes, the table is queried directly.
+
+    Args:
+        brand: The brand to search for (brands containing it, ignoring case).
+        limit: The maximum number of products to return.
+
+    Returns:
+        The products, as dicts of PRODUCT_COLUMNS.
+
+    Raises:
+        RuntimeError: if the BigQuery client could not be initialized.
+    """
+    if client is None:
+        raise RuntimeError(
+            "BigQuery client initialization failed. Cannot execute query."
+        )
+    if constants.PRODUCT_INDEX_SYNC_SECS > 0 and product_index.start_sync(
+        client, constants.PRODUCT_INDEX_SYNC_SECS
+    ):
+        return product_index.search(brand, limit=limit)
+    return _query_products(brand, limit)
+
+
 def get_product_details_for_brand(tool_context: ToolContext):
     """
     Retrieves product details (title, description, attributes, and brand) from a BigQuery table for a tool_context.
 
+    Products are served from an in-memory index of the table, synced every
+    PRODUCT_INDEX_SYNC_SECS seconds, or queried directly if the index is disabled
+    or could not be loaded.
+
     Args:
-        tool_context (str): The tool_context to search for (using a LIKE '%brand%' query).
+        tool_context (str): The tool_context to search for (brands containing it, ignoring case).
 
     Returns:
         str: A markdown table containing the product details, or an error message if BigQuery client initialization failed.
@@ -47,37 +248,14 @@ def get_product_details_for_brand(tool_context: ToolContext):
     if client is None:  # Check if client initialization failed
         return "BigQuery client initialization failed. Cannot execute query."
 
-    query = f"""
-        SELECT
-            Title,
-            Description,
-            Attributes,
-            Brand
-        FROM
-            {constants.PROJECT}.{constants.DATASET_ID}.{constants.TABLE_ID}
-        WHERE brand LIKE '%{brand}%'
-        LIMIT 3
-    """
-    query_job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("parameter1", "STRING", brand)
-        ]
-    )
-
-    query_job = client.query(query, job_config=query_job_config)
-    query_job = client.query(query)
-    results = query_job.result()
-
-    markdown_table = "| Title | Description | Attributes | Brand |\n"
-    markdown_table += "|---|---|---|---|\n"
-
-    for row in results:
-        title = row.Title
-        description = row.Description if row.Description else "N/A"
-        attributes = row.Attributes if row.Attributes else "N/A"
+    products = find_products(brand)
 
-        markdown_table += (
-            f"| {title} | {description} | {attributes} | {brand}\n"
+    lines = ["| Title | Description | Attributes | Brand |", "|---|---|---|---|"]
+    for product in products:
+        description = product["Description"] or "N/A"
+        attributes = product["Attributes"] or "N/A"
+        lines.append(
+            f"| {product['Title']} | {description} | {attributes} | {product['Brand']}"
         )
 
-    return markdown_table
+    return "\n".join(lines) + "\n"
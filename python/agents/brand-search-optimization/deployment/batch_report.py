@@ -0,0 +1,56 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Batch comparison report across brands, e.g. for a nightly job."""
+
+import asyncio
+
+from absl import app, flags
+from brand_search_optimization.shared_libraries import constants
+from brand_search_optimization.shared_libraries.browser_pool import browser_pool
+from brand_search_optimization.tools import batch_comparison
+
+FLAGS = flags.FLAGS
+flags.DEFINE_list("brands", None, "Brands to compare.")
+flags.DEFINE_string("output", "batch_comparison.md", "Markdown report path.")
+flags.DEFINE_integer("max_products", 1000, "Maximum products per brand.")
+flags.DEFINE_integer(
+    "concurrency", constants.BROWSER_POOL_SIZE, "Concurrent searches."
+)
+flags.mark_flag_as_required("brands")
+
+
+def main(argv: list[str]) -> None:
+    del argv  # unused
+    try:
+        report = asyncio.run(
+            batch_comparison.compare_brands(
+                FLAGS.brands,
+                batch_comparison.BrowserSearchCollector(),
+                max_products=FLAGS.max_products,
+                concurrency=FLAGS.concurrency,
+            )
+        )
+    finally:
+        browser_pool.close()
+    with open(FLAGS.output, "w") as f:
+        f.write(report.to_markdown())
+    print(
+        f"Scored {len(report.scores)} product titles against"
+        f" {len(report.results)} keywords; report written to {FLAGS.output}"
+    )
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -14,12 +14,36 @@
 
 """Unit tests for tools"""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import io
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from google.adk.tools import ToolContext
+from PIL import Image
+import pytest
 
-from brand_search_optimization.tools import bq_connector
-from brand_search_optimization.shared_libraries import constants
+from brand_search_optimization.tools import batch_comparison, bq_connector
+from brand_search_optimization.shared_libraries import (
+    constants,
+    page_outline,
+    screenshots,
+)
+from brand_search_optimization.shared_libraries.browser_pool import (
+    Browser,
+    BrowserPool,
+)
+from brand_search_optimization.sub_agents.search_results import (
+    agent as search_results,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_product_index():
+    with patch.object(bq_connector, "product_index", bq_connector.ProductIndex()):
+        yield
 
 
 class TestBrandSearchOptimization:
@@ -64,3 +88,336 @@ class TestBrandSearchOptimization:
                     mock_tool_context
                 )
                 assert "neuravibe Pro" not in markdown_output
+
+    @patch("brand_search_optimization.tools.bq_connector.client")
+    def test_brand_lookups_are_served_from_the_index(self, mock_client):
+        mock_tool_context = MagicMock(spec=ToolContext)
+        mock_tool_context.user_content.parts = [MagicMock(text="Cymbal")]
+        rows = [
+            SimpleNamespace(
+                Title=f"{brand} Shoe {i}",
+                Description="Running shoes",
+                Attributes=None,
+                Brand=brand,
+            )
+            for i, brand in enumerate(["cymbal", "neuravibe", "cymbal", "cymbal", "cymbal"])
+        ]
+        scan_started = threading.Event()
+        release_scan = threading.Event()
+
+        def query(sql, job_config=None):
+            if job_config is None:  # The full scan of the sync.
+                scan_started.set()
+                release_scan.wait(5)
+            return MagicMock(result=MagicMock(return_value=rows))
+
+        mock_client.query.side_effect = query
+
+        # The first lookup queries the table while the index syncs in the background.
+        bq_connector.get_product_details_for_brand(mock_tool_context)
+        assert scan_started.wait(5)
+        release_scan.set()
+        assert bq_connector.product_index.wait_synced(timeout=5)
+        for _ in range(2):
+            markdown_output = bq_connector.get_product_details_for_brand(
+                mock_tool_context
+            )
+
+        # One query and one scan; lookups from the synced index do not query again.
+        assert mock_client.query.call_count == 2
+        assert "neuravibe" not in markdown_output
+        assert markdown_output.count("| cymbal Shoe") == 3
+        assert "| cymbal Shoe 0 | Running shoes | N/A | cymbal" in markdown_output
+
+    def test_product_index_search(self):
+        index = bq_connector.ProductIndex()
+        index.load(
+            [
+                {"Title": "Trail Runner", "Description": "", "Attributes": "", "Brand": "Cymbal Sports"},
+                {"Title": "Road Runner", "Description": "", "Attributes": "", "Brand": "NeuraVibe"},
+            ]
+        )
+        assert [p["Brand"] for p in index.search("sports")] == ["Cymbal Sports"]
+        assert [p["Brand"] for p in index.search("ne")] == ["NeuraVibe"]
+        assert len(index.search("runner", fields=("Title",))) == 2
+        assert index.search("adidas") == []
+
+    @patch.object(constants, "PRODUCT_INDEX_SYNC_SECS", 0)
+    @patch("brand_search_optimization.tools.bq_connector.client")
+    def test_disabled_index_runs_one_parameterized_query(self, mock_client):
+        mock_tool_context = MagicMock(spec=ToolContext)
+        mock_tool_context.user_content.parts = [MagicMock(text="cymbal")]
+        mock_client.query.return_value.result.return_value = []
+
+        bq_connector.get_product_details_for_brand(mock_tool_context)
+
+        assert mock_client.query.call_count == 1
+        job_config = mock_client.query.call_args.kwargs["job_config"]
+        assert job_config.query_parameters[0].value == "cymbal"
+
+
+class TestBrowserPool:
+
+    def make_pool(self, **kwargs):
+        self.started = []
+
+        def factory():
+            browser = Browser(MagicMock())
+            self.started.append(browser)
+            return browser
+
+        return BrowserPool(factory=factory, **kwargs)
+
+    def test_browsers_start_lazily_and_keep_session_affinity(self):
+        pool = self.make_pool(max_browsers=2)
+        assert self.started == []
+
+        first = pool.acquire("session-1")
+        pool.acquire("session-2")
+        assert pool.acquire("session-1") is first
+        pool.release("session-1")
+        pool.release("session-2")
+
+        assert pool.acquire("session-1") is first
+        assert len(self.started) == 2
+
+    def test_browsers_are_recycled_after_max_pages(self):
+        pool = self.make_pool(max_browsers=1, max_pages=2)
+        browser = pool.acquire("session-1")
+        browser.get("https://example.com/1")
+        browser.get("https://example.com/2")
+        pool.release("session-1")
+
+        browser.driver.quit.assert_called_once()
+        assert pool.acquire("session-1") is not browser
+
+    def test_unhealthy_browsers_are_replaced(self):
+        pool = self.make_pool(max_browsers=1)
+        browser = pool.acquire("session-1")
+        pool.release("session-1")
+        type(browser.driver).current_url = property(
+            MagicMock(side_effect=RuntimeError("gone"))
+        )
+
+        assert pool.acquire("session-1") is not browser
+        assert len(self.started) == 2
+
+    def test_sessions_wait_for_a_free_browser(self):
+        pool = self.make_pool(max_browsers=1)
+        pool.acquire("session-1")
+        with pytest.raises(TimeoutError):
+            pool.acquire("session-2", timeout=0.01)
+
+        threading.Timer(0.05, pool.release, ["session-1"]).start()
+        assert pool.acquire("session-2", timeout=5) is self.started[0]
+
+    def test_browsers_are_cleared_for_another_session(self):
+        pool = self.make_pool(max_browsers=1)
+        browser = pool.acquire("session-1")
+        pool.release("session-1")
+        assert pool.acquire("session-1") is browser
+        browser.driver.delete_all_cookies.assert_not_called()
+        pool.release("session-1")
+
+        assert pool.acquire("session-2") is browser
+        browser.driver.delete_all_cookies.assert_called_once()
+        browser.driver.get.assert_called_with("about:blank")
+
+    def test_unused_leases_are_reclaimed(self):
+        pool = self.make_pool(max_browsers=1, lease_ttl_secs=0.05)
+        browser = pool.acquire("session-1")  # Never released.
+
+        assert pool.acquire("session-2", timeout=5) is browser
+        assert browser.last_session == "session-2"
+        assert len(self.started) == 1
+
+
+class TestPageOutline:
+
+    PAGE = """
+        <html><head><title>Shopping</title><script>var ad = "<a href='/ad'>Ad</a>";</script>
+        <style>.hidden { display: none; }</style></head>
+        <body>
+          <input id="q" name="q" placeholder="Search">
+          <div hidden><a href="/p/hidden">Hidden product</a></div>
+          <div class="product-card">
+            <h3 class="product-title">Cymbal Trail Runner</h3>
+            <a href="/p/1"><img alt="Cymbal Trail Runner"> View</a>
+          </div>
+          <button aria-label="More results"></button>
+        </body></html>
+    """
+
+    def test_distill_keeps_titles_links_and_controls(self):
+        rendered = page_outline.render(page_outline.distill(self.PAGE))
+
+        assert '] title "Shopping"' in rendered
+        assert '] input "Search" id=q name=q' in rendered
+        assert '] product "Cymbal Trail Runner"' in rendered
+        assert '] link "Cymbal Trail Runner View" -> /p/1' in rendered
+        assert '] button "More results"' in rendered
+        assert "Ad" not in rendered
+        assert "Hidden" not in rendered
+        assert "display" not in rendered
+
+    def test_ids_are_stable_and_diffs_are_incremental(self):
+        before = page_outline.distill(self.PAGE)
+        after = page_outline.distill(
+            self.PAGE.replace(
+                "</body>", '<a href="/p/2">Cymbal Road Runner</a></body>'
+            )
+        )
+
+        assert [item.id for item in after[: len(before)]] == [item.id for item in before]
+        diff = page_outline.render_diff(before, after)
+        assert diff.splitlines() == [f"+ {after[-1].render()}"]
+        assert after[-1].locator == ("xpath", "//a[@href='/p/2']")
+
+
+class TestScreenshots:
+
+    def png(self, width=2000, height=1000):
+        output = io.BytesIO()
+        Image.new("RGBA", (width, height), (200, 30, 30, 255)).save(output, "PNG")
+        return output.getvalue()
+
+    def test_encode_screenshot_downscales_and_converts(self):
+        image, mime_type = screenshots.encode_screenshot(
+            self.png(), image_format="jpeg", max_width=1000, quality=80
+        )
+
+        assert mime_type == "image/jpeg"
+        assert Image.open(io.BytesIO(image)).size == (1000, 500)
+
+    def test_encode_screenshot_accepts_jpg(self):
+        _, mime_type = screenshots.encode_screenshot(self.png(), image_format="JPG")
+
+        assert mime_type == "image/jpeg"
+
+    def test_encode_screenshot_rejects_unknown_formats(self):
+        with pytest.raises(ValueError, match="Unsupported screenshot format 'gif'"):
+            screenshots.encode_screenshot(self.png(), image_format="gif")
+
+    def test_take_screenshot_saves_in_memory_artifact(self, tmp_path):
+        browser = Browser(MagicMock())
+        browser.driver.get_screenshot_as_png.return_value = self.png()
+        pool = BrowserPool(factory=lambda: browser)
+        tool_context = MagicMock()
+        tool_context._invocation_context.session.id = "session-1"
+        tool_context.save_artifact = AsyncMock()
+
+        cwd = os.getcwd()
+        os.chdir(tmp_path)
+        try:
+            with patch.object(search_results, "browser_pool", pool):
+                result = asyncio.run(search_results.take_screenshot(tool_context))
+        finally:
+            os.chdir(cwd)
+
+        assert result["status"] == "ok"
+        assert list(tmp_path.iterdir()) == []
+        filename, part = tool_context.save_artifact.call_args.args
+        assert filename == result["filename"]
+        assert part.inline_data.mime_type == f"image/{constants.SCREENSHOT_FORMAT}"
+        assert Image.open(io.BytesIO(part.inline_data.data)).width == (
+            constants.SCREENSHOT_MAX_WIDTH
+        )
+
+
+class TestBatchComparison:
+
+    class FakeCollector(batch_comparison.SearchResultCollector):
+
+        def __init__(self):
+            self.keywords = []
+
+        async def collect(self, keyword):
+            self.keywords.append(keyword)
+            if keyword == "broken":
+                raise RuntimeError("search failed")
+            return [
+                f"Nike Kids {keyword} Lightweight Breathable",
+                f"Adidas Kids {keyword} Lightweight",
+                f"Puma {keyword} Breathable Mesh",
+            ]
+
+    def test_candidate_keywords_skip_the_brand(self):
+        products = [
+            {"Title": "Cymbal Kids Running Shoes"},
+            {"Title": "Cymbal Running Shoes Pro"},
+            {"Title": "Cymbal Trail Shoes"},
+        ]
+        keywords = batch_comparison.candidate_keywords(products, "Cymbal")
+
+        assert keywords == ["shoes", "running shoes", "running"]
+
+    def test_keywords_are_searched_once_across_brands(self):
+        collector = self.FakeCollector()
+        report = asyncio.run(
+            batch_comparison.compare_brands(
+                ["cymbal", "neuravibe"],
+                collector,
+                products_by_brand={
+                    "cymbal": [{"Title": "Cymbal Kids Running Shoes"}],
+                    "neuravibe": [{"Title": "NeuraVibe Trail Shoes"}],
+                },
+                keywords_by_brand={
+                    "cymbal": ["running shoes", "broken"],
+                    "neuravibe": ["Running  Shoes"],
+                },
+            )
+        )
+
+        assert sorted(collector.keywords) == ["broken", "running shoes"]
+        assert list(report.errors) == ["broken"]
+        cymbal = next(s for s in report.scores if s.brand == "cymbal")
+        assert cymbal.coverage == 1.0
+        assert cymbal.missing_terms == ["breathable", "lightweight"]
+        neuravibe = next(s for s in report.scores if s.brand == "neuravibe")
+        assert neuravibe.coverage == 0.5
+        assert "| cymbal | 1 | 100% |" in report.to_markdown()
+
+    def test_products_are_looked_up_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        lookup_threads = []
+
+        def find_products(brand, limit):
+            lookup_threads.append(threading.get_ident())
+            return [{"Title": f"{brand} Running Shoes"}]
+
+        with patch.object(bq_connector, "find_products", side_effect=find_products):
+            report = asyncio.run(
+                batch_comparison.compare_brands(
+                    ["cymbal", "neuravibe", "cymbal"],
+                    self.FakeCollector(),
+                    keywords_by_brand={"cymbal": ["running shoes"], "neuravibe": []},
+                )
+            )
+
+        assert len(lookup_threads) == 2
+        assert loop_thread not in lookup_threads
+        assert {s.brand for s in report.scores} == {"cymbal"}
+
+    def test_failed_lookup_skips_only_that_brand(self):
+        def find_products(brand, limit):
+            if brand == "neuravibe":
+                raise RuntimeError("table not found")
+            return [{"Title": f"{brand} Running Shoes"}]
+
+        with patch.object(bq_connector, "find_products", side_effect=find_products):
+            report = asyncio.run(
+                batch_comparison.compare_brands(
+                    ["cymbal", "neuravibe"],
+                    self.FakeCollector(),
+                    keywords_by_brand={"cymbal": ["running shoes"]},
+                )
+            )
+
+        assert report.errors == {"neuravibe": "table not found"}
+        assert {s.brand for s in report.scores} == {"cymbal"}
+        assert "Failed lookups and searches: neuravibe" in report.to_markdown()
+
+    @patch("brand_search_optimization.tools.bq_connector.client", None)
+    def test_find_products_without_a_client(self):
+        with pytest.raises(RuntimeError, match="BigQuery client"):
+            bq_connector.find_products("cymbal")
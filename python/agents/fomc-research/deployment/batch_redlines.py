@@ -0,0 +1,66 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Batch script to generate redlines between consecutive FOMC statements.
+
+Statement texts are read from files in --input_dir, ordered by file name
+(e.g. 2025-01-29.txt, 2025-03-19.txt), and one redline per consecutive pair is
+written to --output_dir. Results are cached, so re-runs only diff new pairs.
+"""
+
+import os
+from collections.abc import Sequence
+
+from absl import app, flags
+from fomc_research.shared_libraries import redline_utils
+
+FLAGS = flags.FLAGS
+flags.DEFINE_string("input_dir", None, "Directory of statement text files.")
+flags.DEFINE_string("output_dir", None, "Directory to write redlines to.")
+flags.DEFINE_integer("max_workers", None, "Number of worker processes.")
+flags.mark_flags_as_required(["input_dir", "output_dir"])
+
+
+def main(argv: Sequence[str]) -> None:
+    if len(argv) > 1:
+        raise app.UsageError("Too many command-line arguments.")
+
+    names = sorted(
+        name
+        for name in os.listdir(FLAGS.input_dir)
+        if name.endswith(".txt")
+    )
+    texts = []
+    for name in names:
+        with open(os.path.join(FLAGS.input_dir, name), encoding="utf-8") as f:
+            texts.append(f.read())
+    print(f"Comparing {len(names)} statements")
+
+    redlines = redline_utils.create_html_redlines(texts, FLAGS.max_workers)
+
+    os.makedirs(FLAGS.output_dir, exist_ok=True)
+    for prev_name, curr_name, redline in zip(names, names[1:], redlines):
+        output_name = (
+            f"{os.path.splitext(prev_name)[0]}_"
+            f"{os.path.splitext(curr_name)[0]}.html"
+        )
+        with open(
+            os.path.join(FLAGS.output_dir, output_name), "w", encoding="utf-8"
+        ) as f:
+            f.write(redline)
+        print(f"Wrote {output_name}")
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -0,0 +1,53 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Script to build the local FOMC meeting index from the Fed website."""
+
+import asyncio
+from collections.abc import Sequence
+
+from absl import app, flags
+from fomc_research.shared_libraries import meeting_index
+
+FLAGS = flags.FLAGS
+flags.DEFINE_string(
+    "output", meeting_index.INDEX_PATH, "Path to write the index file to."
+)
+flags.DEFINE_list(
+    "calendar_urls",
+    [meeting_index.CALENDAR_URL],
+    "Fed calendar pages to index, e.g. the main calendar plus historical "
+    "pages such as https://www.federalreserve.gov/monetarypolicy/"
+    "fomchistorical2019.htm.",
+)
+flags.DEFINE_bool(
+    "with_text",
+    True,
+    "Also download and index the text of statements, transcripts and minutes.",
+)
+
+
+def main(argv: Sequence[str]) -> None:
+    if len(argv) > 1:
+        raise app.UsageError("Too many command-line arguments.")
+
+    index = asyncio.run(
+        meeting_index.build_index(FLAGS.calendar_urls, FLAGS.with_text)
+    )
+    meeting_index.save_index(index, FLAGS.output)
+    print(f"Wrote {len(index.meetings)} meetings to {FLAGS.output}")
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -14,53 +14,121 @@
 
 """File-related utility functions for fed_research_agent."""
 
-import base64
-import binascii
+import asyncio
+import concurrent.futures
 import io
 import logging
 import mimetypes
+import os
 from collections.abc import Sequence
+from typing import Optional
 
-import diff_match_patch as dmp
+import httpx
 import pdfplumber
-import requests
 from absl import app
 from google.adk.tools import ToolContext
 from google.genai.types import Blob, Part
 
+from . import http_utils
+
 logger = logging.getLogger(__name__)
 
+# PDFs with fewer pages than this are extracted in-process; the cost of
+# shipping the document to worker processes outweighs the parallelism.
+MIN_PAGES_FOR_POOL = 8
+MAX_PDF_WORKERS = min(4, os.cpu_count() or 1)
+
+_pdf_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def _get_pdf_executor() -> concurrent.futures.ProcessPoolExecutor:
+    global _pdf_executor  # pylint: disable=global-statement
+    if _pdf_executor is None:
+        _pdf_executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=MAX_PDF_WORKERS
+        )
+    return _pdf_executor
+
 
 async def download_file_from_url(
     url: str, output_filename: str, tool_context: ToolContext
 ) -> str:
     """Downloads a file from a URL and stores it in an artifact.
 
+    The raw file bytes are stored in the artifact; repeat downloads of an
+    unchanged file are served from the local HTTP cache.
+
     Args:
       url: The URL to retrieve the file from.
       output_filename: The name of the artifact to store the file in.
       tool_context: The tool context.
 
     Returns:
-      The name of the artifact.
+      The name of the artifact, or "" if the download failed.
     """
     logger.info("Downloading %s to %s", url, output_filename)
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        response = await http_utils.fetch(url)
+    except httpx.HTTPError as e:
+        logger.error("Error downloading file from URL: %s", e)
+        return ""
+
+    mime_type = response.content_type or mimetypes.guess_type(url)[0]
+    artifact = Part(inline_data=Blob(data=response.content, mime_type=mime_type))
+    await tool_context.save_artifact(filename=output_filename, artifact=artifact)
+    logger.info(
+        "Downloaded %s to artifact %s (cached: %s)",
+        url,
+        output_filename,
+        response.from_cache,
+    )
+    return output_filename
 
-        file_bytes = base64.b64encode(response.content)
-        mime_type = response.headers.get(
-            "Content-Type", mimetypes.guess_type(url)
+
+def _count_pdf_pages(pdf_bytes: bytes) -> int:
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pdf_pages(pdf_bytes: bytes, start: int, stop: int) -> str:
+    """Extracts the text of pages [start, stop) of a PDF."""
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return "".join(
+            page.extract_text() or "" for page in pdf.pages[start:stop]
         )
-        artifact = Part(inline_data=Blob(data=file_bytes, mime_type=mime_type))
-        await tool_context.save_artifact(filename=output_filename, artifact=artifact)
-        logger.info("Downloaded %s to artifact %s", url, output_filename)
-        return output_filename
 
-    except requests.exceptions.RequestException as e:
-        logger.error("Error downloading file from URL: %s", e)
-        return ""
+
+async def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+    """Extracts the text of a PDF, splitting large documents across workers.
+
+    Args:
+      pdf_bytes: The raw PDF file contents.
+
+    Returns:
+      The concatenated text of all pages.
+    """
+    # pdfplumber is blocking, so even small documents are parsed off the
+    # event loop.
+    num_pages = await asyncio.to_thread(_count_pdf_pages, pdf_bytes)
+    if num_pages < MIN_PAGES_FOR_POOL or MAX_PDF_WORKERS < 2:
+        return await asyncio.to_thread(_extract_pdf_pages, pdf_bytes, 0, num_pages)
+
+    loop = asyncio.get_running_loop()
+    executor = _get_pdf_executor()
+    chunk_size = -(-num_pages // MAX_PDF_WORKERS)
+    chunks = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor,
+                _extract_pdf_pages,
+                pdf_bytes,
+                start,
+                min(start + chunk_size, num_pages),
+            )
+            for start in range(0, num_pages, chunk_size)
+        )
+    )
+    return "".join(chunks)
 
 
 async def extract_text_from_pdf_artifact(
@@ -71,39 +139,10 @@ async def extract_text_from_pdf_artifact(
         pdf_artifact = await tool_context.load_artifact(pdf_path)
         if pdf_artifact and pdf_artifact.inline_data:
             logger.info("Extracting text from PDF artifact %s", pdf_path)
-            with io.BytesIO(
-                base64.b64decode(pdf_artifact.inline_data.data)
-            ) as pdf_file_obj:
-                pdf_text = ""
-                with pdfplumber.open(pdf_file_obj) as pdf:
-                    for page in pdf.pages:
-                        pdf_text += page.extract_text()
-            return pdf_text
+            return await extract_text_from_pdf(pdf_artifact.inline_data.data)
     except ValueError as e:
         logger.error("Error loading PDF artifact: %s", e)
-        return ""
-
-
-def create_html_redline(text1: str, text2: str) -> str:
-    """Creates an HTML redline doc of differences between text1 and text2."""
-    d = dmp.diff_match_patch()
-    diffs = d.diff_main(text2, text1)
-    d.diff_cleanupSemantic(diffs)
-
-    html_output = ""
-    for op, text in diffs:
-        if op == -1:  # Deletion
-            html_output += (
-                f'<del style="background-color: #ffcccc;">{text}</del>'
-            )
-        elif op == 1:  # Insertion
-            html_output += (
-                f'<ins style="background-color: #ccffcc;">{text}</ins>'
-            )
-        else:  # Unchanged
-            html_output += text
-
-    return html_output
+    return ""
 
 
 async def save_html_to_artifact(
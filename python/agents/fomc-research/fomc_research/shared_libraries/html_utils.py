@@ -0,0 +1,224 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""HTML-related utility functions for FOMC Research Agent."""
+
+import functools
+import html.parser
+import re
+from typing import Optional
+
+# Elements whose content is never useful to the model.
+SKIP_TAGS = frozenset(
+    {
+        "footer",
+        "form",
+        "head",
+        "header",
+        "iframe",
+        "nav",
+        "noscript",
+        "script",
+        "style",
+        "svg",
+        "template",
+    }
+)
+BLOCK_TAGS = frozenset(
+    {
+        "article",
+        "br",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+        "li",
+        "main",
+        "ol",
+        "p",
+        "section",
+        "table",
+        "tr",
+        "ul",
+    }
+)
+CELL_TAGS = frozenset({"td", "th"})
+VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+_SPACES_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+def _is_hidden(attrs: dict[str, Optional[str]]) -> bool:
+    style = (attrs.get("style") or "").replace(" ", "").lower()
+    return (
+        "hidden" in attrs
+        or attrs.get("aria-hidden") == "true"
+        or "display:none" in style
+        or "visibility:hidden" in style
+    )
+
+
+class _MainContentParser(html.parser.HTMLParser):
+    """Renders the visible main content of a page as text with links.
+
+    Links are rendered inline in Markdown format, `[text](href)`, so the
+    model can still associate each URL with its label and context. The text
+    inside <main> elements is also collected on its own.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._main_depth = 0
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+        self._link_href: Optional[str] = None
+        self._link_text: list[str] = []
+        self._parts: list[str] = []
+        self._main_parts: list[str] = []
+
+    def _emit(self, text: str) -> None:
+        if self._link_href is not None:
+            self._link_text.append(text)
+            return
+        self._parts.append(text)
+        if self._main_depth:
+            self._main_parts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        attr_dict = dict(attrs)
+        if tag not in VOID_TAGS and (tag in SKIP_TAGS or _is_hidden(attr_dict)):
+            self._skip_tag = tag
+            self._skip_depth = 1
+            return
+        if tag == "main":
+            self._main_depth += 1
+        if tag == "a":
+            href = attr_dict.get("href")
+            if href and not href.startswith(("#", "javascript:")):
+                self._link_href = href
+                self._link_text = []
+        elif tag in BLOCK_TAGS:
+            self._emit("\n")
+        elif tag in CELL_TAGS:
+            self._emit(" | ")
+
+    def handle_endtag(self, tag):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag == "a" and self._link_href is not None:
+            href = self._link_href
+            text = _SPACES_RE.sub(" ", "".join(self._link_text)).strip()
+            self._link_href = None
+            self._emit(f"[{text}]({href})")
+        elif tag in BLOCK_TAGS:
+            self._emit("\n")
+        if tag == "main" and self._main_depth:
+            self._main_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_tag is None:
+            self._emit(data.replace("\n", " "))
+
+    def get_text(self, main_only: bool = False) -> str:
+        parts = self._main_parts if main_only else self._parts
+        lines = (
+            _SPACES_RE.sub(" ", line).strip() for line in "".join(parts).split("\n")
+        )
+        text = "\n".join(line for line in lines if line and line != "|")
+        return _BLANK_LINES_RE.sub("\n", text)
+
+
+@functools.lru_cache(maxsize=32)
+def extract_main_content(html_text: str) -> str:
+    """Extracts the visible main content and links from an HTML page.
+
+    Scripts, styles, navigation, headers, footers and hidden elements are
+    dropped. If the page has a <main> element with visible content, only
+    that content is kept.
+
+    Args:
+      html_text: The HTML page.
+
+    Returns:
+      The page content as plain text, with links as `[text](href)`.
+    """
+    parser = _MainContentParser()
+    parser.feed(html_text)
+    parser.close()
+    return parser.get_text(main_only=True) or parser.get_text()
+
+
+class _LinkParser(html.parser.HTMLParser):
+    """Collects (text, href) pairs for all links in a page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: list[tuple[str, str]] = []
+        self._href: Optional[str] = None
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href:
+            text = _SPACES_RE.sub(" ", "".join(self._text)).strip()
+            self.links.append((text, self._href))
+            self._href = None
+
+    def handle_data(self, data):
+        if self._href:
+            self._text.append(data)
+
+
+def extract_links(html_text: str) -> list[tuple[str, str]]:
+    """Returns the (text, href) pairs of all links in an HTML page."""
+    parser = _LinkParser()
+    parser.feed(html_text)
+    parser.close()
+    return parser.links
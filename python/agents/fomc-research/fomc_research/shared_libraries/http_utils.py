@@ -0,0 +1,169 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""HTTP utility functions for FOMC Research Agent.
+
+Responses are fetched through a single pooled async client and stored in a
+content-addressed on-disk cache. Each URL has a small index entry recording
+the ETag / Last-Modified validators and the digest of the last body seen;
+bodies are stored once per digest. Cached URLs are revalidated with a
+conditional request, so an unchanged document costs one round trip and no
+transfer.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv(
+    "GOOGLE_GENAI_FOMC_AGENT_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "fomc_research_cache"),
+)
+REQUEST_TIMEOUT_SECS = 30
+MAX_CONNECTIONS = 10
+USER_AGENT = "Mozilla/5.0"
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class Response:
+    """A (possibly cached) HTTP response body."""
+
+    url: str
+    content: bytes
+    content_type: Optional[str]
+    from_cache: bool
+
+
+def get_client() -> httpx.AsyncClient:
+    """Returns the shared client, creating it for the running event loop."""
+    global _client, _client_loop  # pylint: disable=global-statement
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=REQUEST_TIMEOUT_SECS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+        )
+        _client_loop = loop
+    return _client
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _index_path(url: str) -> str:
+    return os.path.join(CACHE_DIR, "index", _sha256(url.encode()) + ".json")
+
+
+def _blob_path(digest: str) -> str:
+    return os.path.join(CACHE_DIR, "blobs", digest)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_cache_entry(url: str) -> Optional[tuple[dict, bytes]]:
+    """Returns the index entry and body cached for `url`, if any."""
+    try:
+        with open(_index_path(url), encoding="utf-8") as f:
+            entry = json.load(f)
+        with open(_blob_path(entry["digest"]), "rb") as f:
+            return entry, f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_cache_entry(url: str, entry: dict, content: bytes) -> None:
+    try:
+        blob_path = _blob_path(entry["digest"])
+        if not os.path.exists(blob_path):
+            _atomic_write(blob_path, content)
+        _atomic_write(_index_path(url), json.dumps(entry).encode())
+    except OSError as e:
+        logger.warning("Failed to cache %s: %s", url, e)
+
+
+async def fetch(url: str) -> Response:
+    """Fetches `url`, revalidating against the on-disk cache.
+
+    Args:
+      url: The URL to fetch.
+
+    Returns:
+      The response body and content type.
+
+    Raises:
+      httpx.HTTPError: if the request fails and no copy is cached. A cached
+        copy is served instead when the request fails in transport or with
+        a server error; client errors such as 404 are always raised.
+    """
+    cached = _read_cache_entry(url)
+    headers = {}
+    if cached:
+        if cached[0].get("etag"):
+            headers["If-None-Match"] = cached[0]["etag"]
+        if cached[0].get("last_modified"):
+            headers["If-Modified-Since"] = cached[0]["last_modified"]
+
+    try:
+        response = await get_client().get(url, headers=headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED and cached:
+            logger.debug("Cache hit (not modified): %s", url)
+            entry, content = cached
+            return Response(url, content, entry.get("content_type"), True)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        if not cached or (
+            isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500
+        ):
+            raise
+        logger.warning("Serving cached copy of %s after error: %s", url, e)
+        entry, content = cached
+        return Response(url, content, entry.get("content_type"), True)
+
+    content = response.content
+    content_type = response.headers.get("Content-Type")
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _write_cache_entry(
+            url,
+            {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_type": content_type,
+                "digest": _sha256(content),
+            },
+            content,
+        )
+    return Response(url, content, content_type, False)
@@ -0,0 +1,302 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Precomputed index of FOMC meetings for FOMC Research Agent.
+
+The index maps each meeting date to the URLs of its statement, press
+conference page, transcript and minutes, and optionally to the extracted
+text of those documents. It is built offline by
+deployment/build_meeting_index.py and stored as a JSON file, so the agent
+can resolve meeting metadata without scraping the Fed website.
+
+Meetings are identified by the Fed's URL naming scheme, which embeds the
+last day of the meeting (e.g. monetary20250129a1.pdf,
+fomcpresconf20250129.htm, fomcminutes20250129.htm), rather than by page
+layout.
+"""
+
+import asyncio
+import bisect
+import dataclasses
+import datetime
+import functools
+import json
+import logging
+import os
+import re
+from collections.abc import Iterable
+from typing import Optional
+
+import httpx
+
+from . import file_utils, html_utils, http_utils
+
+logger = logging.getLogger(__name__)
+
+FED_HOSTNAME = "https://www.federalreserve.gov"
+CALENDAR_URL = FED_HOSTNAME + "/monetarypolicy/fomccalendars.htm"
+INDEX_PATH = os.getenv(
+    "GOOGLE_GENAI_FOMC_AGENT_MEETING_INDEX",
+    os.path.join(os.path.dirname(__file__), "..", "data", "meeting_index.json"),
+)
+# Requests further than this from any indexed meeting are treated as misses;
+# about half the 6-8 week gap between meetings.
+MAX_LOOKUP_DISTANCE_DAYS = 21
+MAX_CONCURRENT_FETCHES = 8
+
+_STATEMENT_PDF_RE = re.compile(r"monetary(\d{8})a1\.pdf$")
+_PRESS_CONFERENCE_RE = re.compile(r"fomcpresconf(\d{8})\.htm$")
+_MINUTES_RE = re.compile(r"fomcminutes(\d{8})\.htm$")
+_TRANSCRIPT_PDF_RE = re.compile(r"FOMCpresconf(\d{8})\.pdf$", re.IGNORECASE)
+# Speaker turns in press conference transcripts, e.g. "CHAIR POWELL. ".
+_SPEAKER_RE = re.compile(r"^([A-Z][A-Z.' -]{2,}[A-Z])\.\s", re.MULTILINE)
+
+
+@dataclasses.dataclass
+class MeetingRecord:
+    """Metadata and (optionally) document text for one FOMC meeting."""
+
+    date: str
+    statement_pdf_url: Optional[str] = None
+    press_conference_url: Optional[str] = None
+    transcript_url: Optional[str] = None
+    minutes_url: Optional[str] = None
+    # Document name ("statement", "transcript", "minutes") -> text.
+    texts: dict[str, str] = dataclasses.field(default_factory=dict)
+    # Document name -> list of (section title, offset into text).
+    sections: dict[str, list[tuple[str, int]]] = dataclasses.field(
+        default_factory=dict
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class MeetingIndex:
+    """Meetings sorted by date, with date and URL lookup."""
+
+    meetings: tuple[MeetingRecord, ...]
+    dates: tuple[datetime.date, ...]
+    texts_by_url: dict[str, str]
+
+    @classmethod
+    def from_records(cls, records: Iterable[MeetingRecord]) -> "MeetingIndex":
+        meetings = tuple(sorted(records, key=lambda m: m.date))
+        texts_by_url = {}
+        for m in meetings:
+            for name, url in (
+                ("statement", m.statement_pdf_url),
+                ("transcript", m.transcript_url),
+                ("minutes", m.minutes_url),
+            ):
+                if url and name in m.texts:
+                    texts_by_url[_absolute_url(url)] = m.texts[name]
+        return cls(
+            meetings=meetings,
+            dates=tuple(datetime.date.fromisoformat(m.date) for m in meetings),
+            texts_by_url=texts_by_url,
+        )
+
+    def find_nearest(
+        self, date: datetime.date
+    ) -> Optional[tuple[MeetingRecord, Optional[MeetingRecord]]]:
+        """Finds the meeting nearest to `date` and the meeting before it.
+
+        Args:
+          date: The requested meeting date.
+
+        Returns:
+          A (requested, previous) tuple, where previous is the latest earlier
+          meeting that has a statement, or None if no indexed meeting is
+          within MAX_LOOKUP_DISTANCE_DAYS of `date`, or `date` is after the
+          last indexed meeting (the index may predate the meeting).
+        """
+        if not self.dates or date > self.dates[-1]:
+            return None
+        i = bisect.bisect_left(self.dates, date)
+        candidates = [j for j in (i - 1, i) if 0 <= j < len(self.dates)]
+        nearest = min(candidates, key=lambda j: abs(self.dates[j] - date))
+        if abs(self.dates[nearest] - date).days > MAX_LOOKUP_DISTANCE_DAYS:
+            return None
+        previous = next(
+            (
+                self.meetings[j]
+                for j in range(nearest - 1, -1, -1)
+                if self.meetings[j].statement_pdf_url
+            ),
+            None,
+        )
+        return self.meetings[nearest], previous
+
+    def get_text(self, url: str) -> Optional[str]:
+        """Returns the indexed text of the document at `url`, if any."""
+        return self.texts_by_url.get(_absolute_url(url))
+
+
+def _absolute_url(url: str) -> str:
+    return url if url.startswith("http") else FED_HOSTNAME + url
+
+
+def _date_from_match(match: re.Match) -> str:
+    return datetime.datetime.strptime(match.group(1), "%Y%m%d").date().isoformat()
+
+
+def find_sections(text: str) -> list[tuple[str, int]]:
+    """Returns (speaker, offset) pairs for each speaker turn in a transcript."""
+    return [(m.group(1), m.start()) for m in _SPEAKER_RE.finditer(text)]
+
+
+@functools.lru_cache(maxsize=4)
+def _load_index(path: str, mtime: float) -> MeetingIndex:
+    # pylint: disable=unused-argument
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    records = []
+    for m in data["meetings"]:
+        m["sections"] = {
+            name: [tuple(s) for s in sections]
+            for name, sections in m.get("sections", {}).items()
+        }
+        records.append(MeetingRecord(**m))
+    logger.info("Loaded %i meetings from %s", len(records), path)
+    return MeetingIndex.from_records(records)
+
+
+def load_index(path: str = INDEX_PATH) -> Optional[MeetingIndex]:
+    """Loads the meeting index, reusing the parsed copy until it changes.
+
+    Args:
+      path: Path of the index file.
+
+    Returns:
+      The index, or None if the file does not exist or is invalid.
+    """
+    try:
+        return _load_index(path, os.path.getmtime(path))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.error("Failed to load meeting index %s: %s", path, e)
+        return None
+
+
+def save_index(index: MeetingIndex, path: str = INDEX_PATH) -> None:
+    """Writes the meeting index to `path` as JSON."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"meetings": [dataclasses.asdict(m) for m in index.meetings]},
+            f,
+            indent=1,
+        )
+
+
+def parse_calendar_links(
+    links: Iterable[tuple[str, str]],
+) -> dict[str, MeetingRecord]:
+    """Groups calendar page links into meeting records by meeting date."""
+    meetings: dict[str, MeetingRecord] = {}
+    for _, href in links:
+        for regex, field in (
+            (_STATEMENT_PDF_RE, "statement_pdf_url"),
+            (_PRESS_CONFERENCE_RE, "press_conference_url"),
+            (_MINUTES_RE, "minutes_url"),
+        ):
+            match = regex.search(href)
+            if match:
+                date = _date_from_match(match)
+                record = meetings.setdefault(date, MeetingRecord(date=date))
+                setattr(record, field, href)
+    return meetings
+
+
+async def _fetch_text(url: str) -> str:
+    response = await http_utils.fetch(_absolute_url(url))
+    return response.content.decode("utf-8", errors="replace")
+
+
+async def _fill_meeting(
+    record: MeetingRecord, with_text: bool, semaphore: asyncio.Semaphore
+) -> None:
+    """Finds the transcript URL and extracts document text for a meeting."""
+    async with semaphore:
+        try:
+            if record.press_conference_url:
+                page = await _fetch_text(record.press_conference_url)
+                for _, href in html_utils.extract_links(page):
+                    if _TRANSCRIPT_PDF_RE.search(href):
+                        record.transcript_url = href
+                        break
+            if not with_text:
+                return
+            for name, url in (
+                ("statement", record.statement_pdf_url),
+                ("transcript", record.transcript_url),
+            ):
+                if not url:
+                    continue
+                response = await http_utils.fetch(_absolute_url(url))
+                try:
+                    record.texts[name] = await file_utils.extract_text_from_pdf(
+                        response.content
+                    )
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    # pdfplumber and pdfminer raise a variety of errors on
+                    # malformed documents; one bad PDF must not fail the index.
+                    logger.warning(
+                        "Could not parse the %s of meeting %s: %s",
+                        name,
+                        record.date,
+                        e,
+                    )
+            if record.minutes_url:
+                record.texts["minutes"] = html_utils.extract_main_content(
+                    await _fetch_text(record.minutes_url)
+                )
+            if "transcript" in record.texts:
+                record.sections["transcript"] = find_sections(
+                    record.texts["transcript"]
+                )
+        except httpx.HTTPError as e:
+            logger.warning("Incomplete data for meeting %s: %s", record.date, e)
+
+
+async def build_index(
+    calendar_urls: Iterable[str] = (CALENDAR_URL,), with_text: bool = True
+) -> MeetingIndex:
+    """Builds the meeting index by crawling the Fed website.
+
+    Args:
+      calendar_urls: Calendar pages listing FOMC meetings.
+      with_text: Whether to download and extract the text of statements,
+        transcripts and minutes.
+
+    Returns:
+      The meeting index.
+    """
+    meetings: dict[str, MeetingRecord] = {}
+    for url in calendar_urls:
+        page = await _fetch_text(url)
+        for date, record in parse_calendar_links(
+            html_utils.extract_links(page)
+        ).items():
+            existing = meetings.setdefault(date, record)
+            for field in dataclasses.fields(record):
+                if getattr(existing, field.name) is None:
+                    setattr(existing, field.name, getattr(record, field.name))
+    logger.info("Found %i meetings", len(meetings))
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    await asyncio.gather(
+        *(_fill_meeting(m, with_text, semaphore) for m in meetings.values())
+    )
+    return MeetingIndex.from_records(meetings.values())
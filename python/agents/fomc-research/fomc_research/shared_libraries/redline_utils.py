@@ -0,0 +1,225 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Redline (diff) utility functions for FOMC Research Agent.
+
+Documents are first split into sentence/line segments and aligned at the
+segment level, which is cheap even for long transcripts. Character-level
+diffs are then computed only inside the blocks of segments that changed.
+Rendered redlines are cached by the digests of the two input texts.
+"""
+
+import collections
+import concurrent.futures
+import hashlib
+import html
+import logging
+import os
+import re
+from collections.abc import Callable, Iterable, Sequence
+from typing import Optional
+
+import diff_match_patch as dmp
+
+from . import http_utils
+
+logger = logging.getLogger(__name__)
+
+REDLINE_CACHE_DIR = os.path.join(http_utils.CACHE_DIR, "redlines")
+MEMORY_CACHE_SIZE = 64
+# Upper bound on the time spent in any single character-level diff.
+DIFF_TIMEOUT_SECS = 1.0
+
+# A segment is a run of text up to and including a sentence terminator or a
+# newline, plus any trailing whitespace. Concatenating all segments yields the
+# original text.
+_SEGMENT_RE = re.compile(r"[^\n.!?]*(?:[.!?]+|\n)?\s*")
+
+_DEL_OPEN = '<del style="background-color: #ffcccc;">'
+_INS_OPEN = '<ins style="background-color: #ccffcc;">'
+
+_memory_cache: collections.OrderedDict[tuple[str, str], str] = (
+    collections.OrderedDict()
+)
+
+
+def _split_segments(text: str) -> list[str]:
+    return [s for s in _SEGMENT_RE.findall(text) if s]
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _encode_segments(
+    segments: Sequence[str], codes: dict[str, str]
+) -> str:
+    """Maps each distinct segment to a single character (dmp line mode)."""
+    chars = []
+    for segment in segments:
+        code = codes.get(segment)
+        if code is None:
+            # Offset past the control characters; statements and transcripts
+            # have far fewer distinct segments than the BMP has code points.
+            code = chr(len(codes) + 32)
+            codes[segment] = code
+        chars.append(code)
+    return "".join(chars)
+
+
+def compute_diffs(old_text: str, new_text: str) -> list[tuple[int, str]]:
+    """Computes a semantic diff from old_text to new_text.
+
+    Args:
+      old_text: The original text.
+      new_text: The changed text.
+
+    Returns:
+      A list of (op, text) tuples, where op is -1 (deletion), 1 (insertion)
+      or 0 (unchanged), in diff_match_patch format.
+    """
+    d = dmp.diff_match_patch()
+    d.Diff_Timeout = DIFF_TIMEOUT_SECS
+
+    old_segments = _split_segments(old_text)
+    new_segments = _split_segments(new_text)
+    codes: dict[str, str] = {}
+    old_chars = _encode_segments(old_segments, codes)
+    new_chars = _encode_segments(new_segments, codes)
+    segment_diffs = d.diff_main(old_chars, new_chars, False)
+
+    diffs: list[tuple[int, str]] = []
+    old_pos = new_pos = 0
+    deleted: list[str] = []
+    inserted: list[str] = []
+
+    def flush_changed_block() -> None:
+        if deleted and inserted:
+            block_diffs = d.diff_main("".join(deleted), "".join(inserted))
+            d.diff_cleanupSemantic(block_diffs)
+            diffs.extend(block_diffs)
+        elif deleted:
+            diffs.append((dmp.diff_match_patch.DIFF_DELETE, "".join(deleted)))
+        elif inserted:
+            diffs.append((dmp.diff_match_patch.DIFF_INSERT, "".join(inserted)))
+        deleted.clear()
+        inserted.clear()
+
+    for op, chars in segment_diffs:
+        n = len(chars)
+        if op == dmp.diff_match_patch.DIFF_DELETE:
+            deleted.extend(old_segments[old_pos : old_pos + n])
+            old_pos += n
+        elif op == dmp.diff_match_patch.DIFF_INSERT:
+            inserted.extend(new_segments[new_pos : new_pos + n])
+            new_pos += n
+        else:
+            flush_changed_block()
+            diffs.append((op, "".join(old_segments[old_pos : old_pos + n])))
+            old_pos += n
+            new_pos += n
+    flush_changed_block()
+    return diffs
+
+
+def write_html_redline(
+    diffs: Iterable[tuple[int, str]], write: Callable[[str], object]
+) -> None:
+    """Writes diffs as escaped HTML through `write` (e.g. a file's write)."""
+    for op, text in diffs:
+        escaped = html.escape(text, quote=False)
+        if op == dmp.diff_match_patch.DIFF_DELETE:
+            write(_DEL_OPEN)
+            write(escaped)
+            write("</del>")
+        elif op == dmp.diff_match_patch.DIFF_INSERT:
+            write(_INS_OPEN)
+            write(escaped)
+            write("</ins>")
+        else:
+            write(escaped)
+
+
+def _read_disk_cache(key: tuple[str, str]) -> Optional[str]:
+    try:
+        with open(
+            os.path.join(REDLINE_CACHE_DIR, "_".join(key) + ".html"),
+            encoding="utf-8",
+        ) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_disk_cache(key: tuple[str, str], redline: str) -> None:
+    try:
+        os.makedirs(REDLINE_CACHE_DIR, exist_ok=True)
+        path = os.path.join(REDLINE_CACHE_DIR, "_".join(key) + ".html")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(redline)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Failed to cache redline %s: %s", key, e)
+
+
+def create_html_redline(text1: str, text2: str) -> str:
+    """Creates an HTML redline doc of differences between text1 and text2.
+
+    Text removed from text2 is marked with <del> and text added in text1 is
+    marked with <ins>.
+
+    Args:
+      text1: The current text.
+      text2: The previous text.
+
+    Returns:
+      The redline as an HTML fragment.
+    """
+    key = (_digest(text2), _digest(text1))
+    redline = _memory_cache.get(key)
+    if redline is not None:
+        _memory_cache.move_to_end(key)
+        return redline
+
+    redline = _read_disk_cache(key)
+    if redline is None:
+        parts: list[str] = []
+        write_html_redline(compute_diffs(text2, text1), parts.append)
+        redline = "".join(parts)
+        _write_disk_cache(key, redline)
+
+    _memory_cache[key] = redline
+    if len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+    return redline
+
+
+def create_html_redlines(
+    texts: Sequence[str], max_workers: Optional[int] = None
+) -> list[str]:
+    """Creates redlines between each pair of consecutive texts in parallel.
+
+    Args:
+      texts: Texts in chronological order.
+      max_workers: Number of worker processes (defaults to the CPU count).
+
+    Returns:
+      A list of len(texts) - 1 redlines; element i compares texts[i + 1]
+      against texts[i].
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        return list(
+            executor.map(create_html_redline, texts[1:], texts[:-1])
+        )
@@ -0,0 +1,222 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Session state size control for FOMC Research Agent.
+
+Every state change is persisted with the event that made it, so large state
+values make every event append and model turn slower. Values written through
+store_state() are measured; values larger than SPILL_THRESHOLD_BYTES, or the
+largest values once the managed keys exceed STATE_BUDGET_BYTES, are
+gzip-compressed into an artifact and replaced in state by a small reference
+handle. Prompts that use such keys should be wrapped with
+instruction_provider() so the handles are resolved when the prompt is built.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import typing
+from collections.abc import Awaitable, Callable
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.utils import instructions_utils
+from google.genai.types import Blob, Part
+
+logger = logging.getLogger(__name__)
+
+SPILL_THRESHOLD_BYTES = int(
+    os.getenv("GOOGLE_GENAI_FOMC_AGENT_SPILL_THRESHOLD_BYTES", "8192")
+)
+STATE_BUDGET_BYTES = int(
+    os.getenv("GOOGLE_GENAI_FOMC_AGENT_STATE_BUDGET_BYTES", "65536")
+)
+# Values smaller than this always stay inline, so small scalar keys that tools
+# read directly (dates, URLs) are never replaced by a handle.
+MIN_SPILL_BYTES = 1024
+METRICS_KEY = "state_budget"
+REF_KEY = "state_ref"
+
+_STATE_VAR_RE = re.compile(r"{([A-Za-z_][A-Za-z0-9_]*)}")
+
+
+def _encode(value: typing.Any) -> typing.Optional[bytes]:
+    """Serializes a value to JSON, or returns None if it is not JSON-able."""
+    try:
+        return json.dumps(value).encode("utf-8")
+    except (TypeError, ValueError):
+        return None
+
+
+def is_spilled(value: typing.Any) -> bool:
+    """Returns True if `value` is a reference to a spilled state value."""
+    return isinstance(value, dict) and REF_KEY in value
+
+
+async def _spill(
+    key: str, data: bytes, context: CallbackContext
+) -> dict[str, typing.Any]:
+    filename = f"state.{key}.json.gz"
+    version = await context.save_artifact(
+        filename=filename,
+        artifact=Part(
+            inline_data=Blob(
+                data=gzip.compress(data), mime_type="application/gzip"
+            )
+        ),
+    )
+    logger.info(
+        "Spilled state key %s (%i bytes) to artifact %s", key, len(data), filename
+    )
+    return {REF_KEY: filename, "version": version, "bytes": len(data)}
+
+
+async def store_state(
+    values: dict[str, typing.Any], context: CallbackContext
+) -> dict[str, typing.Any]:
+    """Stores values in session state, spilling large values to artifacts.
+
+    Args:
+      values: A dict of new state values.
+      context: The tool or callback context.
+
+    Returns:
+      The updated state budget metrics.
+    """
+    metrics = get_metrics(context.state)
+    inline = metrics["inline_bytes"]
+    spilled = metrics["spilled_bytes"]
+    updates: dict[str, typing.Any] = {}
+    encoded: dict[str, bytes] = {}
+
+    for key, value in values.items():
+        inline.pop(key, None)
+        spilled.pop(key, None)
+        data = _encode(value)
+        if data is None:
+            updates[key] = value
+            continue
+        if len(data) > SPILL_THRESHOLD_BYTES:
+            updates[key] = await _spill(key, data, context)
+            spilled[key] = len(data)
+        else:
+            updates[key] = value
+            inline[key] = len(data)
+            encoded[key] = data
+
+    # Spill the largest managed values until the inline total fits the budget.
+    while sum(inline.values()) > STATE_BUDGET_BYTES:
+        key = max(inline, key=inline.get)
+        if inline[key] < MIN_SPILL_BYTES:
+            break
+        data = encoded.get(key)
+        if data is None:
+            data = _encode(context.state.get(key))
+        updates[key] = await _spill(key, data, context)
+        spilled[key] = inline.pop(key)
+
+    metrics["spill_count"] += sum(
+        1 for key, value in updates.items() if is_spilled(value)
+    )
+    metrics["inline_total_bytes"] = sum(inline.values())
+    metrics["spilled_total_bytes"] = sum(spilled.values())
+    updates[METRICS_KEY] = metrics
+    context.state.update(updates)
+    return metrics
+
+
+def get_metrics(state: typing.Mapping[str, typing.Any]) -> dict[str, typing.Any]:
+    """Returns (a copy of) the state budget metrics.
+
+    The metrics record the serialized size of each key managed by
+    store_state(), split into values kept inline and values spilled to
+    artifacts, plus totals and the number of spills performed.
+    """
+    metrics = state.get(METRICS_KEY) or {}
+    return {
+        "inline_bytes": dict(metrics.get("inline_bytes", {})),
+        "spilled_bytes": dict(metrics.get("spilled_bytes", {})),
+        "inline_total_bytes": metrics.get("inline_total_bytes", 0),
+        "spilled_total_bytes": metrics.get("spilled_total_bytes", 0),
+        "spill_count": metrics.get("spill_count", 0),
+    }
+
+
+async def load_state_value(key: str, context: CallbackContext) -> typing.Any:
+    """Returns the value of a state key, loading it if it was spilled.
+
+    Args:
+      key: The state key.
+      context: The tool or callback context.
+
+    Returns:
+      The stored value, or None if the key (or its artifact) is missing.
+    """
+    value = context.state.get(key)
+    if not is_spilled(value):
+        return value
+    artifact = await context.load_artifact(
+        filename=value[REF_KEY], version=value.get("version")
+    )
+    if not artifact or not artifact.inline_data:
+        logger.error("Missing artifact %s for state key %s", value[REF_KEY], key)
+        return None
+    return json.loads(gzip.decompress(artifact.inline_data.data))
+
+
+def instruction_provider(
+    template: str,
+) -> Callable[[ReadonlyContext], Awaitable[str]]:
+    """Returns an instruction provider that resolves spilled state values.
+
+    The template uses the usual {key} and {artifact.name} placeholders.
+
+    Args:
+      template: The instruction template.
+
+    Returns:
+      An async InstructionProvider for an Agent's `instruction`.
+    """
+
+    async def provide(readonly_context: ReadonlyContext) -> str:
+        state = readonly_context.state
+        spilled_keys = {
+            key
+            for key in _STATE_VAR_RE.findall(template)
+            if is_spilled(state.get(key))
+        }
+        if not spilled_keys:
+            return await instructions_utils.inject_session_state(
+                template, readonly_context
+            )
+
+        # Mask the spilled placeholders so inject_session_state leaves them
+        # alone, then substitute the loaded values afterwards (they may
+        # themselves contain braces).
+        masked = template
+        for key in spilled_keys:
+            masked = masked.replace("{" + key + "}", f"\x00{key}\x00")
+        instruction = await instructions_utils.inject_session_state(
+            masked, readonly_context
+        )
+        # pylint: disable=protected-access
+        context = CallbackContext(readonly_context._invocation_context)
+        for key in spilled_keys:
+            value = await load_state_value(key, context)
+            instruction = instruction.replace(f"\x00{key}\x00", str(value))
+        return instruction
+
+    return provide
@@ -17,6 +17,7 @@
 from google.adk.agents import Agent
 
 from ..agent import MODEL
+from ..shared_libraries import state_utils
 from ..shared_libraries.callbacks import rate_limit_callback
 from . import analysis_agent_prompt
 
@@ -26,6 +27,6 @@ AnalysisAgent = Agent(
     description=(
         "Analyze inputs and determine implications for future FOMC actions."
     ),
-    instruction=analysis_agent_prompt.PROMPT,
+    instruction=state_utils.instruction_provider(analysis_agent_prompt.PROMPT),
     before_model_callback=rate_limit_callback,
 )
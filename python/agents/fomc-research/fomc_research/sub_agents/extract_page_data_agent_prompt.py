@@ -23,12 +23,14 @@ Your job is to extract important data from a web page.
 
 <INSTRUCTIONS>
 The contents of the web page are provided above in the 'page_contents' section.
+The page has already been converted to plain text: only the main content is
+included, and each link is shown in Markdown format as [link text](URL).
 The data fields needed are provided in the 'data_to_extract' section of the user
 input.
 
 Read the contents of the web page and extract the pieces of data requested.
-Don't use any other HTML parser, just examine the HTML yourself and extract the
-information.
+When a field asks for a URL, use the URL of the matching link exactly as it
+appears in the page contents.
 
 First, use the store_state tool to store the extracted data in the ToolContext.
 
@@ -20,6 +20,7 @@ from google.adk.tools.agent_tool import AgentTool
 from ..agent import MODEL
 from ..shared_libraries.callbacks import rate_limit_callback
 from ..tools.fetch_page import fetch_page_tool
+from ..tools.lookup_meeting import lookup_meeting_tool
 from . import retrieve_meeting_data_agent_prompt
 from .extract_page_data_agent import ExtractPageDataAgent
 
@@ -29,6 +30,7 @@ RetrieveMeetingDataAgent = Agent(
     description=("Retrieve data about a Fed meeting from the Fed website"),
     instruction=retrieve_meeting_data_agent_prompt.PROMPT,
     tools=[
+        lookup_meeting_tool,
         fetch_page_tool,
         AgentTool(ExtractPageDataAgent),
     ],
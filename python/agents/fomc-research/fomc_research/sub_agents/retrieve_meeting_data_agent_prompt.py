@@ -20,6 +20,10 @@ Your job is to retrieve data about a Fed meeting from the Fed website.
 Follow these steps in order (be sure to tell the user what you're doing at each
 step, but without giving technical details):
 
+0) Call the lookup_meeting tool. If it returns status "OK", all the meeting data
+   has already been stored; skip steps 1 to 4 and go directly to step 5.
+   Otherwise, continue with step 1.
+
 1) Call the fetch_page tool to retrieve this web page:
    url = "https://www.federalreserve.gov/monetarypolicy/fomccalendars.htm"
 
@@ -14,16 +14,34 @@
 
 """'compare_statements' tool for FOMC Research sample agent."""
 
+import asyncio
 import logging
 
 from google.adk.tools import ToolContext
 from google.genai.types import Part
 
-from ..shared_libraries import file_utils
+from ..shared_libraries import file_utils, meeting_index, redline_utils
 
 logger = logging.getLogger(__name__)
 
 
+async def _get_statement_text(
+    url: str, output_filename: str, tool_context: ToolContext
+) -> str:
+    """Returns the statement text from the meeting index, or downloads it."""
+    index = meeting_index.load_index()
+    text = index.get_text(url) if index else None
+    if text:
+        logger.info("Using indexed text for %s", url)
+        return text
+    pdf_path = await file_utils.download_file_from_url(
+        url, output_filename, tool_context
+    )
+    if not pdf_path:
+        return ""
+    return await file_utils.extract_text_from_pdf_artifact(pdf_path, tool_context)
+
+
 async def compare_statements_tool(tool_context: ToolContext) -> dict[str, str]:
     """Compares requested and previous statements and generates HTML redline.
 
@@ -46,33 +64,17 @@ async def compare_statements_tool(tool_context: ToolContext) -> dict[str, str]:
     if not prev_statement_url.startswith("https"):
         prev_statement_url = fed_hostname + prev_statement_url
 
-    # Download PDFs from URLs to artifacts
-    reqd_pdf_path = await file_utils.download_file_from_url(
-        reqd_statement_url, "curr.pdf", tool_context
-    )
-    prev_pdf_path = await file_utils.download_file_from_url(
-        prev_statement_url, "prev.pdf", tool_context
-    )
-
-    if reqd_pdf_path is None or reqd_pdf_path is None:
-        logger.error("Failed to download files, aborting")
-        return {
-            "status": "error",
-            "error_message": "Failed to download statement files",
-        }
-
-    reqd_pdf_text = await file_utils.extract_text_from_pdf_artifact(
-        reqd_pdf_path, tool_context
-    )
-    prev_pdf_text = await file_utils.extract_text_from_pdf_artifact(
-        prev_pdf_path, tool_context
+    # Retrieve both statements concurrently
+    reqd_pdf_text, prev_pdf_text = await asyncio.gather(
+        _get_statement_text(reqd_statement_url, "curr.pdf", tool_context),
+        _get_statement_text(prev_statement_url, "prev.pdf", tool_context),
     )
 
-    if reqd_pdf_text is None or prev_pdf_text is None:
-        logger.error("Failed to extract text from PDFs, aborting")
+    if not reqd_pdf_text or not prev_pdf_text:
+        logger.error("Failed to retrieve statement texts, aborting")
         return {
             "status": "error",
-            "error_message": "Failed to extract text from PDFs",
+            "error_message": "Failed to retrieve statement texts",
         }
 
     await tool_context.save_artifact(
@@ -84,7 +86,7 @@ async def compare_statements_tool(tool_context: ToolContext) -> dict[str, str]:
         artifact=Part(text=prev_pdf_text),
     )
 
-    redline_html = file_utils.create_html_redline(reqd_pdf_text, prev_pdf_text)
+    redline_html = redline_utils.create_html_redline(reqd_pdf_text, prev_pdf_text)
     await file_utils.save_html_to_artifact(
         redline_html, "statement_redline", tool_context
     )
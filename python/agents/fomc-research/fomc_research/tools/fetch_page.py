@@ -15,16 +15,21 @@
 """'fetch_page' tool for FOMC Research sample agent"""
 
 import logging
-import urllib.request
 
+import httpx
 from google.adk.tools import ToolContext
 
+from ..shared_libraries import html_utils, http_utils, state_utils
+
 logger = logging.getLogger(__name__)
 
 
-def fetch_page_tool(url: str, tool_context: ToolContext) -> dict[str, str]:
+async def fetch_page_tool(url: str, tool_context: ToolContext) -> dict[str, str]:
     """Retrieves the content of 'url' and stores it in the ToolContext.
 
+    Only the main text content and links of the page are stored, not the raw
+    HTML.
+
     Args:
       url: URL to fetch.
       tool_context: ToolContext object.
@@ -32,16 +37,23 @@ def fetch_page_tool(url: str, tool_context: ToolContext) -> dict[str, str]:
     Returns:
       A dict with "status" and (optional) "error_message" keys.
     """
-    opener = urllib.request.build_opener()
-    opener.addheaders = [("User-Agent", "Mozilla/5.0")]
-    urllib.request.install_opener(opener)
     logger.debug("Fetching page: %s", url)
     try:
-        page = urllib.request.urlopen(url)
-        page_text = page.read().decode("utf-8")
-    except urllib.error.HTTPError as err:
-        errmsg = "Failed to fetch page %s: %s", url, err
+        response = await http_utils.fetch(url)
+    except httpx.HTTPError as err:
+        errmsg = f"Failed to fetch page {url}: {err}"
         logger.error(errmsg)
         return {"status": "ERROR", "message": errmsg}
-    tool_context.state.update({"page_contents": page_text})
+
+    page_text = html_utils.extract_main_content(
+        response.content.decode("utf-8", errors="replace")
+    )
+    logger.debug(
+        "Fetched %s (cached: %s): %i bytes of HTML, %i chars of content",
+        url,
+        response.from_cache,
+        len(response.content),
+        len(page_text),
+    )
+    await state_utils.store_state({"page_contents": page_text}, tool_context)
     return {"status": "OK"}
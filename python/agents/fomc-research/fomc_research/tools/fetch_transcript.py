@@ -19,11 +19,21 @@ import logging
 from google.adk.tools import ToolContext
 from google.genai.types import Part
 
-from ..shared_libraries import file_utils
+from ..shared_libraries import file_utils, meeting_index
 
 logger = logging.getLogger(__name__)
 
 
+async def _download_transcript_text(url: str, tool_context: ToolContext) -> str:
+    pdf_path = await file_utils.download_file_from_url(
+        url, "transcript.pdf", tool_context
+    )
+    if not pdf_path:
+        logger.error("Failed to download PDF from %s", url)
+        return ""
+    return await file_utils.extract_text_from_pdf_artifact(pdf_path, tool_context)
+
+
 async def fetch_transcript_tool(tool_context: ToolContext) -> dict:
     """Retrieves the Fed press conference transcript from the Fed website.
 
@@ -37,17 +47,18 @@ async def fetch_transcript_tool(tool_context: ToolContext) -> dict:
     transcript_url = tool_context.state["transcript_url"]
     if not transcript_url.startswith("https"):
         transcript_url = fed_hostname + transcript_url
-    pdf_path = await file_utils.download_file_from_url(
-        transcript_url, "transcript.pdf", tool_context
-    )
-    if pdf_path is None:
-        logger.error("Failed to download PDF from URLs, aborting")
+    index = meeting_index.load_index()
+    text = index.get_text(transcript_url) if index else None
+    if text:
+        logger.info("Using indexed text for %s", transcript_url)
+    else:
+        text = await _download_transcript_text(transcript_url, tool_context)
+    if not text:
+        logger.error("Failed to retrieve transcript text, aborting")
         return {
             "status": "error",
-            "error_message": "Failed to download PDFs from GCS",
+            "error_message": "Failed to retrieve transcript text",
         }
-
-    text = await file_utils.extract_text_from_pdf_artifact(pdf_path, tool_context)
     filename = "transcript_fulltext"
     version = await tool_context.save_artifact(
         filename=filename, artifact=Part(text=text)
@@ -0,0 +1,82 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""'lookup_meeting' tool for FOMC Research sample agent"""
+
+import datetime
+import logging
+
+from google.adk.tools import ToolContext
+
+from ..shared_libraries import meeting_index
+
+logger = logging.getLogger(__name__)
+
+
+def lookup_meeting_tool(tool_context: ToolContext) -> dict[str, str]:
+    """Looks up the requested meeting in the local FOMC meeting index.
+
+    On success, stores the meeting dates and the statement, press conference
+    and transcript URLs for the requested and previous meetings in the
+    ToolContext.
+
+    Args:
+      tool_context: ToolContext object.
+
+    Returns:
+      A dict with "status" and (optional) "message" keys. The status is
+      "NOT_FOUND" if the meeting is not in the index.
+    """
+    requested_date = tool_context.state["user_requested_meeting_date"]
+    index = meeting_index.load_index()
+    if index is None:
+        return {"status": "NOT_FOUND", "message": "No meeting index available"}
+    try:
+        result = index.find_nearest(
+            datetime.date.fromisoformat(requested_date)
+        )
+    except ValueError:
+        return {
+            "status": "ERROR",
+            "message": f"Invalid meeting date: {requested_date}",
+        }
+    if result is None or result[1] is None:
+        return {
+            "status": "NOT_FOUND",
+            "message": f"No indexed meeting near {requested_date}",
+        }
+
+    requested, previous = result
+    if not (
+        requested.statement_pdf_url
+        and requested.press_conference_url
+        and requested.transcript_url
+    ):
+        return {
+            "status": "NOT_FOUND",
+            "message": f"Incomplete index data for meeting {requested.date}",
+        }
+    state = {
+        "requested_meeting_date": requested.date,
+        "previous_meeting_date": previous.date,
+        "requested_meeting_url": requested.press_conference_url,
+        "previous_meeting_url": previous.press_conference_url or "",
+        "requested_meeting_statement_pdf_url": requested.statement_pdf_url,
+        "previous_meeting_statement_pdf_url": previous.statement_pdf_url,
+        "transcript_url": requested.transcript_url,
+    }
+    logger.info("lookup_meeting_tool(): %s", state)
+    tool_context.state.update(state)
+    return {"status": "OK"}
@@ -19,14 +19,19 @@ import typing
 
 from google.adk.tools import ToolContext
 
+from ..shared_libraries import state_utils
+
 logger = logging.getLogger(__name__)
 
 
-def store_state_tool(
+async def store_state_tool(
     state: dict[str, typing.Any], tool_context: ToolContext
 ) -> dict[str, str]:
     """Stores new state values in the ToolContext.
 
+    Large values are compressed into artifacts and replaced in the state by
+    a reference handle.
+
     Args:
       state: A dict of new state values.
       tool_context: ToolContext object.
@@ -35,5 +40,6 @@ def store_state_tool(
       A dict with "status" and (optional) "error_message" keys.
     """
     logger.info("store_state_tool(): %s", state)
-    tool_context.state.update(state)
+    metrics = await state_utils.store_state(state, tool_context)
+    logger.debug("State budget: %s", metrics)
     return {"status": "ok"}
@@ -0,0 +1,56 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the HTML text extraction helpers."""
+
+import unittest
+
+from fomc_research.shared_libraries.html_utils import extract_main_content
+
+
+class TestExtractMainContent(unittest.TestCase):
+    """Tests for extract_main_content."""
+
+    def test_keeps_only_main_element(self):
+        html = (
+            "<html><body><nav>Site menu</nav>"
+            "<main><p>Policy statement</p></main>"
+            "<footer>Contact us</footer></body></html>"
+        )
+        self.assertEqual(extract_main_content(html), "Policy statement")
+
+    def test_main_menu_tag_is_not_a_main_element(self):
+        html = (
+            "<html><body><main-menu>Home</main-menu>"
+            "<p>Policy statement</p></body></html>"
+        )
+        text = extract_main_content(html)
+        self.assertIn("Policy statement", text)
+        self.assertIn("Home", text)
+
+    def test_main_inside_script_is_ignored(self):
+        html = (
+            "<html><body>"
+            "<script>document.write('<main>');</script>"
+            "<p>Policy statement</p></body></html>"
+        )
+        self.assertEqual(extract_main_content(html), "Policy statement")
+
+    def test_empty_main_falls_back_to_full_page(self):
+        html = "<html><body><main></main><p>Policy statement</p></body></html>"
+        self.assertEqual(extract_main_content(html), "Policy statement")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the cached HTTP fetcher."""
+
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+
+from fomc_research.shared_libraries import http_utils
+
+URL = "https://example.com/page.htm"
+
+
+class TestFetch(unittest.TestCase):
+    """Tests for http_utils.fetch."""
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = mock.patch.object(http_utils, "CACHE_DIR", cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fetch(self, handler) -> http_utils.Response:
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with client:
+                with mock.patch.object(http_utils, "get_client", return_value=client):
+                    return await http_utils.fetch(URL)
+
+        return asyncio.run(run())
+
+    def _cache_page(self):
+        self._fetch(
+            lambda request: httpx.Response(
+                200, content=b"cached", headers={"ETag": '"v1"'}
+            )
+        )
+
+    def test_not_modified_serves_cached_copy(self):
+        self._cache_page()
+        response = self._fetch(lambda request: httpx.Response(304))
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.content, b"cached")
+
+    def test_server_error_serves_cached_copy(self):
+        self._cache_page()
+        response = self._fetch(lambda request: httpx.Response(503))
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.content, b"cached")
+
+    def test_transport_error_serves_cached_copy(self):
+        self._cache_page()
+
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        response = self._fetch(handler)
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.content, b"cached")
+
+    def test_client_error_is_raised_despite_cached_copy(self):
+        self._cache_page()
+        with self.assertRaises(httpx.HTTPStatusError):
+            self._fetch(lambda request: httpx.Response(404))
+
+    def test_server_error_is_raised_without_cached_copy(self):
+        with self.assertRaises(httpx.HTTPStatusError):
+            self._fetch(lambda request: httpx.Response(503))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for building the FOMC meeting index."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from fomc_research.shared_libraries import http_utils, meeting_index
+
+
+class TestFillMeeting(unittest.TestCase):
+    """Tests for meeting_index._fill_meeting."""
+
+    def test_malformed_pdf_leaves_document_unfilled(self):
+        async def fetch(url):
+            if url.endswith(".pdf"):
+                return http_utils.Response(url, b"not a pdf", "application/pdf", False)
+            return http_utils.Response(
+                url, b"<main><p>Minutes text</p></main>", "text/html", False
+            )
+
+        record = meeting_index.MeetingRecord(
+            date="2025-01-29",
+            statement_pdf_url="https://example.com/statement.pdf",
+            minutes_url="https://example.com/minutes.htm",
+        )
+        with mock.patch.object(http_utils, "fetch", side_effect=fetch):
+            asyncio.run(
+                meeting_index._fill_meeting(  # pylint: disable=protected-access
+                    record, with_text=True, semaphore=asyncio.Semaphore(1)
+                )
+            )
+
+        self.assertNotIn("statement", record.texts)
+        self.assertEqual(record.texts["minutes"], "Minutes text")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import datetime
+import json
 import logging
 import re
 from collections.abc import AsyncGenerator
@@ -21,8 +23,10 @@ from typing import Literal
 from google.adk.agents import BaseAgent, LlmAgent, LoopAgent, SequentialAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import StreamingMode
 from google.adk.events import Event, EventActions
 from google.adk.planners import BuiltInPlanner
+from google.adk.sessions.state import State
 from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 from google.genai import types as genai_types
@@ -55,26 +59,31 @@ class Feedback(BaseModel):
     )
 
 
-# --- Callbacks ---
-def collect_research_sources_callback(callback_context: CallbackContext) -> None:
-    """Collects and organizes web-based research sources and their supported claims from agent events.
+# --- Research Sources ---
+SOURCES_ARTIFACT = "research_sources.json"
 
-    This function processes the agent's `session.events` to extract web source details (URLs,
-    titles, domains from `grounding_chunks`) and associated text segments with confidence scores
-    (from `grounding_supports`). The aggregated source information and a mapping of URLs to short
-    IDs are cumulatively stored in `callback_context.state`.
 
-    Args:
-        callback_context (CallbackContext): The context object providing access to the agent's
-            session events and persistent state.
+class SourceStore:
+    """The web sources found by the research and the claims they support.
+
+    Sources are deduplicated by URL, and claims by source and text segment; a
+    repeated claim keeps its highest confidence. Session state keeps only the
+    `max_claims` most confident claims of each source, so it stays bounded
+    however long the research runs; `save_source_record` writes every claim to
+    the `research_sources.json` artifact once the research is done.
     """
-    session = callback_context._invocation_context.session
-    url_to_short_id = callback_context.state.get("url_to_short_id", {})
-    sources = callback_context.state.get("sources", {})
-    id_counter = len(url_to_short_id) + 1
-    for event in session.events:
+
+    def __init__(
+        self, state: State | dict, max_claims: int | None = config.max_claims_per_source
+    ):
+        self.url_to_short_id: dict[str, str] = state.get("url_to_short_id", {})
+        self.sources: dict[str, dict] = state.get("sources", {})
+        self.max_claims = max_claims
+
+    def add_grounding(self, event: Event) -> None:
+        """Adds the web sources and supported claims of one event's grounding metadata."""
         if not (event.grounding_metadata and event.grounding_metadata.grounding_chunks):
-            continue
+            return
         chunks_info = {}
         for idx, chunk in enumerate(event.grounding_metadata.grounding_chunks):
             if not chunk.web:
@@ -85,37 +94,191 @@ def collect_research_sources_callback(callback_context: CallbackContext) -> None
                 if chunk.web.title != chunk.web.domain
                 else chunk.web.domain
             )
-            if url not in url_to_short_id:
-                short_id = f"src-{id_counter}"
-                url_to_short_id[url] = short_id
-                sources[short_id] = {
+            short_id = self.url_to_short_id.setdefault(
+                url, f"src-{len(self.url_to_short_id) + 1}"
+            )
+            if short_id not in self.sources:
+                self.sources[short_id] = {
                     "short_id": short_id,
                     "title": title,
                     "url": url,
                     "domain": chunk.web.domain,
                     "supported_claims": [],
                 }
-                id_counter += 1
-            chunks_info[idx] = url_to_short_id[url]
-        if event.grounding_metadata.grounding_supports:
-            for support in event.grounding_metadata.grounding_supports:
-                confidence_scores = support.confidence_scores or []
-                chunk_indices = support.grounding_chunk_indices or []
-                for i, chunk_idx in enumerate(chunk_indices):
-                    if chunk_idx in chunks_info:
-                        short_id = chunks_info[chunk_idx]
-                        confidence = (
-                            confidence_scores[i] if i < len(confidence_scores) else 0.5
-                        )
-                        text_segment = support.segment.text if support.segment else ""
-                        sources[short_id]["supported_claims"].append(
-                            {
-                                "text_segment": text_segment,
-                                "confidence": confidence,
-                            }
-                        )
-    callback_context.state["url_to_short_id"] = url_to_short_id
-    callback_context.state["sources"] = sources
+            chunks_info[idx] = short_id
+        for support in event.grounding_metadata.grounding_supports or []:
+            confidence_scores = support.confidence_scores or []
+            chunk_indices = support.grounding_chunk_indices or []
+            for i, chunk_idx in enumerate(chunk_indices):
+                if chunk_idx in chunks_info:
+                    confidence = (
+                        confidence_scores[i] if i < len(confidence_scores) else 0.5
+                    )
+                    text_segment = support.segment.text if support.segment else ""
+                    self._add_claim(chunks_info[chunk_idx], text_segment, confidence)
+
+    def _add_claim(self, short_id: str, text_segment: str, confidence: float) -> None:
+        claims = self.sources[short_id]["supported_claims"]
+        for kept in claims:
+            if kept["text_segment"] == text_segment:
+                kept["confidence"] = max(kept["confidence"], confidence)
+                break
+        else:
+            claims.append({"text_segment": text_segment, "confidence": confidence})
+        # Stable, so claims of equal confidence keep the order they were found in.
+        claims.sort(key=lambda c: -c["confidence"])
+        if self.max_claims is not None:
+            del claims[self.max_claims :]
+
+    def save(self, callback_context: CallbackContext) -> None:
+        """Writes the sources to the state, with the cursor of the processed events."""
+        events = callback_context._invocation_context.session.events
+        callback_context.state["url_to_short_id"] = self.url_to_short_id
+        callback_context.state["sources"] = self.sources
+        callback_context.state["sources_cursor"] = {
+            "events": len(events),
+            "last_event_id": events[-1].id if events else None,
+        }
+
+
+async def save_source_record(callback_context: CallbackContext) -> None:
+    """Saves every claim of every source as the `research_sources.json` artifact.
+
+    The record is rebuilt from the grounding metadata of the session's events
+    with the short ids already in state, and saved once, before the report is
+    composed, rather than on every research iteration.
+    """
+    if callback_context._invocation_context.artifact_service is None:
+        return
+    record = SourceStore(
+        {"url_to_short_id": dict(callback_context.state.get("url_to_short_id", {}))},
+        max_claims=None,
+    )
+    for event in callback_context._invocation_context.session.events:
+        record.add_grounding(event)
+    await callback_context.save_artifact(
+        SOURCES_ARTIFACT,
+        genai_types.Part.from_bytes(
+            data=json.dumps(record.sources).encode("utf-8"),
+            mime_type="application/json",
+        ),
+    )
+
+
+def render_sources(
+    sources: dict[str, dict], max_claims: int, max_claim_chars: int = 300
+) -> str:
+    """Renders a compact outline of the sources for a prompt: id, title, domain and top claims."""
+    lines = []
+    for short_id, source in sources.items():
+        domain = f" ({source['domain']})" if source.get("domain") else ""
+        lines.append(f"[{short_id}] {source.get('title') or short_id}{domain}")
+        for claim in source.get("supported_claims", [])[:max_claims]:
+            text = " ".join(claim["text_segment"].split())
+            if len(text) > max_claim_chars:
+                text = text[: max_claim_chars - 3] + "..."
+            lines.append(f"  - {text} ({claim['confidence']:.2f})")
+    return "\n".join(lines)
+
+
+# --- Callbacks ---
+def collect_research_sources_callback(callback_context: CallbackContext) -> None:
+    """Collects and organizes web-based research sources and their supported claims from agent events.
+
+    This function processes the agent's `session.events` to extract web source details (URLs,
+    titles, domains from `grounding_chunks`) and associated text segments with confidence scores
+    (from `grounding_supports`). The aggregated source information and a mapping of URLs to short
+    IDs are cumulatively stored in `callback_context.state` through a `SourceStore`.
+
+    Only the events added since the previous call are processed: the number of processed events
+    and the id of the last one are kept in `sources_cursor`, so each research iteration costs the
+    same however long the session grows. If the events no longer line up with the cursor, all of
+    them are processed again; deduplication makes that idempotent.
+
+    Args:
+        callback_context (CallbackContext): The context object providing access to the agent's
+            session events and persistent state.
+    """
+    events = callback_context._invocation_context.session.events
+    cursor = callback_context.state.get("sources_cursor", {})
+    start = cursor.get("events", 0)
+    if start > len(events) or (
+        start and events[start - 1].id != cursor.get("last_event_id")
+    ):
+        start = 0
+    store = SourceStore(callback_context.state)
+    for i in range(start, len(events)):
+        store.add_grounding(events[i])
+    store.save(callback_context)
+
+
+async def source_outline_callback(callback_context: CallbackContext) -> None:
+    """Stores the compact outline of the sources that the report composer's prompt cites from.
+
+    The full record of the sources is saved at the same time, once per report.
+    """
+    callback_context.state["source_outline"] = render_sources(
+        callback_context.state.get("sources", {}), config.max_claims_per_source
+    )
+    await save_source_record(callback_context)
+
+
+_CITE_TAG_RE = re.compile(r'<cite\s+source\s*=\s*["\']?\s*(src-\d+)\s*["\']?\s*/>')
+_SPACE_BEFORE_PUNCTUATION_RE = re.compile(r"\s+([.,;:])")
+
+
+class CitationRewriter:
+    """Rewrites `<cite source="src-N"/>` tags into Markdown links as a report streams in.
+
+    Text that could still change with the next chunk is held back: a trailing
+    tag that is not closed yet, and trailing whitespace, which is dropped if
+    the next chunk starts with punctuation. The concatenated output therefore
+    equals rewriting the whole report at once.
+    """
+
+    # Longer unclosed tags are not citations, and are not held back.
+    MAX_TAG_LENGTH = 64
+
+    def __init__(self, sources: dict[str, dict]):
+        self.sources = sources
+        self._pending = ""
+
+    def _replace_tag(self, match: re.Match) -> str:
+        short_id = match.group(1)
+        if not (source_info := self.sources.get(short_id)):
+            logging.warning(f"Invalid citation tag found and removed: {match.group(0)}")
+            return ""
+        display_text = source_info.get("title", source_info.get("domain", short_id))
+        return f" [{display_text}]({source_info['url']})"
+
+    def _rewrite(self, text: str) -> str:
+        text = _CITE_TAG_RE.sub(self._replace_tag, text)
+        return _SPACE_BEFORE_PUNCTUATION_RE.sub(r"\1", text)
+
+    def feed(self, chunk: str) -> str:
+        """Adds a chunk of the report, and returns the rewritten text that is final."""
+        text = self._pending + chunk
+        cut = len(text)
+        start = text.rfind("<")
+        if start >= 0 and ">" not in text[start:]:
+            tail = text[start:].lower()
+            if len(tail) <= self.MAX_TAG_LENGTH and (
+                tail.startswith("<cite") or "<cite".startswith(tail)
+            ):
+                cut = start
+        head = _CITE_TAG_RE.sub(self._replace_tag, text[:cut])
+        final = head.rstrip()
+        self._pending = head[len(final) :] + text[cut:]
+        return _SPACE_BEFORE_PUNCTUATION_RE.sub(r"\1", final)
+
+    def flush(self) -> str:
+        """Returns the rewritten text held back, at the end of the report."""
+        text, self._pending = self._pending, ""
+        return self._rewrite(text)
+
+    def rewrite(self, report: str) -> str:
+        """Rewrites a whole report."""
+        return self.feed(report) + self.flush()
 
 
 def citation_replacement_callback(
@@ -135,21 +298,7 @@ def citation_replacement_callback(
     """
     final_report = callback_context.state.get("final_cited_report", "")
     sources = callback_context.state.get("sources", {})
-
-    def tag_replacer(match: re.Match) -> str:
-        short_id = match.group(1)
-        if not (source_info := sources.get(short_id)):
-            logging.warning(f"Invalid citation tag found and removed: {match.group(0)}")
-            return ""
-        display_text = source_info.get("title", source_info.get("domain", short_id))
-        return f" [{display_text}]({source_info['url']})"
-
-    processed_report = re.sub(
-        r'<cite\s+source\s*=\s*["\']?\s*(src-\d+)\s*["\']?\s*/>',
-        tag_replacer,
-        final_report,
-    )
-    processed_report = re.sub(r"\s+([.,;:])", r"\1", processed_report)
+    processed_report = CitationRewriter(sources).rewrite(final_report)
     callback_context.state["final_report_with_citations"] = processed_report
     return genai_types.Content(parts=[genai_types.Part(text=processed_report)])
 
@@ -178,6 +327,252 @@ class EscalationChecker(BaseAgent):
             yield Event(author=self.name)
 
 
+# --- Custom Agent for Streaming Citations ---
+class StreamingCitationComposer(BaseAgent):
+    """Streams the report of a composer agent with its citation tags already rewritten.
+
+    The composer runs in SSE streaming mode whatever the request's mode, and
+    the text of each partial event is passed through a CitationRewriter, so
+    Markdown links reach the client as the report is written. The complete
+    report still goes through the composer's own callbacks.
+    """
+
+    composer: LlmAgent
+
+    def __init__(self, name: str, composer: LlmAgent):
+        super().__init__(
+            name=name,
+            description=composer.description,
+            composer=composer,
+            sub_agents=[composer],
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        rewriter = CitationRewriter(ctx.session.state.get("sources", {}))
+        streaming_ctx = ctx.model_copy(
+            update={
+                "run_config": ctx.run_config.model_copy(
+                    update={"streaming_mode": StreamingMode.SSE}
+                )
+            }
+        )
+        streaming = False
+        async for event in self.composer.run_async(streaming_ctx):
+            if event.partial:
+                streaming = True
+                parts = event.content.parts if event.content else None
+                text = "".join(
+                    part.text for part in parts or [] if part.text and not part.thought
+                )
+                if text:
+                    event = event.model_copy(
+                        update={
+                            "content": genai_types.Content(
+                                role="model",
+                                parts=[genai_types.Part(text=rewriter.feed(text))],
+                            )
+                        }
+                    )
+            elif streaming:
+                streaming = False
+                if remainder := rewriter.flush():
+                    yield Event(
+                        author=self.composer.name,
+                        invocation_id=ctx.invocation_id,
+                        branch=ctx.branch,
+                        partial=True,
+                        content=genai_types.Content(
+                            role="model", parts=[genai_types.Part(text=remainder)]
+                        ),
+                    )
+            yield event
+
+
+# --- Custom Agent for Parallel Research ---
+# Matches `[RESEARCH]` plan lines, with any bold, code or colon markup around the
+# tags, e.g. "- **`[RESEARCH]`**: ..." or "1. **[RESEARCH][NEW]:** ...".
+_RESEARCH_GOAL_RE = re.compile(
+    r"^\s*(?:[-*+]|\d+[.)])?[\s*`]*\[RESEARCH\](?:\[[A-Z]+\])*[\s*`:]*(?P<goal>.+?)\s*$",
+    re.MULTILINE,
+)
+
+
+def split_research_goals(research_plan: str) -> list[str]:
+    """Returns the `[RESEARCH]` goals of a research plan, in plan order.
+
+    A plan without tagged goals is researched as a single goal.
+    """
+    goals = [
+        goal
+        for m in _RESEARCH_GOAL_RE.finditer(research_plan)
+        if (goal := m.group("goal").strip("*`: "))
+    ]
+    return goals or ([research_plan.strip()] if research_plan.strip() else [])
+
+
+def goal_researcher(index: int, goal: str, research_plan: str) -> LlmAgent:
+    """Creates the researcher of one `[RESEARCH]` goal."""
+    instruction = f"""
+    You are a highly capable and diligent research agent. You research ONE goal of a larger research plan; other agents research the other goals at the same time.
+
+    RESEARCH PLAN (for context only; do not research the other goals):
+    {research_plan}
+
+    YOUR GOAL:
+    {goal}
+
+    *   **Query Generation:** Formulate a comprehensive set of 4-5 targeted search queries. These queries must be expertly designed to broadly cover the specific intent of your goal from multiple angles.
+    *   **Execution:** Utilize the `google_search` tool to execute **all** generated queries.
+    *   **Summarization:** Synthesize the search results into a detailed, coherent summary that directly addresses the objective of your goal. Your output is only this summary.
+    """
+    return LlmAgent(
+        model=config.worker_model,
+        name=f"goal_researcher_{index}",
+        description="Researches one goal of the research plan.",
+        planner=BuiltInPlanner(
+            thinking_config=genai_types.ThinkingConfig(include_thoughts=True)
+        ),
+        # A provider, so braces in the plan are not read as state variables.
+        instruction=lambda _: instruction,
+        include_contents="none",
+        tools=[google_search],
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+    )
+
+
+def _branch_ctx(
+    ctx: InvocationContext, parent: BaseAgent, agent: BaseAgent
+) -> InvocationContext:
+    """Returns a copy of the context in which the agent only sees its own branch of events."""
+    suffix = f"{parent.name}.{agent.name}"
+    return ctx.model_copy(
+        update={"branch": f"{ctx.branch}.{suffix}" if ctx.branch else suffix}
+    )
+
+
+async def _merge_event_streams(
+    streams: list[AsyncGenerator[Event, None]],
+) -> AsyncGenerator[Event, None]:
+    """Yields the events of concurrent agent runs as they come.
+
+    A run only moves on once its previous event has been yielded, i.e. processed
+    by the runner, as with ParallelAgent.
+    """
+    pending = {asyncio.ensure_future(anext(stream)): stream for stream in streams}
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stream = pending.pop(task)
+                try:
+                    event = task.result()
+                except StopAsyncIteration:
+                    continue
+                yield event
+                pending[asyncio.ensure_future(anext(stream))] = stream
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class ParallelSectionResearcher(BaseAgent):
+    """Researches the `[RESEARCH]` goals of the plan concurrently, then writes the deliverables.
+
+    Each goal gets its own researcher in an isolated branch, with at most
+    `max_concurrency` running at a time. Their summaries are merged in plan
+    order, and their sources collected in plan order too, so the findings and
+    source ids do not depend on which goal finished first.
+    """
+
+    deliverable_writer: LlmAgent
+    max_concurrency: int
+
+    def __init__(self, name: str, deliverable_writer: LlmAgent, max_concurrency: int):
+        super().__init__(
+            name=name,
+            description="Performs the crucial first pass of web research, one researcher per goal.",
+            deliverable_writer=deliverable_writer,
+            max_concurrency=max_concurrency,
+            sub_agents=[deliverable_writer],
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        research_plan = ctx.session.state.get("research_plan", "")
+        goals = split_research_goals(research_plan)
+        summaries: list[str] = [""] * len(goals)
+        grounded: list[list[Event]] = [[] for _ in goals]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def research(index: int, goal: str) -> AsyncGenerator[Event, None]:
+            agent = goal_researcher(index + 1, goal, research_plan)
+            async with semaphore:
+                async for event in agent.run_async(_branch_ctx(ctx, self, agent)):
+                    if (
+                        event.grounding_metadata
+                        and event.grounding_metadata.grounding_chunks
+                    ):
+                        grounded[index].append(event)
+                    if (
+                        event.is_final_response()
+                        and event.content
+                        and event.content.parts
+                    ):
+                        summaries[index] = "".join(
+                            part.text
+                            for part in event.content.parts
+                            if part.text and not part.thought
+                        )
+                    yield event
+
+        async for event in _merge_event_streams(
+            [research(i, goal) for i, goal in enumerate(goals)]
+        ):
+            yield event
+
+        actions = EventActions()
+        callback_context = CallbackContext(ctx, event_actions=actions)
+        store = SourceStore(callback_context.state)
+        for events in grounded:
+            for event in events:
+                store.add_grounding(event)
+        store.save(callback_context)
+        findings = "\n\n".join(
+            f"## {goal}\n\n{summary}"
+            for goal, summary in zip(goals, summaries, strict=True)
+        )
+        callback_context.state["section_research_findings"] = findings
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=genai_types.Content(
+                role="model", parts=[genai_types.Part(text=findings)]
+            ),
+            actions=actions,
+        )
+
+        if "[DELIVERABLE]" not in research_plan:
+            return
+        async for event in self.deliverable_writer.run_async(ctx):
+            yield event
+        deliverables = ctx.session.state.get("research_deliverables", "")
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            actions=EventActions(
+                state_delta={
+                    "section_research_findings": f"{findings}\n\n{deliverables}"
+                }
+            ),
+        )
+
+
 # --- AGENT DEFINITIONS ---
 plan_generator = LlmAgent(
     model=config.worker_model,
@@ -238,54 +633,37 @@ section_planner = LlmAgent(
 )
 
 
-section_researcher = LlmAgent(
+deliverable_writer = LlmAgent(
     model=config.worker_model,
-    name="section_researcher",
-    description="Performs the crucial first pass of web research.",
-    planner=BuiltInPlanner(
-        thinking_config=genai_types.ThinkingConfig(include_thoughts=True)
-    ),
+    name="deliverable_writer",
+    description="Produces the [DELIVERABLE] artifacts of the research plan from the research summaries.",
+    include_contents="none",
     instruction="""
-    You are a highly capable and diligent research and synthesis agent. Your comprehensive task is to execute a provided research plan with **absolute fidelity**, first by gathering necessary information, and then by synthesizing that information into specified outputs.
+    You are a highly capable and diligent synthesis agent. The `[RESEARCH]` goals of the research plan have been researched; your task is to produce its `[DELIVERABLE]` outputs with **absolute fidelity**.
 
-    You will be provided with a sequential list of research plan goals, stored in the `research_plan` state key. Each goal will be clearly prefixed with its primary task type: `[RESEARCH]` or `[DELIVERABLE]`.
+    RESEARCH PLAN:
+    {research_plan}
 
-    Your execution process must strictly adhere to these two distinct and sequential phases:
+    RESEARCH SUMMARIES:
+    {section_research_findings}
 
-    ---
-
-    **Phase 1: Information Gathering (`[RESEARCH]` Tasks)**
-
-    *   **Execution Directive:** You **MUST** systematically process every goal prefixed with `[RESEARCH]` before proceeding to Phase 2.
-    *   For each `[RESEARCH]` goal:
-        *   **Query Generation:** Formulate a comprehensive set of 4-5 targeted search queries. These queries must be expertly designed to broadly cover the specific intent of the `[RESEARCH]` goal from multiple angles.
-        *   **Execution:** Utilize the `google_search` tool to execute **all** generated queries for the current `[RESEARCH]` goal.
-        *   **Summarization:** Synthesize the search results into a detailed, coherent summary that directly addresses the objective of the `[RESEARCH]` goal.
-        *   **Internal Storage:** Store this summary, clearly tagged or indexed by its corresponding `[RESEARCH]` goal, for later and exclusive use in Phase 2. You **MUST NOT** lose or discard any generated summaries.
-
-    ---
-
-    **Phase 2: Synthesis and Output Creation (`[DELIVERABLE]` Tasks)**
-
-    *   **Execution Prerequisite:** This phase **MUST ONLY COMMENCE** once **ALL** `[RESEARCH]` goals from Phase 1 have been fully completed and their summaries are internally stored.
     *   **Execution Directive:** You **MUST** systematically process **every** goal prefixed with `[DELIVERABLE]`. For each `[DELIVERABLE]` goal, your directive is to **PRODUCE** the artifact as explicitly described.
     *   For each `[DELIVERABLE]` goal:
         *   **Instruction Interpretation:** You will interpret the goal's text (following the `[DELIVERABLE]` tag) as a **direct and non-negotiable instruction** to generate a specific output artifact.
             *   *If the instruction details a table (e.g., "Create a Detailed Comparison Table in Markdown format"), your output for this step **MUST** be a properly formatted Markdown table utilizing columns and rows as implied by the instruction and the prepared data.*
             *   *If the instruction states to prepare a summary, report, or any other structured output, your output for this step **MUST** be that precise artifact.*
-        *   **Data Consolidation:** Access and utilize **ONLY** the summaries generated during Phase 1 (`[RESEARCH]` tasks`) to fulfill the requirements of the current `[DELIVERABLE]` goal. You **MUST NOT** perform new searches.
-        *   **Output Generation:** Based on the specific instruction of the `[DELIVERABLE]` goal:
-            *   Carefully extract, organize, and synthesize the relevant information from your previously gathered summaries.
-            *   Must always produce the specified output artifact (e.g., a concise summary, a structured comparison table, a comprehensive report, a visual representation, etc.) with accuracy and completeness.
-        *   **Output Accumulation:** Maintain and accumulate **all** the generated `[DELIVERABLE]` artifacts. These are your final outputs.
+        *   **Data Consolidation:** Access and utilize **ONLY** the research summaries above to fulfill the requirements of the current `[DELIVERABLE]` goal. You **MUST NOT** perform new searches.
+        *   **Output Generation:** Carefully extract, organize, and synthesize the relevant information from the summaries, and always produce the specified output artifact with accuracy and completeness.
 
-    ---
-
-    **Final Output:** Your final output will comprise the complete set of processed summaries from `[RESEARCH]` tasks AND all the generated artifacts from `[DELIVERABLE]` tasks, presented clearly and distinctly.
+    **Final Output:** All the generated `[DELIVERABLE]` artifacts, presented clearly and distinctly. Do not repeat the research summaries.
     """,
-    tools=[google_search],
-    output_key="section_research_findings",
-    after_agent_callback=collect_research_sources_callback,
+    output_key="research_deliverables",
+)
+
+section_researcher = ParallelSectionResearcher(
+    name="section_researcher",
+    deliverable_writer=deliverable_writer,
+    max_concurrency=config.max_parallel_research,
 )
 
 research_evaluator = LlmAgent(
@@ -348,7 +726,7 @@ report_composer = LlmAgent(
     ### INPUT DATA
     *   Research Plan: `{research_plan}`
     *   Research Findings: `{section_research_findings}`
-    *   Citation Sources: `{sources}`
+    *   Citation Sources: `{source_outline}`
     *   Report Structure: `{report_sections}`
 
     ---
@@ -364,6 +742,7 @@ report_composer = LlmAgent(
     Do not include a "References" or "Sources" section; all citations must be in-line.
     """,
     output_key="final_cited_report",
+    before_agent_callback=source_outline_callback,
     after_agent_callback=citation_replacement_callback,
 )
 
@@ -382,7 +761,7 @@ research_pipeline = SequentialAgent(
                 enhanced_search_executor,
             ],
         ),
-        report_composer,
+        StreamingCitationComposer(name="report_composer", composer=report_composer),
     ],
 )
 
@@ -36,11 +36,15 @@ class ResearchConfiguration:
         critic_model (str): Model for evaluation tasks.
         worker_model (str): Model for working/generation tasks.
         max_search_iterations (int): Maximum search iterations allowed.
+        max_parallel_research (int): Maximum research goals researched at a time.
+        max_claims_per_source (int): Most confident claims kept per source for the report composer.
     """
 
     critic_model: str = "gemini-2.5-pro"
     worker_model: str = "gemini-2.5-flash"
     max_search_iterations: int = 5
+    max_parallel_research: int = 5
+    max_claims_per_source: int = 5
 
 
 config = ResearchConfiguration()
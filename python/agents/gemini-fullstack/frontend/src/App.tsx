@@ -52,6 +52,8 @@ export default function App() {
   const [isCheckingBackend, setIsCheckingBackend] = useState(true);
   const currentAgentRef = useRef('');
   const accumulatedTextRef = useRef("");
+  const reportMessageIdRef = useRef<string | null>(null);
+  const reportTextRef = useRef("");
   const scrollAreaRef = useRef<HTMLDivElement>(null);
 
   const retryWithBackoff = async (
@@ -129,6 +131,7 @@ export default function App() {
       let functionCall = null;
       let functionResponse = null;
       let sources = null;
+      const partial = Boolean(parsed.partial);
 
       // Check if content.parts exists and has text
       if (parsed.content && parsed.content.parts) {
@@ -183,12 +186,12 @@ export default function App() {
       }
 
 
-      return { textParts, agent, finalReportWithCitations, functionCall, functionResponse, sourceCount, sources };
+      return { textParts, agent, finalReportWithCitations, functionCall, functionResponse, sourceCount, sources, partial };
     } catch (error) {
       // Log the error and a truncated version of the problematic data for easier debugging.
       const truncatedData = data.length > 200 ? data.substring(0, 200) + "..." : data;
       console.error('Error parsing SSE data. Raw data (truncated): "', truncatedData, '". Error details:', error);
-      return { textParts: [], agent: '', finalReportWithCitations: undefined, functionCall: null, functionResponse: null, sourceCount: 0, sources: null };
+      return { textParts: [], agent: '', finalReportWithCitations: undefined, functionCall: null, functionResponse: null, sourceCount: 0, sources: null, partial: false };
     }
   };
 
@@ -207,6 +210,8 @@ export default function App() {
         return "Quality Assessment";
       case "enhanced_search_executor":
         return "Enhanced Web Research";
+      case "deliverable_writer":
+        return "Writing Deliverables";
       case "research_pipeline":
         return "Executing Research Pipeline";
       case "iterative_refinement_loop":
@@ -215,12 +220,33 @@ export default function App() {
       case "root_agent":
         return "Interactive Planning";
       default:
+        if (agentName.startsWith("goal_researcher_")) {
+          return `Web Research (Goal ${agentName.slice("goal_researcher_".length)})`;
+        }
         return `Processing (${agentName || 'Unknown Agent'})`;
     }
   };
 
   const processSseEventData = (jsonData: string, aiMessageId: string) => {
-    const { textParts, agent, finalReportWithCitations, functionCall, functionResponse, sourceCount, sources } = extractDataFromSSE(jsonData);
+    const { textParts, agent, finalReportWithCitations, functionCall, functionResponse, sourceCount, sources, partial } = extractDataFromSSE(jsonData);
+
+    if (partial) {
+      // Streamed chunks of the final report, with citations already rendered as links.
+      if (agent === "report_composer_with_citations" && textParts.length > 0) {
+        reportTextRef.current += textParts.join("");
+        const reportText = reportTextRef.current;
+        if (!reportMessageIdRef.current) {
+          const reportMessageId = Date.now().toString() + "_final";
+          reportMessageIdRef.current = reportMessageId;
+          setMessages(prev => [...prev, { type: "ai", content: reportText, id: reportMessageId, agent, finalReportWithCitations: true }]);
+        } else {
+          const reportMessageId = reportMessageIdRef.current;
+          setMessages(prev => prev.map(msg => msg.id === reportMessageId ? { ...msg, content: reportText } : msg));
+        }
+        setDisplayData(reportText);
+      }
+      return;
+    }
 
     if (sourceCount > 0) {
       console.log('[SSE HANDLER] Updating websiteCount. Current sourceCount:', sourceCount);
@@ -276,8 +302,14 @@ export default function App() {
     }
 
     if (agent === "report_composer_with_citations" && finalReportWithCitations) {
-      const finalReportMessageId = Date.now().toString() + "_final";
-      setMessages(prev => [...prev, { type: "ai", content: finalReportWithCitations as string, id: finalReportMessageId, agent: currentAgentRef.current, finalReportWithCitations: true }]);
+      const streamedReportMessageId = reportMessageIdRef.current;
+      if (streamedReportMessageId) {
+        // Replaces the streamed report with the complete one.
+        setMessages(prev => prev.map(msg => msg.id === streamedReportMessageId ? { ...msg, content: finalReportWithCitations as string } : msg));
+      } else {
+        const finalReportMessageId = Date.now().toString() + "_final";
+        setMessages(prev => [...prev, { type: "ai", content: finalReportWithCitations as string, id: finalReportMessageId, agent: currentAgentRef.current, finalReportWithCitations: true }]);
+      }
       setDisplayData(finalReportWithCitations as string);
     }
   };
@@ -313,6 +345,8 @@ export default function App() {
       const aiMessageId = Date.now().toString() + "_ai";
       currentAgentRef.current = ''; // Reset current agent
       accumulatedTextRef.current = ''; // Reset accumulated text
+      reportMessageIdRef.current = null; // Reset streamed report
+      reportTextRef.current = '';
 
       setMessages(prev => [...prev, {
         type: "ai",
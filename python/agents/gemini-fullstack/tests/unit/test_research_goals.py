@@ -0,0 +1,56 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for splitting a research plan into its `[RESEARCH]` goals."""
+
+import pytest
+
+from app.agent import split_research_goals
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "- [RESEARCH] Investigate A",
+        "- [RESEARCH]: Investigate A",
+        "* **[RESEARCH]** Investigate A",
+        "- **[RESEARCH]:** Investigate A",
+        "- **[RESEARCH]**: Investigate A",
+        "- **`[RESEARCH]`**: Investigate A",
+        "- `[RESEARCH]`: Investigate A",
+        "1. **[RESEARCH][NEW]:** Investigate A",
+        "2) **`[RESEARCH][MODIFIED]`**: Investigate A",
+    ],
+)
+def test_goal_markup_is_stripped(line: str) -> None:
+    assert split_research_goals(line) == ["Investigate A"]
+
+
+def test_only_research_goals_are_kept_in_plan_order() -> None:
+    plan = """
+    - **`[RESEARCH]`**: Investigate A
+    - **`[DELIVERABLE][IMPLIED]`**: Create a summary of A
+    1. **[RESEARCH][NEW]:** Investigate C
+    - [RESEARCH] Analyze **key** trends in B
+    """
+    assert split_research_goals(plan) == [
+        "Investigate A",
+        "Investigate C",
+        "Analyze **key** trends in B",
+    ]
+
+
+def test_untagged_plan_is_a_single_goal() -> None:
+    assert split_research_goals("  Investigate A and B.\n") == ["Investigate A and B."]
+    assert split_research_goals(" \n") == []
@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from google.genai import types
+
+from preparser import preparse_email
+from gcs_ingest import GCSStore, LocalStore, date_prefix, example_cache, read_report
+from llm_parser import (
+    LLMParserResponse,
+    MODEL,
+    email_config,
+    email_contents,
+    genai_client,
+    pdf_config,
+    pdf_contents,
+)
+
+CONCURRENCY = int(os.getenv("NOON_PARSER_CONCURRENCY", "8"))
+# Uploaded files expire after 48 hours; examples are re-uploaded a little before that.
+UPLOAD_EXPIRY_MARGIN = timedelta(hours=1)
+
+
+def completed_sources(output_path: str) -> Set[str]:
+    """Returns the sources already parsed successfully in an output file, to resume from."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:  # A line cut short by an interrupted run.
+                continue
+            if record.get("status") == "ok":
+                done.add(record["source"])
+    return done
+
+
+class ExampleUploads:
+    """Uploads each few-shot example PDF once per generation, and reuses the uploaded file."""
+
+    def __init__(self, client):
+        self.client = client
+        self._files: Dict[Tuple[str, str, int], types.File] = {}
+        self._locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
+        self.uploads = 0
+
+    async def get(self, store, name: str) -> types.File:
+        generation = await asyncio.to_thread(store.generation, name)
+        key = (store.bucket_name, name, generation)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:  # Concurrent extractions wait for a single upload.
+            file = self._files.get(key)
+            if file is None or _expires_soon(file):
+                report = await asyncio.to_thread(example_cache.get, store, name)
+                file = await self.client.aio.files.upload(
+                    file=report, config=types.UploadFileConfigDict(mime_type="application/pdf")
+                )
+                self._files[key] = file
+                self.uploads += 1
+            return file
+
+
+def _expires_soon(file: types.File) -> bool:
+    if file.expiration_time is None:
+        return False
+    return file.expiration_time - UPLOAD_EXPIRY_MARGIN <= datetime.now(timezone.utc)
+
+
+class BatchParser:
+    """
+    Parses many noon reports with bounded concurrency.
+
+    Each result is validated against LLMParserResponse and appended to a JSONL
+    file as soon as it is ready, so an interrupted run resumes where it stopped.
+    Examples are keyed by file extension: {".pdf": (name, expected_output)}.
+    """
+
+    def __init__(self, store, examples: Optional[Dict[str, Tuple[str, str]]] = None, concurrency: int = CONCURRENCY, client=None):
+        self.store = store
+        self.examples = examples or {}
+        self.concurrency = concurrency
+        self.client = client or genai_client()
+        self.example_uploads = ExampleUploads(self.client)
+        self.stats = {"ok": 0, "error": 0, "skipped": 0, "preparsed": 0}
+
+    async def extract(self, name: str, report) -> LLMParserResponse:
+        example_name, example_output = self.examples.get(os.path.splitext(name.lower())[1], (None, None))
+        if not name.lower().endswith(".pdf"):
+            # Coded emails with a known field layout are parsed without the LLM.
+            preparsed = preparse_email(report)
+            if preparsed is not None:
+                self.stats["preparsed"] += 1
+                return preparsed
+            example_email = await asyncio.to_thread(example_cache.get, self.store, example_name) if example_name else None
+            return await self._generate(email_contents(report, example_email, example_output), email_config())
+
+        content_file = await self.client.aio.files.upload(
+            file=report, config=types.UploadFileConfigDict(mime_type="application/pdf")
+        )
+        try:
+            example_file = await self.example_uploads.get(self.store, example_name) if example_name else None
+            return await self._generate(pdf_contents(content_file, example_file, example_output), pdf_config())
+        finally:
+            # Unlike examples, a report is used once; do not keep it until it expires.
+            await self._delete_upload(content_file)
+
+    async def _generate(self, contents, config) -> LLMParserResponse:
+        response = await self.client.aio.models.generate_content(model=MODEL, contents=contents, config=config)
+        return LLMParserResponse.model_validate_json(response.text)
+
+    async def _delete_upload(self, file: types.File) -> None:
+        try:
+            await self.client.aio.files.delete(name=file.name)
+        except Exception as e:  # The file still expires on its own.
+            print(f"Could not delete uploaded file {file.name}: {e}")
+
+    async def _parse(self, name: str, semaphore: asyncio.Semaphore, output) -> None:
+        async with semaphore:
+            record = {"source": name}
+            try:
+                report = await asyncio.to_thread(read_report, self.store, name)
+                if not report:
+                    raise ValueError("Empty report")
+                result = await self.extract(name, report)
+                record.update(status="ok", result=result.model_dump(mode="json", exclude_none=True))
+            except Exception as e:  # One failing report must not stop the batch.
+                record.update(status="error", error=f"{type(e).__name__}: {e}")
+            self.stats[record["status"]] += 1
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+
+    async def run(self, prefix: str, output_path: str) -> dict:
+        done = completed_sources(output_path)
+        names = [name for name, _ in await asyncio.to_thread(self.store.list, prefix)]
+        pending = [name for name in names if name not in done]
+        self.stats["skipped"] = len(names) - len(pending)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with open(output_path, "a") as output:
+            await asyncio.gather(*(self._parse(name, semaphore, output) for name in pending))
+        return {**self.stats, "example_uploads": self.example_uploads.uploads}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch noon report extraction to JSONL.")
+    parser.add_argument("--bucket", help="GCS bucket, e.g. noon-reports-dev")
+    parser.add_argument("--local_root", help="Local directory standing in for the bucket")
+    parser.add_argument("--prefix", help="e.g. year=2025/month=01/")
+    parser.add_argument("--date", help="YYYY-MM-DD, instead of --prefix")
+    parser.add_argument("--output", default="noon_reports.jsonl")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--example_pdf", help="Example PDF blob name")
+    parser.add_argument("--example_pdf_output", help="Expected output JSON file of the example PDF")
+    parser.add_argument("--example_eml", help="Example EML blob name")
+    parser.add_argument("--example_eml_output", help="Expected output JSON file of the example EML")
+    args = parser.parse_args()
+
+    examples = {}
+    for extension, example, example_output in ((".pdf", args.example_pdf, args.example_pdf_output), (".eml", args.example_eml, args.example_eml_output)):
+        if example and example_output:
+            with open(example_output) as f:
+                examples[extension] = (example, f.read())
+
+    if args.date:
+        day = datetime.strptime(args.date, "%Y-%m-%d")
+        prefix = date_prefix(day.year, day.month, day.day)
+    else:
+        prefix = args.prefix or ""
+
+    store = LocalStore(args.local_root) if args.local_root else GCSStore(args.bucket)
+    start = time.perf_counter()
+    stats = asyncio.run(BatchParser(store, examples, args.concurrency).run(prefix, args.output))
+    print(f"{stats} in {time.perf_counter() - start:.1f}s; results in {args.output}")
@@ -0,0 +1,175 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import email
+from email import policy
+import functools
+import io
+import os
+import threading
+import time
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from google.cloud import storage
+
+MAX_WORKERS = int(os.getenv("NOON_PARSER_MAX_WORKERS", "16"))
+
+Report = Union[str, io.BytesIO]
+
+
+def parse_gcs_path(gcs_path: str) -> Tuple[str, str]:
+    """Splits gs://bucket/name into (bucket, name)."""
+    bucket_name, blob_name = gcs_path.replace("gs://", "").split("/", 1)
+    return bucket_name, blob_name
+
+
+def date_prefix(year: int, month: Optional[int] = None, day: Optional[int] = None) -> str:
+    """Returns the year=/month=/day= prefix of the reports of a year, month or day."""
+    prefix = f"year={year:04d}/"
+    if month is not None:
+        prefix += f"month={month:02d}/"
+        if day is not None:
+            prefix += f"day={day:02d}/"
+    return prefix
+
+
+class GCSStore:
+    """A GCS bucket, read through one shared client and its connection pool."""
+
+    def __init__(self, bucket_name: str, client: Optional[storage.Client] = None):
+        self.bucket_name = bucket_name
+        self.bucket = (client or storage_client()).bucket(bucket_name)
+
+    def list(self, prefix: str) -> List[Tuple[str, int]]:
+        return [
+            (blob.name, blob.generation)
+            for blob in self.bucket.list_blobs(prefix=prefix)
+            if blob.name.lower().endswith((".eml", ".pdf"))
+        ]
+
+    def generation(self, name: str) -> int:
+        return self.bucket.get_blob(name).generation
+
+    def open(self, name: str) -> BinaryIO:
+        return self.bucket.blob(name).open("rb")
+
+
+class LocalStore:
+    """A local directory laid out like a bucket, to run ingestion offline."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.bucket_name = os.path.basename(os.path.normpath(root))
+
+    def list(self, prefix: str) -> List[Tuple[str, int]]:
+        base = os.path.join(self.root, prefix)
+        blobs = []
+        for dirpath, _, filenames in os.walk(os.path.dirname(base) or self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                if name.startswith(prefix) and name.lower().endswith((".eml", ".pdf")):
+                    blobs.append((name, os.stat(path).st_mtime_ns))
+        return sorted(blobs)
+
+    def generation(self, name: str) -> int:
+        return os.stat(os.path.join(self.root, name)).st_mtime_ns
+
+    def open(self, name: str) -> BinaryIO:
+        return open(os.path.join(self.root, name), "rb")
+
+
+@functools.cache
+def storage_client() -> storage.Client:
+    """Returns the process-wide storage client, created on first use."""
+    return storage.Client()
+
+
+def read_report(store, name: str) -> Report:
+    """Reads a noon report: the plain text of an EML, or the bytes of a PDF."""
+    with store.open(name) as f:
+        if name.lower().endswith(".eml"):
+            msg = email.message_from_binary_file(f, policy=policy.default)
+            for part in msg.walk():
+                if part.get_content_type() == "text/plain":
+                    return part.get_content()
+            return ""
+        elif name.lower().endswith(".pdf"):
+            return io.BytesIO(f.read())
+    raise ValueError("Unsupported file type: must be .eml or .pdf")
+
+
+class ExampleCache:
+    """Caches few-shot example reports by blob generation, so they are downloaded once per version."""
+
+    def __init__(self):
+        self._reports = {}
+        self._lock = threading.Lock()
+
+    def get(self, store, name: str) -> Report:
+        key = (store.bucket_name, name, store.generation(name))
+        with self._lock:
+            report = self._reports.get(key)
+        if report is None:
+            report = read_report(store, name)
+            with self._lock:
+                self._reports[key] = report
+        if isinstance(report, io.BytesIO):
+            return io.BytesIO(report.getvalue())  # Each reader gets its own position.
+        return report
+
+
+example_cache = ExampleCache()
+
+
+def ingest(
+    store, prefix: str, max_workers: int = MAX_WORKERS, errors: Optional[Dict[str, str]] = None
+) -> Iterator[Tuple[str, Report]]:
+    """
+    Downloads and parses all reports under a prefix concurrently.
+
+    Yields (blob name, report) pairs as they complete, so parsing can start
+    before the whole prefix is downloaded. A report that fails to download or
+    parse is skipped, and its error recorded in `errors` by blob name.
+    """
+    names = [name for name, _ in store.list(prefix)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(read_report, store, name): name for name in names}
+        for future in as_completed(futures):
+            try:
+                report = future.result()
+            except Exception as e:  # One failing report must not stop the ingestion.
+                if errors is not None:
+                    errors[futures[future]] = f"{type(e).__name__}: {e}"
+                continue
+            yield futures[future], report
+
+
+def benchmark(store, prefix: str, max_workers: int = MAX_WORKERS) -> dict:
+    """Measures the ingestion throughput of a prefix."""
+    start = time.perf_counter()
+    files = 0
+    chars = 0
+    errors: Dict[str, str] = {}
+    for _, report in ingest(store, prefix, max_workers, errors):
+        files += 1
+        chars += len(report) if isinstance(report, str) else len(report.getvalue())
+    seconds = time.perf_counter() - start
+    return {
+        "files": files,
+        "errors": len(errors),
+        "seconds": round(seconds, 3),
+        "files_per_sec": round(files / seconds, 1) if seconds else None,
+        "mb_per_sec": round(chars / seconds / 1e6, 2) if seconds else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk noon report ingestion.")
+    parser.add_argument("--bucket", help="GCS bucket, e.g. noon-reports-dev")
+    parser.add_argument("--local_root", help="Local directory standing in for the bucket")
+    parser.add_argument("--prefix", required=True, help="e.g. year=2025/month=01/")
+    parser.add_argument("--max_workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    store = LocalStore(args.local_root) if args.local_root else GCSStore(args.bucket)
+    print(benchmark(store, args.prefix, args.max_workers))
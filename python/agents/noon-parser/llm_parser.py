@@ -1,58 +1,26 @@
-import email
-from email import policy
-from google.cloud import storage
+from concurrent.futures import ThreadPoolExecutor
+import functools
 from google import genai
 from google.genai import types
-from pydantic import BaseModel
 from dotenv import load_dotenv
 import os
-from typing import Optional, List, Literal, Union
 from datetime import date, datetime
 from prompts import return_email_instructions, return_pdf_instructions, return_dream_specific_instructions
-import io
+from models import EngineValue, FuelKeyValuePair, FuelType, LLMParserResponse
+from preparser import preparse_email
+from gcs_ingest import GCSStore, example_cache, parse_gcs_path, read_report
 import json
 
 load_dotenv()
 
 
-FuelType = Literal["VLSFO", "MGO", "IFO", "LSBF", "LSGO"]
-
-class EngineValue(BaseModel):
-    me1: Optional[float] = None
-    me2: Optional[float] = None
-    me3: Optional[float] = None
-    me4: Optional[float] = None
-    me5: Optional[float] = None
-
-class FuelKeyValuePair(BaseModel):
-    fuel_type: FuelType
-    value: Union[float, EngineValue]
-
-class LLMParserResponse(BaseModel):
-    date: datetime
-    # List of fuel type-value pairs instead of a dict
-    fuel_consumed: List[FuelKeyValuePair]
-    power_generated: Optional[float] = None
-
 def download_and_parse_eml(gcs_path: str):
-    bucket_name, blob_name = gcs_path.replace("gs://", "").split("/", 1)
-    client = storage.Client()
-    blob = client.bucket(bucket_name).blob(blob_name)
-    eml_string = blob.download_as_text()
-
-    msg = email.message_from_string(eml_string, policy=policy.default)
-    for part in msg.walk():
-        if part.get_content_type() == "text/plain":
-            return part.get_content()
-    return ""
+    bucket_name, blob_name = parse_gcs_path(gcs_path)
+    return read_report(GCSStore(bucket_name), blob_name)
 
 def download_pdf(gcs_path: str):
-    bucket_name, blob_name = gcs_path.replace("gs://", "").split("/", 1)
-    client = storage.Client()
-    blob = client.bucket(bucket_name).blob(blob_name)
-    pdf_bytes = blob.download_as_bytes()
-    
-    return io.BytesIO(pdf_bytes)
+    bucket_name, blob_name = parse_gcs_path(gcs_path)
+    return read_report(GCSStore(bucket_name), blob_name)
 
 def download_and_parse_gcs(gcs_path: str):
     if gcs_path.lower().endswith('.eml'):
@@ -62,12 +30,41 @@ def download_and_parse_gcs(gcs_path: str):
     else:
         raise ValueError("Unsupported file type: must be .eml or .pdf")
 
-def llm_keywrds_eml(plain_text: str, example_email=None, example_output=None):
-    client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
-    
-    # If we have an example file and output, include them in the prompt
+def download_example(gcs_path: str):
+    # Examples are reused across many targets, so they are downloaded once per generation.
+    bucket_name, blob_name = parse_gcs_path(gcs_path)
+    return example_cache.get(GCSStore(bucket_name), blob_name)
+
+MODEL = "gemini-2.5-flash"
+
+@functools.cache
+def genai_client():
+    # One client per process, so its HTTP connections are reused across reports.
+    return genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+
+def email_config():
+    return types.GenerateContentConfig(
+        thinking_config = types.ThinkingConfig(thinking_budget=0),
+        temperature=0.01,
+        max_output_tokens=1000,
+        response_mime_type="application/json",
+        response_schema=LLMParserResponse,
+        system_instruction=return_email_instructions()
+    )
+
+def pdf_config():
+    return types.GenerateContentConfig(
+        thinking_config=types.ThinkingConfig(thinking_budget=0), # Striaghtforward request, no complex reasoning needed "Fact Retrieval or classification"
+        temperature=0.01,
+        max_output_tokens=1000,
+        response_mime_type="application/json",
+        response_schema=LLMParserResponse,
+        system_instruction=return_pdf_instructions()
+    )
 
-    contents = f"""
+def email_contents(plain_text: str, example_email=None, example_output=None):
+    # If we have an example file and output, include them in the prompt
+    return f"""
                 Example email 1 (below):
                 {example_email}
                 
@@ -78,57 +75,46 @@ def llm_keywrds_eml(plain_text: str, example_email=None, example_output=None):
                 {plain_text}
         """
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=contents,
-        config=types.GenerateContentConfig(
-            thinking_config = types.ThinkingConfig(thinking_budget=0),
-            temperature=0.01,
-            max_output_tokens=1000,
-            response_mime_type="application/json",
-            response_schema=LLMParserResponse,
-            system_instruction=return_email_instructions()
-        )
-    )
-    return response.text
-
-def llm_keywrds_pdf(file, example_file=None, example_output=None):
-    client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
-
-    content_file = client.files.upload(file=file, config=types.UploadFileConfigDict(mime_type="application/pdf"))
-
+def pdf_contents(content_file, example_content_file=None, example_output=None):
     contents = [return_dream_specific_instructions()]
-    
+
     # If we have an example file and output, include them in the prompt
-    if example_file and example_output:
-        example_content_file = client.files.upload(file=example_file, config=types.UploadFileConfigDict(mime_type="application/pdf"))
+    if example_content_file and example_output:
         contents.append(f"Example PDF 1 [attached]:")
         contents.append(example_content_file)
         contents.append(f"Example PDF 1 expected output: {example_output}")
-    
+
     # Add the main prompt and target file
     contents.append("Target PDF [attached]:")
     contents.append(content_file)
-    
-    # Improved printing of contents for debugging
-    # for i, content in enumerate(contents):
-    #     if isinstance(content, str):
-    #         print(f"Item {i}: Text - {content}")
-    #     else:
-    #         # This is likely a file object
-    #         print(f"Item {i}: File object - {type(content)}")
+    return contents
+
+def upload_pdf(file, client=None):
+    client = client or genai_client()
+    return client.files.upload(file=file, config=types.UploadFileConfigDict(mime_type="application/pdf"))
+
+def llm_keywrds_eml(plain_text: str, example_email=None, example_output=None):
+    response = genai_client().models.generate_content(
+        model=MODEL,
+        contents=email_contents(plain_text, example_email, example_output),
+        config=email_config()
+    )
+    return response.text
+
+def llm_keywrds_pdf(file, example_file=None, example_output=None):
+    client = genai_client()
+
+    content_file = upload_pdf(file, client)
+
+    # An example that was already uploaded (a types.File) is reused as is.
+    example_content_file = None
+    if example_file and example_output:
+        example_content_file = example_file if isinstance(example_file, types.File) else upload_pdf(example_file, client)
 
     response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=contents,
-        config=types.GenerateContentConfig(
-            thinking_config=types.ThinkingConfig(thinking_budget=0), # Striaghtforward request, no complex reasoning needed "Fact Retrieval or classification"
-            temperature=0.01,
-            max_output_tokens=1000,
-            response_mime_type="application/json",
-            response_schema=LLMParserResponse,
-            system_instruction=return_pdf_instructions()
-        )
+        model=MODEL,
+        contents=pdf_contents(content_file, example_content_file, example_output),
+        config=pdf_config()
     )
     # print(f"Request tokens: {response.usage_metadata.prompt_token_count}")
     # print(f"Response tokens: {response.usage_metadata.candidates_token_count}")
@@ -138,8 +124,12 @@ def llm_keywrds_pdf(file, example_file=None, example_output=None):
     return response.text
 
 def main(target_gcs_path: str, example_gcs_path: str = None, example_output: str = None):
-    target_noon_report = download_and_parse_gcs(target_gcs_path)
-    example_noon_report = download_and_parse_gcs(example_gcs_path) if example_gcs_path else None
+    # The target and example are fetched concurrently.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        target_future = executor.submit(download_and_parse_gcs, target_gcs_path)
+        example_future = executor.submit(download_example, example_gcs_path) if example_gcs_path else None
+        target_noon_report = target_future.result()
+        example_noon_report = example_future.result() if example_future else None
     
     if not target_noon_report:
         return {}
@@ -147,6 +137,10 @@ def main(target_gcs_path: str, example_gcs_path: str = None, example_output: str
     if target_gcs_path.lower().endswith('.pdf'):
         response = llm_keywrds_pdf(target_noon_report, example_noon_report, example_output)
     elif target_gcs_path.lower().endswith('.eml'):
+        # Coded emails with a known field layout are parsed without the LLM.
+        preparsed = preparse_email(target_noon_report)
+        if preparsed is not None:
+            return preparsed.model_dump_json(exclude_none=True)
         response = llm_keywrds_eml(target_noon_report, example_noon_report, example_output)
 
     if not response:
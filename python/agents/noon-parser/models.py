@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Optional, List, Literal, Union
+from datetime import datetime
+
+
+FuelType = Literal["VLSFO", "MGO", "IFO", "LSBF", "LSGO"]
+
+class EngineValue(BaseModel):
+    me1: Optional[float] = None
+    me2: Optional[float] = None
+    me3: Optional[float] = None
+    me4: Optional[float] = None
+    me5: Optional[float] = None
+
+class FuelKeyValuePair(BaseModel):
+    fuel_type: FuelType
+    value: Union[float, EngineValue]
+
+class LLMParserResponse(BaseModel):
+    date: datetime
+    # List of fuel type-value pairs instead of a dict
+    fuel_consumed: List[FuelKeyValuePair]
+    power_generated: Optional[float] = None
@@ -0,0 +1,125 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Pattern, Tuple, get_args
+
+from models import EngineValue, FuelKeyValuePair, FuelType, LLMParserResponse
+
+FUEL_TYPES = get_args(FuelType)
+_FUEL = "(?P<fuel>" + "|".join(FUEL_TYPES) + ")"
+_ENGINE = r"M/?E\s*(?P<engine>[1-5])"
+_CONS = r"CONS(?:UMPTION|UMED|\.)?(?:\s*\(?24\s*HRS?\)?)?"
+_VALUE = r"(?P<value>\d+(?:\.\d+)?|NIL)\s*(?:MTS?)?"
+_SEP = r"\s*[:=]\s*"
+
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%d-%b-%Y", "%d-%b-%y", "%d %b %Y", "%d %B %Y", "%B %d, %Y")
+
+
+@dataclass(frozen=True)
+class Template:
+    """The fixed field layout of a coded noon report email."""
+
+    name: str
+    date: Pattern
+    fuel: Tuple[Pattern, ...]
+    date_formats: Tuple[str, ...] = DATE_FORMATS
+    # Lines giving a consumption value, of any fuel; each must match a fuel
+    # pattern, or the email is not in this layout.
+    fuel_line: Pattern = re.compile(r"\bCONS(?:UMPTION|UMED)?\b.*[:=]\s*(?:\d|NIL\b)", re.IGNORECASE)
+
+
+def _line(pattern: str) -> Pattern:
+    return re.compile(rf"^\s*{pattern}\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+_DATE = _line(rf"(?:REPORT\s+|NOON\s+)?DATE(?:\s*\(?(?:UTC|LT)\)?)?{_SEP}(?P<date>.+?)")
+
+TEMPLATES = (
+    # Q88 coded reports with consumption per main engine, e.g. "ME1 LSGO CONS: 2.50 MT".
+    Template(
+        name="q88_engines",
+        date=_DATE,
+        fuel=(
+            _line(rf"{_ENGINE}\s+{_FUEL}\s+{_CONS}{_SEP}{_VALUE}"),
+            _line(rf"{_FUEL}\s+{_CONS}\s+{_ENGINE}{_SEP}{_VALUE}"),
+        ),
+    ),
+    # Q88 coded reports with the total consumption per fuel, e.g. "VLSFO CONS: 0.1 MT".
+    Template(
+        name="q88_totals",
+        date=_DATE,
+        fuel=(_line(rf"{_FUEL}\s+{_CONS}{_SEP}{_VALUE}"),),
+    ),
+)
+
+
+def _parse_date(text: str, formats: Tuple[str, ...]) -> Optional[datetime]:
+    for date_format in formats:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _match_fuel(template: Template, line: str):
+    for pattern in template.fuel:
+        m = pattern.match(line)
+        if m:
+            return m
+    return None
+
+
+def apply_template(template: Template, text: str) -> Optional[LLMParserResponse]:
+    """
+    Extracts a noon report with a template, if it matches the whole report with confidence.
+
+    That is: exactly one date, a value for every fuel line, no conflicting
+    values, and for per-engine reports the same engines 1..N for every fuel.
+    Returns None otherwise, for the report to go to the LLM.
+    """
+    dates = {_parse_date(m.group("date"), template.date_formats) for m in template.date.finditer(text)}
+    if len(dates) != 1 or None in dates:
+        return None
+
+    values: Dict[str, Dict[Optional[int], float]] = {}
+    for line in text.splitlines():
+        if not template.fuel_line.search(line):
+            continue
+        m = _match_fuel(template, line)
+        if m is None:
+            return None  # A fuel or layout this template does not know.
+        fuel = m.group("fuel").upper()
+        engine = int(m.group("engine")) if "engine" in m.groupdict() else None
+        value = 0.0 if m.group("value").upper() == "NIL" else float(m.group("value"))
+        if values.setdefault(fuel, {}).setdefault(engine, value) != value:
+            return None
+    if not values:
+        return None
+
+    fuel_consumed: List[FuelKeyValuePair] = []
+    engine_sets = {frozenset(by_engine) for by_engine in values.values()}
+    if len(engine_sets) != 1:
+        return None
+    engines = engine_sets.pop()
+    if engines == {None}:
+        for fuel, by_engine in values.items():
+            fuel_consumed.append(FuelKeyValuePair(fuel_type=fuel, value=by_engine[None]))
+    elif None not in engines and engines == set(range(1, len(engines) + 1)):
+        for fuel, by_engine in values.items():
+            engine_value = EngineValue(**{f"me{engine}": value for engine, value in by_engine.items()})
+            fuel_consumed.append(FuelKeyValuePair(fuel_type=fuel, value=engine_value))
+    else:
+        return None
+    return LLMParserResponse(date=dates.pop(), fuel_consumed=fuel_consumed)
+
+
+def preparse_email(plain_text: str, templates: Tuple[Template, ...] = TEMPLATES) -> Optional[LLMParserResponse]:
+    """Extracts a coded noon report email with the first template that fits it, or returns None."""
+    if not plain_text:
+        return None
+    for template in templates:
+        response = apply_template(template, plain_text)
+        if response is not None:
+            return response
+    return None
@@ -0,0 +1,54 @@
+"""Tests of the template pre-parser. Run from noon-parser/: python -m unittest discover -s tests"""
+
+from datetime import datetime
+import unittest
+
+from models import EngineValue
+from preparser import TEMPLATES, apply_template, preparse_email
+
+ENGINES, TOTALS = TEMPLATES
+
+
+def fuels(response):
+    return {pair.fuel_type: pair.value for pair in response.fuel_consumed}
+
+
+class TestPreparseEmail(unittest.TestCase):
+
+    def test_totals_report(self):
+        response = preparse_email("NOON REPORT\nDATE: 24/01/2025\nVLSFO CONS: 0.1 MT\nLSGO CONS (24 HRS): NIL\n")
+
+        self.assertEqual(response.date, datetime(2025, 1, 24))
+        self.assertEqual(fuels(response), {"VLSFO": 0.1, "LSGO": 0.0})
+
+    def test_engines_report(self):
+        text = "DATE: 2025-01-24\nME1 LSGO CONS: 2.50 MT\nME2 LSGO CONS: 2.40 MT\nME1 VLSFO CONS: 1\nME2 VLSFO CONS: 1.5\n"
+
+        response = preparse_email(text)
+
+        self.assertEqual(
+            fuels(response),
+            {"LSGO": EngineValue(me1=2.5, me2=2.4), "VLSFO": EngineValue(me1=1.0, me2=1.5)},
+        )
+
+    def test_unknown_fuel_rejects_the_report(self):
+        self.assertIsNone(preparse_email("DATE: 24/01/2025\nVLSFO CONS: 0.1 MT\nLSMGO CONS: 2.4 MT"))
+
+    def test_unknown_consumption_layout_rejects_the_template(self):
+        self.assertIsNone(apply_template(TOTALS, "DATE: 24/01/2025\nVLSFO CONS: 0.1 MT\nTOTAL CONS = 3.2 MT"))
+
+    def test_headers_and_other_fields_are_ignored(self):
+        text = "DATE: 24 Jan 2025\nFUEL CONSUMPTION:\nCONSTANT SPEED: 12.5\nVLSFO CONS: 0.1 MT\nVLSFO ROB: 350 MT\n"
+
+        self.assertEqual(fuels(preparse_email(text)), {"VLSFO": 0.1})
+
+    def test_ambiguous_reports_go_to_the_llm(self):
+        # Two dates, conflicting values, or engines that skip a number.
+        self.assertIsNone(preparse_email("DATE: 24/01/2025\nDATE: 25/01/2025\nVLSFO CONS: 0.1"))
+        self.assertIsNone(preparse_email("DATE: 24/01/2025\nVLSFO CONS: 0.1\nVLSFO CONS: 0.2"))
+        self.assertIsNone(apply_template(ENGINES, "DATE: 24/01/2025\nME1 LSGO CONS: 2\nME3 LSGO CONS: 2"))
+        self.assertIsNone(preparse_email("Dear all, please find the noon report attached."))
+
+
+if __name__ == "__main__":
+    unittest.main()
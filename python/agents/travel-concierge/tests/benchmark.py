@@ -0,0 +1,201 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks the travel concierge on replayed conversations, without network access.
+
+By default, the sample transcripts tests/pre_booking_sample.md and
+tests/post_booking_sample.md are converted to fixtures and replayed, so only
+the agents' own code is measured: the per-agent and per-tool latencies, the
+state callbacks and the instruction providers.
+
+    python -m tests.benchmark --concurrency=8 --runs=32
+
+With --record, the conversations are run against the real models and tools
+instead, and saved as fixtures to replay later with --fixtures:
+
+    python -m tests.benchmark --record --fixture_dir=tests/fixtures
+    python -m tests.benchmark --fixtures=tests/fixtures/pre_booking.json
+"""
+
+import asyncio
+import os
+import time
+import uuid
+
+from absl import app, flags
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from tests import replay
+from travel_concierge.agent import root_agent
+from travel_concierge.tools.memory import _set_initial_states, load_scenario
+
+APP_NAME = "travel_concierge"
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILES_DIR = os.path.join(
+    os.path.dirname(TESTS_DIR), "travel_concierge", "profiles"
+)
+
+# The sample transcripts, and the scenario each of them starts from.
+SAMPLE_FLOWS = {
+    "pre_booking": (
+        os.path.join(TESTS_DIR, "pre_booking_sample.md"),
+        os.path.join(PROFILES_DIR, "itinerary_empty_default.json"),
+    ),
+    "post_booking": (
+        os.path.join(TESTS_DIR, "post_booking_sample.md"),
+        os.path.join(PROFILES_DIR, "itinerary_seattle_example.json"),
+    ),
+}
+
+FLAGS = flags.FLAGS
+flags.DEFINE_list("flows", list(SAMPLE_FLOWS), "Sample transcripts to replay.")
+flags.DEFINE_list("fixtures", [], "Fixture files to replay, instead of --flows.")
+flags.DEFINE_integer("concurrency", 4, "Conversations run at the same time.")
+flags.DEFINE_integer("runs", 8, "Conversations run per flow or fixture.")
+flags.DEFINE_bool("record", False, "Run against the real models and tools, and save fixtures.")
+flags.DEFINE_string("fixture_dir", os.path.join(TESTS_DIR, "fixtures"), "Where --record saves fixtures.")
+
+
+def _load_fixtures() -> dict[str, replay.Fixture]:
+    if FLAGS.fixtures:
+        return {
+            os.path.splitext(os.path.basename(path))[0]: replay.Fixture.load(path)
+            for path in FLAGS.fixtures
+        }
+    agent_tools = replay.agent_tool_names(root_agent)
+    return {
+        flow: replay.fixture_from_transcript(
+            SAMPLE_FLOWS[flow][0], agent_tools, scenario=SAMPLE_FLOWS[flow][1]
+        )
+        for flow in FLAGS.flows
+    }
+
+
+async def run_conversation(
+    runner: Runner, fixture: replay.Fixture, record: bool = False
+) -> replay.Metrics:
+    """
+    Runs the user turns of a fixture in a new session.
+
+    Args:
+        runner: The runner of the instrumented root agent.
+        fixture: The fixture to replay, or to record into.
+        record: Whether to call the real models and tools.
+
+    Returns:
+        The metrics of the conversation.
+    """
+    metrics = replay.use_fixture(fixture, record=record)
+    state = {}
+    if fixture.scenario:
+        _set_initial_states(load_scenario(fixture.scenario), state)
+    session = await runner.session_service.create_session(
+        app_name=APP_NAME, user_id="benchmark", session_id=str(uuid.uuid4()), state=state
+    )
+    for turn in fixture.turns:
+        start = time.perf_counter()
+        async for _ in runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=turn)]),
+        ):
+            pass
+        metrics.add("turn", "all", time.perf_counter() - start)
+    return metrics
+
+
+async def benchmark(
+    fixtures: dict[str, replay.Fixture],
+    concurrency: int,
+    runs: int,
+    record: bool = False,
+    from_transcripts: bool = False,
+) -> replay.Metrics:
+    """
+    Runs every fixture `runs` times, `concurrency` conversations at a time.
+
+    Args:
+        fixtures: The fixtures by name.
+        concurrency: The number of conversations run at the same time.
+        runs: The number of conversations per fixture.
+        record: Whether to call the real models and tools.
+        from_transcripts: Whether the fixtures were converted from transcripts.
+
+    Returns:
+        The metrics of all conversations.
+    """
+    replay.install(
+        root_agent, list(fixtures.values()), relax_output_schemas=from_transcripts
+    )
+    runner = Runner(
+        app_name=APP_NAME, agent=root_agent, session_service=InMemorySessionService()
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(fixture: replay.Fixture) -> replay.Metrics:
+        async with semaphore:
+            return await run_conversation(runner, fixture, record=record)
+
+    total = replay.Metrics()
+    start = time.perf_counter()
+    # Each task runs in its own context, so conversations replay independently.
+    for metrics in await asyncio.gather(
+        *(run(fixture) for fixture in fixtures.values() for _ in range(runs))
+    ):
+        total.merge(metrics)
+    total.add("benchmark", "wall", time.perf_counter() - start)
+    return total
+
+
+def print_summary(metrics: replay.Metrics):
+    """Prints the latency summary as a table."""
+    columns = ["category", "name", "count", "total_ms", "mean_ms", "p50_ms", "p95_ms"]
+    rows = metrics.summary()
+    width = max([len(row["name"]) for row in rows] + [4])
+    print(f"{columns[0]:<10} {columns[1]:<{width}}" + "".join(f"{c:>10}" for c in columns[2:]))
+    for row in rows:
+        print(
+            f"{row['category']:<10} {row['name']:<{width}} {row['count']:>9}"
+            + "".join(f"{row[c]:>10.2f}" for c in columns[3:])
+        )
+
+
+def main(argv: list[str]) -> None:
+    del argv  # unused
+    if FLAGS.record:
+        fixtures = {
+            name: replay.Fixture(turns=fixture.turns, scenario=fixture.scenario)
+            for name, fixture in _load_fixtures().items()
+        }
+        metrics = asyncio.run(benchmark(fixtures, FLAGS.concurrency, runs=1, record=True))
+        os.makedirs(FLAGS.fixture_dir, exist_ok=True)
+        for name, fixture in fixtures.items():
+            fixture.save(os.path.join(FLAGS.fixture_dir, f"{name}.json"))
+    else:
+        metrics = asyncio.run(
+            benchmark(
+                _load_fixtures(),
+                FLAGS.concurrency,
+                FLAGS.runs,
+                from_transcripts=not FLAGS.fixtures,
+            )
+        )
+    print_summary(metrics)
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -0,0 +1,500 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Record and replay of model responses and tool calls, for offline runs of the agents.
+
+A Fixture holds the user turns of a conversation, the responses of every model
+call by agent, and the responses of the tools that need the network (map_tool,
+MCP tools). Fixtures are recorded from live runs, or converted from the sample
+transcripts in tests/*_sample.md.
+
+install() swaps the model of every agent in the tree for a HarnessLlm, and
+adds callbacks that record or replay tool calls and time agents, tools, model
+calls and the state callbacks and instruction providers of the agents. The
+fixture and the metrics of a run are set per asyncio task with use_fixture(),
+so several conversations can be replayed concurrently.
+"""
+
+from collections import defaultdict
+import contextvars
+import dataclasses
+import functools
+import inspect
+import json
+import re
+import statistics
+import time
+import typing
+from types import UnionType
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Union
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.adk.tools import BaseTool, ToolContext
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+from pydantic import BaseModel, Field, create_model
+
+try:
+    from google.adk.tools.mcp_tool.mcp_tool import MCPTool
+except ImportError:  # The MCP tools need an optional, recent mcp package.
+    MCPTool = None
+
+# Tools that call external services, and hence are recorded and replayed.
+RECORDED_TOOLS = frozenset({"map_tool"})
+
+_TRANSCRIPT_HEADER_RE = re.compile(r"^\*\*\\\[(?P<author>[^\\]+)\\\]:\*\*\s?(?P<text>.*)$")
+_CAMEL_CASE_RE = re.compile(r"(?<=[a-z0-9])([A-Z])")
+
+
+class ReplayMissError(LookupError):
+    """The fixture has no recorded response for a model or tool call."""
+
+
+@dataclasses.dataclass
+class Fixture:
+    """The user turns of a conversation and the recorded responses."""
+
+    turns: List[str]
+    # {"agent": str, "request": Optional[str], "response": LlmResponse JSON}
+    model_calls: List[Dict[str, Any]] = dataclasses.field(default_factory=list)
+    # {"agent": str, "tool": str, "args": dict, "response": Any}
+    tool_calls: List[Dict[str, Any]] = dataclasses.field(default_factory=list)
+    # The scenario file to seed the session state with, if any.
+    scenario: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: str) -> "Fixture":
+        with open(path, "r") as file:
+            return cls(**json.load(file))
+
+    def save(self, path: str):
+        with open(path, "w") as file:
+            json.dump(dataclasses.asdict(self), file, indent=2)
+
+
+def _snake_case_keys(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            _CAMEL_CASE_RE.sub(r"_\1", key).lower(): _snake_case_keys(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_snake_case_keys(item) for item in value]
+    return value
+
+
+def _parse_transcript(path: str) -> List[tuple]:
+    """Returns the (author, kind, name, payload) entries of a sample transcript."""
+    entries = []
+    with open(path, "r") as file:
+        lines = file.read().splitlines()
+    i = 0
+    while i < len(lines):
+        match = _TRANSCRIPT_HEADER_RE.match(lines[i])
+        i += 1
+        if not match:
+            continue
+        author, text = match.group("author"), match.group("text").strip()
+        body = []
+        while i < len(lines) and not _TRANSCRIPT_HEADER_RE.match(lines[i]):
+            body.append(lines[i])
+            i += 1
+        block = "\n".join(body).strip()
+        if author == "user":
+            entries.append((author, "user", None, text))
+        elif text or not block.startswith("```"):
+            entries.append((author, "text", None, "\n".join([text, block]).strip()))
+        else:
+            block = block.strip("`").removeprefix("json").strip()
+            kind, _, rest = block.partition("\n")
+            name = kind.split('"')[1]
+            payload = rest.partition(":")[2].strip()
+            try:
+                payload = json.loads(payload)
+            except json.JSONDecodeError:
+                pass
+            if kind.startswith("function call"):
+                entries.append((author, "call", name, payload))
+            else:
+                entries.append((author, "response", name, payload))
+    return entries
+
+
+def fixture_from_transcript(
+    path: str, agent_tools: Set[str], scenario: Optional[str] = None
+) -> Fixture:
+    """
+    Converts a sample transcript, e.g. tests/pre_booking_sample.md, to a fixture.
+
+    Args:
+        path: The transcript path.
+        agent_tools: The names of the agents that are called as AgentTools; their
+            responses in the transcript are the responses of their models.
+        scenario: The scenario file to seed the session state with.
+
+    Returns:
+        The fixture.
+    """
+    fixture = Fixture(turns=[], scenario=scenario)
+    pending_calls = []  # (caller, name, args) awaiting their responses.
+    open_response = None  # The model response that further parts belong to.
+    for author, kind, name, payload in _parse_transcript(path):
+        if kind == "user":
+            fixture.turns.append(payload)
+            open_response = None
+        elif kind in ("text", "call"):
+            part = (
+                {"text": payload}
+                if kind == "text"
+                else {"function_call": {"name": name, "args": payload or {}}}
+            )
+            if kind == "call":
+                pending_calls.append((author, name, payload or {}))
+            if open_response is not None and open_response["agent"] == author:
+                open_response["response"]["content"]["parts"].append(part)
+            else:
+                open_response = {
+                    "agent": author,
+                    "request": None,
+                    "response": {"content": {"role": "model", "parts": [part]}},
+                }
+                fixture.model_calls.append(open_response)
+        else:
+            open_response = None
+            # The transcripts may print the wrong name for responses, so they are
+            # matched to the calls by position.
+            caller, name, args = pending_calls.pop(0)
+            if name in agent_tools:
+                if isinstance(payload, dict) and list(payload) == ["result"]:
+                    text = str(payload["result"])
+                else:
+                    # The samples hold some camelCase keys, which the output
+                    # schemas of the agents reject.
+                    text = json.dumps(_snake_case_keys(payload))
+                fixture.model_calls.append(
+                    {
+                        "agent": name,
+                        "request": args.get("request"),
+                        "response": {
+                            "content": {"role": "model", "parts": [{"text": text}]}
+                        },
+                    }
+                )
+            elif name != "transfer_to_agent":
+                fixture.tool_calls.append(
+                    {"agent": caller, "tool": name, "args": args, "response": payload}
+                )
+    return fixture
+
+
+class Metrics:
+    """Latency samples in seconds, by (category, name)."""
+
+    def __init__(self):
+        self.samples: Dict[tuple, List[float]] = defaultdict(list)
+
+    def add(self, category: str, name: str, seconds: float):
+        self.samples[(category, name)].append(seconds)
+
+    def merge(self, other: "Metrics"):
+        for key, values in other.samples.items():
+            self.samples[key].extend(values)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Returns count, total, mean, p50 and p95 in milliseconds per (category, name)."""
+        rows = []
+        for (category, name), values in sorted(self.samples.items()):
+            ordered = sorted(values)
+            rows.append(
+                {
+                    "category": category,
+                    "name": name,
+                    "count": len(values),
+                    "total_ms": 1000 * sum(values),
+                    "mean_ms": 1000 * statistics.fmean(values),
+                    "p50_ms": 1000 * ordered[len(ordered) // 2],
+                    "p95_ms": 1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                }
+            )
+        return rows
+
+
+class _Run:
+    """The state of one conversation: its fixture, cursors and metrics."""
+
+    def __init__(self, fixture: Fixture, record: bool):
+        self.fixture = fixture
+        self.record = record
+        self.metrics = Metrics()
+        self._used_models: Set[int] = set()
+        self._used_tools: Set[int] = set()
+        self._started: Dict[Any, float] = {}
+
+    def next_model_response(self, agent: str, request: Optional[str]) -> Dict[str, Any]:
+        candidates = [
+            (i, call)
+            for i, call in enumerate(self.fixture.model_calls)
+            if i not in self._used_models and call["agent"] == agent
+        ]
+        # Agents called as tools are matched by request, others by order.
+        matching = [c for c in candidates if c[1]["request"] in (None, request)]
+        if not matching:
+            raise ReplayMissError(f"No recorded model response for {agent}: {request!r}")
+        i, call = next(
+            (c for c in matching if c[1]["request"] == request), matching[0]
+        )
+        self._used_models.add(i)
+        return call["response"]
+
+    def next_tool_response(self, agent: str, tool: str, args: Dict[str, Any]) -> Any:
+        candidates = [
+            (i, call)
+            for i, call in enumerate(self.fixture.tool_calls)
+            if i not in self._used_tools and call["tool"] == tool
+        ]
+        if not candidates:
+            raise ReplayMissError(f"No recorded response for {tool} called by {agent}")
+        i, call = next((c for c in candidates if c[1]["args"] == args), candidates[0])
+        self._used_tools.add(i)
+        return call["response"]
+
+
+_current_run: contextvars.ContextVar[_Run] = contextvars.ContextVar("replay_run")
+
+
+def use_fixture(fixture: Fixture, record: bool = False) -> Metrics:
+    """
+    Replays (or records into) a fixture in the current asyncio task.
+
+    Args:
+        fixture: The fixture.
+        record: Whether to call the real models and tools and record them.
+
+    Returns:
+        The metrics of the run, filled in as it progresses.
+    """
+    run = _Run(fixture, record)
+    _current_run.set(run)
+    return run.metrics
+
+
+def _request_text(llm_request: LlmRequest) -> Optional[str]:
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if content.role == "user" and part.text:
+                return part.text
+    return None
+
+
+class HarnessLlm(BaseLlm):
+    """A model that replays the responses of the fixture, or records real ones."""
+
+    agent_name: str
+    is_agent_tool: bool = False
+
+    @functools.cached_property
+    def _inner(self) -> BaseLlm:
+        return LLMRegistry.new_llm(self.model)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        run = _current_run.get()
+        request = _request_text(llm_request) if self.is_agent_tool else None
+        start = time.perf_counter()
+        if run.record:
+            responses = [
+                response
+                async for response in self._inner.generate_content_async(llm_request)
+            ]
+            for response in responses:
+                run.fixture.model_calls.append(
+                    {
+                        "agent": self.agent_name,
+                        "request": request,
+                        "response": response.model_dump(mode="json", exclude_none=True),
+                    }
+                )
+        else:
+            responses = [
+                LlmResponse.model_validate(
+                    run.next_model_response(self.agent_name, request)
+                )
+            ]
+        run.metrics.add("model", self.agent_name, time.perf_counter() - start)
+        for response in responses:
+            yield response
+
+
+class ReplayTool(BaseTool):
+    """A stand-in for a recorded tool that is not available, e.g. an MCP tool."""
+
+    def __init__(self, name: str, agent_name: str):
+        super().__init__(name=name, description=f"Replays recorded {name} responses.")
+        self.agent_name = agent_name
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        return types.FunctionDeclaration(name=self.name, description=self.description)
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: ToolContext) -> Any:
+        return _current_run.get().next_tool_response(self.agent_name, self.name, args)
+
+
+def _is_recorded(tool: BaseTool) -> bool:
+    return tool.name in RECORDED_TOOLS or (MCPTool and isinstance(tool, MCPTool))
+
+
+def _timed(category: str, name: str, callback):
+    """Wraps a callback or instruction provider to time it."""
+
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = callback(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        run = _current_run.get(None)
+        if run:
+            run.metrics.add(category, name, time.perf_counter() - start)
+        return result
+
+    return wrapper
+
+
+def _instrument(agent: LlmAgent, is_agent_tool: bool):
+    name = agent.name
+
+    def start_agent(callback_context):
+        _current_run.get()._started[("agent", callback_context.invocation_id, name)] = (
+            time.perf_counter()
+        )
+
+    def end_agent(callback_context):
+        run = _current_run.get()
+        start = run._started.pop(("agent", callback_context.invocation_id, name), None)
+        if start is not None:
+            run.metrics.add("agent", name, time.perf_counter() - start)
+
+    def before_tool(tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext):
+        run = _current_run.get()
+        run._started[("tool", tool_context.function_call_id)] = time.perf_counter()
+        if not run.record and _is_recorded(tool):
+            return run.next_tool_response(name, tool.name, args)
+        return None
+
+    def after_tool(tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Any):
+        run = _current_run.get()
+        start = run._started.pop(("tool", tool_context.function_call_id), None)
+        if start is not None:
+            run.metrics.add("tool", tool.name, time.perf_counter() - start)
+        if run.record and _is_recorded(tool):
+            run.fixture.tool_calls.append(
+                {"agent": name, "tool": tool.name, "args": args, "response": tool_response}
+            )
+        return None
+
+    def as_list(callbacks):
+        return callbacks if isinstance(callbacks, list) else [callbacks] if callbacks else []
+
+    agent.before_agent_callback = [start_agent] + [
+        _timed("callback", f"{name}.before_agent:{cb.__name__}", cb)
+        for cb in as_list(agent.before_agent_callback)
+    ]
+    agent.after_agent_callback = [
+        _timed("callback", f"{name}.after_agent:{cb.__name__}", cb)
+        for cb in as_list(agent.after_agent_callback)
+    ] + [end_agent]
+    agent.before_tool_callback = [before_tool] + as_list(agent.before_tool_callback)
+    agent.after_tool_callback = [after_tool] + as_list(agent.after_tool_callback)
+    if callable(agent.instruction):
+        agent.instruction = _timed("callback", f"{name}.instruction", agent.instruction)
+    agent.model = HarnessLlm(
+        model=agent.canonical_model.model, agent_name=name, is_agent_tool=is_agent_tool
+    )
+
+
+@functools.cache
+def _optional_model(model_cls: type) -> type:
+    """Returns a subclass of a model whose fields all default to None, recursively."""
+
+    def optional(annotation: Any) -> Any:
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return _optional_model(annotation)
+        args = typing.get_args(annotation)
+        if not args:
+            return annotation
+        origin = typing.get_origin(annotation)
+        if origin in (Union, UnionType):
+            return Union[tuple(optional(arg) for arg in args)]
+        if origin is list:
+            return list[optional(args[0])]
+        return annotation
+
+    fields = {
+        name: (Optional[optional(field.annotation)], Field(None, description=field.description))
+        for name, field in model_cls.model_fields.items()
+    }
+    return create_model(model_cls.__name__, __base__=model_cls, **fields)
+
+
+def _walk(agent: BaseAgent, is_agent_tool: bool = False):
+    yield agent, is_agent_tool
+    for sub_agent in agent.sub_agents:
+        yield from _walk(sub_agent)
+    for tool in getattr(agent, "tools", []):
+        if isinstance(tool, AgentTool):
+            yield from _walk(tool.agent, is_agent_tool=True)
+
+
+def agent_tool_names(root_agent: BaseAgent) -> Set[str]:
+    """Returns the names of the agents called as AgentTools in the tree."""
+    return {agent.name for agent, is_agent_tool in _walk(root_agent) if is_agent_tool}
+
+
+def install(
+    root_agent: BaseAgent,
+    fixtures: List[Fixture] = (),
+    relax_output_schemas: bool = False,
+):
+    """
+    Instruments the agent tree for recording and replaying.
+
+    Call once, before running the agents; it modifies the agents in place.
+
+    Args:
+        root_agent: The root of the agent tree.
+        fixtures: Fixtures to be replayed; stand-ins are added for their tools
+            that are missing from the tree.
+        relax_output_schemas: Whether to make all fields of the agents' output
+            schemas optional, for fixtures converted from transcripts that
+            predate required fields.
+    """
+    agents = {}
+    for agent, is_agent_tool in _walk(root_agent):
+        if isinstance(agent, LlmAgent) and not isinstance(agent.model, HarnessLlm):
+            _instrument(agent, is_agent_tool)
+            if relax_output_schemas and agent.output_schema:
+                agent.output_schema = _optional_model(agent.output_schema)
+        agents[agent.name] = agent
+
+    for fixture in fixtures:
+        for call in fixture.tool_calls:
+            agent = agents.get(call["agent"])
+            if not isinstance(agent, LlmAgent):
+                continue
+            names = {getattr(tool, "name", getattr(tool, "__name__", None)) for tool in agent.tools}
+            if call["tool"] not in names:
+                agent.tools.append(ReplayTool(call["tool"], agent.name))
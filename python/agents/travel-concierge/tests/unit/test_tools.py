@@ -14,17 +14,49 @@
 
 """Basic tests for individual tools."""
 
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
+from urllib.parse import parse_qs, urlparse
 
 from dotenv import load_dotenv
+from google.adk.agents import BaseAgent, LlmAgent
 from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
 from google.adk.artifacts import InMemoryArtifactService
+from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools import ToolContext
+from google.genai import types as genai_types
 import pytest
+from tests import replay
 from travel_concierge.agent import root_agent
-from travel_concierge.tools.memory import memorize
-from travel_concierge.tools.places import map_tool
+from travel_concierge.shared_libraries import constants
+from travel_concierge.sub_agents.in_trip.monitor import (
+    FakeBookingProvider,
+    FakeFlightStatusProvider,
+    FakeWeatherProvider,
+    TripMonitor,
+    monitor_session,
+)
+from travel_concierge.sub_agents.in_trip.tools import find_segment
+from travel_concierge.shared_libraries.list_memory import ListMemory
+from travel_concierge.shared_libraries.state_json import instruction_provider
+from travel_concierge.tools.memory import (
+    _set_initial_states,
+    forget_many,
+    load_scenario,
+    memorize,
+    memorize_list,
+    memorize_many,
+)
+from travel_concierge.tools.places import GeocodeCache, PlacesService, map_tool
+from travel_concierge.tools.search import AnswerCache, CachedAgentTool
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -68,14 +100,382 @@ class TestAgents(unittest.TestCase):
             self.tool_context.state["itinerary_datetime"], "12/31/2025 11:59:59"
         )
 
+    def test_list_memory(self):
+        memorize_many("likes", ["tea", "jazz", "tea"], self.tool_context)
+        memorize_list("likes", "museums", self.tool_context)
+        # Re-adding a value makes it the most recent one.
+        self.assertEqual(
+            self.tool_context.state["likes"], ["jazz", "tea", "museums"]
+        )
+        result = forget_many("likes", ["jazz", "opera"], self.tool_context)
+        self.assertIn("Removed 1", result["status"])
+        self.assertEqual(self.tool_context.state["likes"], ["tea", "museums"])
+
+    def test_list_memory_capacity_evicts_least_recent(self):
+        memory = ListMemory(["a", "b", "c"], capacity=3)
+        memory.add_many(["a", "d"])
+        self.assertEqual(memory.to_state(), ["c", "a", "d"])
+
+    def test_list_memory_holds_dicts(self):
+        self.tool_context.state["user_profile"] = {"likes": [{"business": "Pike Place"}]}
+        memorize_many(
+            "user_profile.likes",
+            [{"business": "Pike Place"}, {"business": "Space Needle"}],
+            self.tool_context,
+        )
+        forget_many("user_profile.likes", [{"business": "Pike Place"}], self.tool_context)
+        self.assertEqual(
+            self.tool_context.state["user_profile"],
+            {"likes": [{"business": "Space Needle"}]},
+        )
+
+    def test_list_memory_updates_profile_lists(self):
+        self.tool_context.state["user_profile"] = {"likes": ["tea"], "seat_preference": "window"}
+        memorize_many("user_profile.likes", ["jazz", "tea"], self.tool_context)
+        self.assertEqual(
+            self.tool_context.state["user_profile"],
+            {"likes": ["jazz", "tea"], "seat_preference": "window"},
+        )
+        self.assertNotIn("likes", self.tool_context.state)
+
+    def test_list_memory_rejects_single_values(self):
+        self.tool_context.state["user_profile"] = {"seat_preference": "window"}
+        result = forget_many("user_profile.seat_preference", ["window"], self.tool_context)
+        self.assertEqual(result["status"], "error")
+        result = memorize_many("user_profile.seat_preference", ["aisle"], self.tool_context)
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(
+            self.tool_context.state["user_profile"], {"seat_preference": "window"}
+        )
+
+    def test_memorize_itinerary_bumps_version(self):
+        memorize(key=constants.ITIN_KEY, value={}, tool_context=self.tool_context)
+        version = self.tool_context.state[constants.ITIN_VERSION]
+        memorize(key=constants.ITIN_KEY, value={}, tool_context=self.tool_context)
+        self.assertNotEqual(self.tool_context.state[constants.ITIN_VERSION], version)
+
+    def test_find_segment(self):
+        with open("travel_concierge/profiles/itinerary_seattle_example.json") as f:
+            state = json.load(f)["state"]
+        profile, itinerary = state["user_profile"], state["itinerary"]
+
+        # Before the trip: from home to the outbound flight.
+        travel_from, travel_to, _, arrive_by = find_segment(
+            profile, itinerary, "2025-06-15 00:00", "v1"
+        )
+        self.assertIn("Sequence Dr", travel_from)
+        self.assertIn("SAN", travel_to)
+        self.assertEqual(arrive_by, "An hour before 07:30")
+
+        # The next day, a later time still finds the next event that day.
+        travel_from, travel_to, _, arrive_by = find_segment(
+            profile, itinerary, "2025-06-16 12:00", "v1"
+        )
+        self.assertIn("Pike Place", travel_from)
+        self.assertIn("Ivar's", travel_to)
+        self.assertEqual(arrive_by, "12:30")
+
+    def test_scenario_is_parsed_once_and_copied_into_state(self):
+        path = "travel_concierge/profiles/itinerary_seattle_example.json"
+        scenario = load_scenario(path)
+        self.assertIs(load_scenario(path), scenario)
+
+        state = {}
+        _set_initial_states(scenario, state)
+        state[constants.ITIN_KEY]["days"].clear()
+        self.assertTrue(scenario[constants.ITIN_KEY]["days"])
+
+    def test_memorize_decodes_structured_values(self):
+        memorize("seat", '{"seats": [{"seat_number": "1A"}]}', self.tool_context)
+        self.assertEqual(
+            self.tool_context.state["seat"], {"seats": [{"seat_number": "1A"}]}
+        )
+        memorize("seat", "window, please", self.tool_context)
+        self.assertEqual(self.tool_context.state["seat"], "window, please")
+
+    def test_instruction_provider_renders_json(self):
+        self.tool_context.state["seat"] = {"seats": [{"seat_number": "{1A}"}]}
+        provide = instruction_provider("Seats: {seat} at {missing?}.")
+        self.assertEqual(
+            asyncio.run(provide(self.tool_context)),
+            'Seats: {"seats":[{"seat_number":"{1A}"}]} at .',
+        )
+
+    def test_search_answers_are_cached(self):
+        agent = _CountingAgent(name="counting_agent")
+        tool = CachedAgentTool(agent=agent, cache=AnswerCache(ttl_secs=60, max_entries=8))
+        for request in ("Do I need a visa for Peru?", "do i need a VISA for peru"):
+            answer = asyncio.run(
+                tool.run_async(args={"request": request}, tool_context=self.tool_context)
+            )
+            self.assertEqual(answer, "Answer 1")
+        self.assertEqual(agent.calls, 1)
+        self.assertEqual(tool.cache.stats()["hits"], 1)
+
     def test_places(self):
         self.tool_context.state["poi"] = {
             "places": [{"place_name": "Machu Picchu", "address": "Machu Picchu, Peru"}]
         }
-        result = map_tool(key="poi", tool_context=self.tool_context)
+        result = asyncio.run(map_tool(key="poi", tool_context=self.tool_context))
         print(result)
         self.assertIn("place_id", result["places"][0])
         self.assertEqual(
             self.tool_context.state["poi"]["places"][0]["place_id"],
             "ChIJVVVViV-abZERJxqgpA43EDo",
         )
+
+
+class _CountingAgent(BaseAgent):
+    """Answers every request with the number of times it was run."""
+
+    calls: int = 0
+
+    async def _run_async_impl(self, ctx):
+        self.calls += 1
+        yield Event(
+            author=self.name,
+            content=genai_types.Content(
+                role="model", parts=[genai_types.Part(text=f"Answer {self.calls}")]
+            ),
+        )
+
+
+class _StubPlacesHandler(BaseHTTPRequestHandler):
+    """Serves canned Find Place responses, recording each query."""
+
+    queries = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)["input"][0]
+        self.queries.append(query)
+        candidates = [] if query.startswith("Nowhere") else [
+            {
+                "place_id": f"id:{query}",
+                "name": query.split(",")[0],
+                "formatted_address": query,
+                "photos": [{"photo_reference": "ref1"}],
+                "geometry": {"location": {"lat": 1.5, "lng": -2.5}},
+            }
+        ]
+        body = json.dumps({"candidates": candidates}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPlacesService(unittest.TestCase):
+    """Tests the batched Places resolver against a local stub server."""
+
+    def setUp(self):
+        super().setUp()
+        _StubPlacesHandler.queries = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubPlacesHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.service = PlacesService(
+            places_url=f"http://127.0.0.1:{self.server.server_port}",
+            cache=GeocodeCache(
+                os.path.join(self.cache_dir.name, "geocode.sqlite"), ttl_secs=60
+            ),
+        )
+        self.service.places_api_key = "test-key"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache_dir.cleanup()
+        super().tearDown()
+
+    def test_batch_dedupes_and_caches(self):
+        queries = ["Machu Picchu, Peru", "machu picchu ,  peru", "Cusco, Peru"]
+        results = asyncio.run(self.service.find_places_from_text(queries))
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[2]["lat"], "1.5")
+        self.assertIn("key=test-key", results[2]["photos"][0])
+        self.assertEqual(len(_StubPlacesHandler.queries), 2)
+
+        asyncio.run(self.service.find_places_from_text(queries))
+        self.assertEqual(len(_StubPlacesHandler.queries), 2)
+
+    def test_not_found_is_not_cached(self):
+        for _ in range(2):
+            result = asyncio.run(
+                self.service.find_place_from_text("Nowhere, Atlantis")
+            )
+            self.assertIn("error", result)
+        self.assertEqual(len(_StubPlacesHandler.queries), 2)
+
+
+class TestTripMonitor(unittest.TestCase):
+    """Tests the batched trip monitor with the fake providers."""
+
+    def setUp(self):
+        super().setUp()
+        with open("travel_concierge/profiles/itinerary_seattle_example.json") as f:
+            self.state = json.load(f)["state"]
+        self.flights = FakeFlightStatusProvider()
+        self.bookings = FakeBookingProvider()
+        self.weather = FakeWeatherProvider()
+        self.monitor = TripMonitor([self.flights, self.bookings, self.weather])
+
+    def test_one_batch_per_provider(self):
+        delta = asyncio.run(self.monitor.run_once(self.state))
+        for provider in (self.flights, self.bookings, self.weather):
+            self.assertEqual(len(provider.batches), 1)
+        self.assertEqual(len(self.flights.batches[0]), 2)
+        self.assertEqual(
+            [alert["name"] for alert in delta[constants.TRIP_ALERTS]],
+            ["Visit the Space Needle"],
+        )
+
+    def test_unchanged_pass_is_cached_and_writes_nothing(self):
+        self.state.update(asyncio.run(self.monitor.run_once(self.state)))
+        # The first unchanged pass clears the alerts of the previous one.
+        delta = asyncio.run(self.monitor.run_once(self.state))
+        self.assertEqual(delta, {constants.TRIP_ALERTS: []})
+        self.state.update(delta)
+        self.assertEqual(asyncio.run(self.monitor.run_once(self.state)), {})
+        self.assertEqual(len(self.flights.batches), 1)
+
+    def test_cache_is_bounded_and_purges_expired_results(self):
+        self.monitor.cache_max_entries = 2
+        asyncio.run(self.monitor.run_once(self.state))
+        self.assertEqual(len(self.monitor._cache), 2)
+
+        monitor = TripMonitor([self.flights, self.bookings, self.weather], cache_ttl_secs=0)
+        asyncio.run(monitor.run_once(self.state))
+        monitor._cache_put("fresh", time.time() + 60, {"status": "ok"})
+        self.assertEqual(list(monitor._cache), ["fresh"])
+
+    def test_changes_are_reported_as_deltas(self):
+        self.monitor.cache_ttl_secs = 0
+        self.state.update(asyncio.run(self.monitor.run_once(self.state)))
+        self.flights.statuses["UA5678"] = "delayed"
+        delta = asyncio.run(self.monitor.run_once(self.state))
+        self.assertEqual(len(delta[constants.TRIP_ALERTS]), 1)
+        self.assertEqual(delta[constants.TRIP_ALERTS][0]["name"], "UA5678")
+
+    def test_monitor_session(self):
+        async def run():
+            service = InMemorySessionService()
+            session = await service.create_session(
+                app_name="Travel_Concierge", user_id="traveler0115", state=self.state
+            )
+            await monitor_session(
+                self.monitor,
+                service,
+                "Travel_Concierge",
+                "traveler0115",
+                session.id,
+                interval_secs=0,
+                max_passes=2,
+            )
+            return await service.get_session(
+                app_name="Travel_Concierge",
+                user_id="traveler0115",
+                session_id=session.id,
+            )
+
+        session = asyncio.run(run())
+        # The first pass writes the statuses, the second clears its alerts.
+        self.assertEqual(len(session.events), 2)
+        self.assertIn(constants.TRIP_STATUS, session.state)
+        self.assertEqual(session.state[constants.TRIP_ALERTS], [])
+
+
+class TestReplay(unittest.TestCase):
+    """Tests the offline record and replay harness."""
+
+    def test_fixture_from_transcript(self):
+        fixture = replay.fixture_from_transcript(
+            os.path.join(os.path.dirname(__file__), "..", "post_booking_sample.md"),
+            replay.agent_tool_names(root_agent),
+        )
+        self.assertEqual(fixture.turns[0], "transfer to pre_trip")
+        searches = [
+            call["request"]
+            for call in fixture.model_calls
+            if call["agent"] == "google_search_grounding"
+        ]
+        self.assertIn("visa_requirements San Diego Seattle", searches)
+        self.assertNotIn(
+            "transfer_to_agent", [call["tool"] for call in fixture.tool_calls]
+        )
+
+    def test_replay_model_and_tool_calls(self):
+        agent = LlmAgent(
+            name="map_agent", model="gemini-2.0-flash", tools=[map_tool]
+        )
+        fixture = replay.Fixture(
+            turns=["Where is Machu Picchu?"],
+            model_calls=[
+                {
+                    "agent": "map_agent",
+                    "request": None,
+                    "response": {
+                        "content": {
+                            "role": "model",
+                            "parts": [
+                                {"function_call": {"name": "map_tool", "args": {"key": "poi"}}}
+                            ],
+                        }
+                    },
+                },
+                {
+                    "agent": "map_agent",
+                    "request": None,
+                    "response": {
+                        "content": {"role": "model", "parts": [{"text": "In Peru."}]}
+                    },
+                },
+            ],
+            tool_calls=[
+                {
+                    "agent": "map_agent",
+                    "tool": "map_tool",
+                    "args": {"key": "poi"},
+                    "response": {"places": [{"place_id": "ChIJVVVViV-abZERJxqgpA43EDo"}]},
+                }
+            ],
+        )
+        replay.install(agent, [fixture])
+
+        async def run():
+            metrics = replay.use_fixture(fixture)
+            runner = Runner(
+                app_name="Travel_Concierge",
+                agent=agent,
+                session_service=InMemorySessionService(),
+            )
+            session = await runner.session_service.create_session(
+                app_name="Travel_Concierge", user_id="traveler0115"
+            )
+            events = [
+                event
+                async for event in runner.run_async(
+                    user_id="traveler0115",
+                    session_id=session.id,
+                    new_message=genai_types.Content(
+                        role="user", parts=[genai_types.Part(text=fixture.turns[0])]
+                    ),
+                )
+            ]
+            return events, metrics
+
+        events, metrics = asyncio.run(run())
+        responses = [
+            part.function_response.response
+            for event in events
+            for part in event.content.parts
+            if part.function_response
+        ]
+        self.assertEqual(responses, [fixture.tool_calls[0]["response"]])
+        self.assertEqual(events[-1].content.parts[0].text, "In Peru.")
+        self.assertIn(("tool", "map_tool"), metrics.samples)
+        self.assertEqual(len(metrics.samples[("model", "map_agent")]), 2)
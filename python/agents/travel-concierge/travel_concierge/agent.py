@@ -17,6 +17,7 @@
 from google.adk.agents import Agent
 
 from travel_concierge import prompt
+from travel_concierge.shared_libraries.state_json import instruction_provider
 
 from travel_concierge.sub_agents.booking.agent import booking_agent
 from travel_concierge.sub_agents.in_trip.agent import in_trip_agent
@@ -32,7 +33,7 @@ root_agent = Agent(
     model="gemini-2.5-flash",
     name="root_agent",
     description="A Travel Conceirge using the services of multiple sub-agents",
-    instruction=prompt.ROOT_AGENT_INSTR,
+    instruction=instruction_provider(prompt.ROOT_AGENT_INSTR),
     sub_agents=[
         inspiration_agent,
         planning_agent,
@@ -16,6 +16,7 @@
 
 SYSTEM_TIME = "_time"
 ITIN_INITIALIZED = "_itin_initialized"
+ITIN_VERSION = "_itin_version"  # Changes whenever the itinerary is replaced.
 
 ITIN_KEY = "itinerary"
 PROF_KEY = "user_profile"
@@ -24,5 +25,8 @@ ITIN_START_DATE = "itinerary_start_date"
 ITIN_END_DATE = "itinerary_end_date"
 ITIN_DATETIME = "itinerary_datetime"
 
+TRIP_STATUS = "trip_status"
+TRIP_ALERTS = "trip_alerts"
+
 START_DATE = "start_date"
 END_DATE = "end_date"
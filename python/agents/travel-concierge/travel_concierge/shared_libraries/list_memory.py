@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An ordered, size-bounded set of memories stored as a list in session state."""
+
+import json
+import os
+from typing import Any, Hashable, Iterable, List, Optional
+
+LIST_MEMORY_CAPACITY = int(os.getenv("TRAVEL_CONCIERGE_LIST_MEMORY_CAPACITY", "100"))
+
+
+def _key(value: Any) -> Hashable:
+    """Returns a hashable identity of a value; dicts and lists compare by content."""
+    try:
+        hash(value)
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+class ListMemory:
+    """
+    An ordered set with O(1) membership, add and remove.
+
+    When a capacity is set, adding to a full memory evicts the least recently
+    added or re-added value. In session state the memory is a plain JSON list,
+    oldest first, so prompts render it as before.
+    """
+
+    def __init__(self, values: Iterable[Any] = (), capacity: Optional[int] = None):
+        self.capacity = capacity
+        # dict keeps insertion order, which doubles as the recency order.
+        self._values = {}
+        self.add_many(values)
+
+    @classmethod
+    def from_state(cls, value: Any, capacity: Optional[int] = None) -> "ListMemory":
+        """Loads a memory from its session state value, which may be unset."""
+        if value is None:
+            return cls(capacity=capacity)
+        if isinstance(value, (list, tuple)):
+            return cls(value, capacity)
+        return cls([value], capacity)
+
+    def to_state(self) -> List[Any]:
+        """Returns the memory as a JSON list for the session state."""
+        return list(self._values.values())
+
+    def __contains__(self, value: Any) -> bool:
+        return _key(value) in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values.values())
+
+    def _evict(self):
+        if self.capacity is not None:
+            while len(self._values) > self.capacity:
+                del self._values[next(iter(self._values))]
+
+    def add_many(self, values: Iterable[Any]) -> int:
+        """Adds values, refreshing the recency of ones already present; returns how many were new."""
+        added = 0
+        for value in values:
+            key = _key(value)
+            if key in self._values:
+                del self._values[key]
+            else:
+                added += 1
+            self._values[key] = value
+        self._evict()
+        return added
+
+    def remove_many(self, values: Iterable[Any]) -> int:
+        """Removes values if present; returns how many were removed."""
+        removed = 0
+        for value in values:
+            if self._values.pop(_key(value), self) is not self:
+                removed += 1
+        return removed
@@ -0,0 +1,121 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compact JSON access to the structured values that agents keep in session state.
+
+Structured values (the itinerary, flight and hotel selections... etc.) live in
+session state as plain JSON-compatible dicts, which the agents and tools read
+directly. This module decodes the ones given as JSON text and renders them as
+compact JSON in agent instructions.
+"""
+
+import re
+from typing import Any, Callable, Awaitable
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.utils import instructions_utils
+import orjson
+from pydantic import BaseModel
+
+from travel_concierge.shared_libraries import constants
+
+# The session state keys holding structured values.
+STRUCTURED_KEYS = frozenset(
+    {
+        constants.ITIN_KEY,
+        "flight",
+        "hotel",
+        "room",
+        "seat",
+        "place",
+        "poi",
+        "what_to_pack",
+    }
+)
+
+_STATE_VAR_RE = re.compile(r"{([A-Za-z_][A-Za-z0-9_]*)}")
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(exclude_none=True)
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    """Encodes a JSON-compatible value, which may hold pydantic models, as compact JSON."""
+    return orjson.dumps(
+        value, default=_encode_default, option=orjson.OPT_NON_STR_KEYS
+    ).decode("utf-8")
+
+
+def loads(text: str | bytes) -> Any:
+    """Decodes JSON text."""
+    return orjson.loads(text)
+
+
+def parse_value(text: str) -> Any:
+    """
+    Parses a structured value given as JSON text, e.g. by a tool call.
+
+    Args:
+        text: The JSON text.
+
+    Returns:
+        The decoded dict or list, otherwise the text.
+    """
+    try:
+        value = loads(text)
+    except orjson.JSONDecodeError:
+        return text
+    return value if isinstance(value, (dict, list)) else text
+
+
+def instruction_provider(
+    template: str,
+) -> Callable[[ReadonlyContext], Awaitable[str]]:
+    """
+    Returns an instruction provider that renders structured values as compact JSON.
+
+    Other placeholders are filled in as usual.
+
+    Args:
+        template: The instruction template, with {key} placeholders.
+
+    Returns:
+        An async InstructionProvider for an Agent's `instruction`.
+    """
+    template_keys = set(_STATE_VAR_RE.findall(template))
+
+    async def provide(readonly_context: ReadonlyContext) -> str:
+        state = readonly_context.state
+        structured = {
+            key: state[key]
+            for key in template_keys
+            if isinstance(state.get(key), (dict, list))
+        }
+        # Mask the structured placeholders so that inject_session_state leaves
+        # them alone, then put the JSON in, as it contains braces itself.
+        masked = template
+        for key in structured:
+            masked = masked.replace("{" + key + "}", f"\x00{key}\x00")
+        instruction = await instructions_utils.inject_session_state(
+            masked, readonly_context
+        )
+        for key, value in structured.items():
+            instruction = instruction.replace(f"\x00{key}\x00", dumps(value))
+        return instruction
+
+    return provide
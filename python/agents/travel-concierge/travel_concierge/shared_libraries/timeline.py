@@ -0,0 +1,145 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A time-ordered index over the events of an itinerary."""
+
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Tuple
+import uuid
+
+from travel_concierge.shared_libraries import constants
+
+TIMELINE_CACHE_SIZE = 128
+
+_TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p", "%I %p")
+
+_timelines: "OrderedDict[str, ItineraryTimeline]" = OrderedDict()
+
+
+def new_itinerary_version() -> str:
+    """Returns a fresh token to store under constants.ITIN_VERSION."""
+    return uuid.uuid4().hex
+
+
+def parse_time(value: Optional[str]) -> Optional[time]:
+    """Parses an event time such as '16:00' or '4:00 PM'."""
+    if not value:
+        return None
+    value = value.strip()
+    for time_format in _TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format).time()
+        except ValueError:
+            continue
+    return None
+
+
+def event_time(event: Dict[str, Any]) -> Optional[str]:
+    """Returns the time at which one has to be at an event, by event type."""
+    match event.get("event_type"):
+        case "flight":
+            return event.get("boarding_time")
+        case "hotel":
+            return event.get("check_in_time")
+        case "visit":
+            return event.get("start_time")
+        case _:
+            return None
+
+
+class ItineraryTimeline:
+    """The events of an itinerary sorted by datetime, for bisect lookups."""
+
+    def __init__(self, itinerary: Dict[str, Any]):
+        entries = []
+        for day in itinerary.get("days", []):
+            try:
+                day_date = date.fromisoformat(day["date"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            # Events without a parsable time keep their place in the day.
+            previous_time = time.min
+            for event in day.get("events", []):
+                at = parse_time(event_time(event)) or previous_time
+                previous_time = at
+                entries.append((datetime.combine(day_date, at), day["date"], event))
+        # sort() is stable, so events at the same time keep their listed order.
+        entries.sort(key=lambda entry: entry[0])
+        self.times: List[datetime] = [entry[0] for entry in entries]
+        self.dates: List[str] = [entry[1] for entry in entries]
+        self.events: List[Dict[str, Any]] = [entry[2] for entry in entries]
+
+    def __len__(self):
+        return len(self.events)
+
+    def find_segment(
+        self, current: datetime
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Finds the segment of travel to the next event at or after `current`.
+
+        Args:
+            current: The current date and time.
+
+        Returns:
+            (origin, destination) events; the origin is None when the next event
+            is the first one, and both are None for an empty itinerary. Once the
+            trip is over, the segment to the last event is returned.
+        """
+        if not self.events:
+            return None, None
+        i = min(bisect_left(self.times, current), len(self.events) - 1)
+        origin = self.events[i - 1] if i > 0 else None
+        return origin, self.events[i]
+
+    def events_from(self, current: datetime) -> List[Tuple[str, Dict[str, Any]]]:
+        """Returns (date, event) pairs for all events at or after `current`."""
+        i = bisect_left(self.times, current)
+        return list(zip(self.dates[i:], self.events[i:]))
+
+
+def get_timeline(
+    itinerary: Dict[str, Any], version: Optional[str] = None
+) -> ItineraryTimeline:
+    """
+    Returns the timeline of an itinerary, reusing the one built for `version`.
+
+    Args:
+        itinerary: The itinerary, following the schema in types.Itinerary.
+        version: The itinerary's constants.ITIN_VERSION token, if any. Without
+            a version the timeline is rebuilt on every call.
+
+    Returns:
+        The itinerary timeline.
+    """
+    if not version:
+        return ItineraryTimeline(itinerary)
+    timeline = _timelines.get(version)
+    if timeline is None:
+        timeline = ItineraryTimeline(itinerary)
+        _timelines[version] = timeline
+        if len(_timelines) > TIMELINE_CACHE_SIZE:
+            _timelines.popitem(last=False)
+    else:
+        _timelines.move_to_end(version)
+    return timeline
+
+
+def get_state_timeline(state: Dict[str, Any]) -> ItineraryTimeline:
+    """Returns the timeline of the itinerary stored in the session state."""
+    return get_timeline(
+        state.get(constants.ITIN_KEY) or {}, state.get(constants.ITIN_VERSION)
+    )
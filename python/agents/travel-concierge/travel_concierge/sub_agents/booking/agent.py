@@ -18,6 +18,7 @@ from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 from google.genai.types import GenerateContentConfig
 
+from travel_concierge.shared_libraries.state_json import instruction_provider
 from travel_concierge.sub_agents.booking import prompt
 
 
@@ -48,7 +49,7 @@ booking_agent = Agent(
     model="gemini-2.5-flash",
     name="booking_agent",
     description="Given an itinerary, complete the bookings of items by handling payment choices and processing.",
-    instruction=prompt.BOOKING_AGENT_INSTR,
+    instruction=instruction_provider(prompt.BOOKING_AGENT_INSTR),
     tools=[
         AgentTool(agent=create_reservation),
         AgentTool(agent=payment_choice),
@@ -17,12 +17,11 @@
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 
+from travel_concierge.shared_libraries.state_json import instruction_provider
 from travel_concierge.sub_agents.in_trip import prompt
 from travel_concierge.sub_agents.in_trip.tools import (
     transit_coordination,
-    flight_status_check,
-    event_booking_check,
-    weather_impact_check,
+    trip_monitor_check,
 )
 
 from travel_concierge.tools.memory import memorize
@@ -41,8 +40,8 @@ trip_monitor_agent = Agent(
     model="gemini-2.5-flash",
     name="trip_monitor_agent",
     description="Monitor aspects of a itinerary and bring attention to items that necessitate changes",
-    instruction=prompt.TRIP_MONITOR_INSTR,
-    tools=[flight_status_check, event_booking_check, weather_impact_check],
+    instruction=instruction_provider(prompt.TRIP_MONITOR_INSTR),
+    tools=[trip_monitor_check],
     output_key="daily_checks",  # can be sent via email.
 )
 
@@ -51,7 +50,7 @@ in_trip_agent = Agent(
     model="gemini-2.5-flash",
     name="in_trip_agent",
     description="Provide information about what the users need as part of the tour.",
-    instruction=prompt.INTRIP_INSTR,
+    instruction=instruction_provider(prompt.INTRIP_INSTR),
     sub_agents=[
         trip_monitor_agent
     ],  # This can be run as an AgentTool. Illustrate as an Agent for demo purpose.
@@ -0,0 +1,364 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A trip monitor that checks all upcoming itinerary events in one pass.
+
+The monitor walks the itinerary, groups the checks by provider (flight status,
+bookings, weather), sends each provider its whole batch, runs the providers
+concurrently, caches the results, and reports only the checks whose status
+changed since the previous pass.
+"""
+
+import abc
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import os
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService
+
+from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.timeline import get_state_timeline
+
+MONITOR_CACHE_TTL_SECS = int(
+    os.getenv("TRAVEL_CONCIERGE_MONITOR_CACHE_TTL_SECS", str(15 * 60))
+)
+MONITOR_CACHE_MAX_ENTRIES = int(
+    os.getenv("TRAVEL_CONCIERGE_MONITOR_CACHE_MAX_ENTRIES", "4096")
+)
+MONITOR_INTERVAL_SECS = int(
+    os.getenv("TRAVEL_CONCIERGE_MONITOR_INTERVAL_SECS", str(60 * 60))
+)
+BAD_WEATHER = frozenset({"rain", "storm", "snow", "heat wave"})
+
+
+@dataclass(frozen=True)
+class CheckItem:
+    """One status check of an itinerary event."""
+
+    kind: str  # The provider kind, e.g. "flight".
+    key: str  # Identifies the check across passes.
+    name: str
+    date: str
+    params: Dict[str, Any] = field(default_factory=dict, compare=False, hash=False)
+
+    def fingerprint(self) -> str:
+        """Changes whenever the checked details of the event change."""
+        return json.dumps([self.key, self.date, self.params], sort_keys=True)
+
+
+class StatusProvider(abc.ABC):
+    """
+    Checks the status of a batch of items of one kind.
+
+    Implementations should issue as few upstream requests as the service
+    allows, e.g. one request for all flights of the trip.
+    """
+
+    kind: str
+
+    @abc.abstractmethod
+    async def check_many(self, items: List[CheckItem]) -> Dict[str, Dict[str, Any]]:
+        """
+        Checks a batch of items.
+
+        Args:
+            items: The items to check, all of this provider's kind.
+
+        Returns:
+            A {"status": str, "alert": bool} dictionary per item key.
+        """
+
+
+class FakeFlightStatusProvider(StatusProvider):
+    """Reports every flight on time, unless overridden by flight number."""
+
+    kind = "flight"
+
+    def __init__(self, statuses: Optional[Dict[str, str]] = None):
+        self.statuses = dict(statuses or {})
+        self.batches: List[List[CheckItem]] = []
+
+    async def check_many(self, items: List[CheckItem]) -> Dict[str, Dict[str, Any]]:
+        self.batches.append(items)
+        results = {}
+        for item in items:
+            status = self.statuses.get(item.params["flight_number"], "on time")
+            results[item.key] = {
+                "status": f"Flight {item.name} is {status}.",
+                "alert": status != "on time",
+            }
+        return results
+
+
+class FakeBookingProvider(StatusProvider):
+    """Reports every booking confirmed, unless its venue is listed as closed."""
+
+    kind = "booking"
+
+    def __init__(self, closed: Tuple[str, ...] = ("Space Needle",)):
+        self.closed = tuple(closed)
+        self.batches: List[List[CheckItem]] = []
+
+    async def check_many(self, items: List[CheckItem]) -> Dict[str, Dict[str, Any]]:
+        self.batches.append(items)
+        results = {}
+        for item in items:
+            if any(venue in item.name for venue in self.closed):
+                results[item.key] = {"status": f"{item.name} is closed.", "alert": True}
+            else:
+                results[item.key] = {
+                    "status": f"{item.name} is confirmed.",
+                    "alert": False,
+                }
+        return results
+
+
+class FakeWeatherProvider(StatusProvider):
+    """Reports clear weather, unless a forecast is set for the date."""
+
+    kind = "weather"
+
+    def __init__(self, forecasts: Optional[Dict[str, str]] = None):
+        self.forecasts = dict(forecasts or {})
+        self.batches: List[List[CheckItem]] = []
+
+    async def check_many(self, items: List[CheckItem]) -> Dict[str, Dict[str, Any]]:
+        self.batches.append(items)
+        results = {}
+        for item in items:
+            forecast = self.forecasts.get(item.date, "clear")
+            results[item.key] = {
+                "status": f"Forecast for {item.name} on {item.date}: {forecast}.",
+                "alert": forecast in BAD_WEATHER,
+            }
+        return results
+
+
+def collect_checks(state: Dict[str, Any]) -> List[CheckItem]:
+    """
+    Lists the checks for all itinerary events from the current time onwards.
+
+    Args:
+        state: The session state, holding the itinerary.
+
+    Returns:
+        Flight checks for flights, booking checks for other events that
+        require booking, and weather checks for visits.
+    """
+    itinerary = state.get(constants.ITIN_KEY) or {}
+    timeline = get_state_timeline(state)
+    try:
+        current = datetime.fromisoformat(
+            state.get(constants.ITIN_DATETIME) or itinerary.get(constants.START_DATE)
+        )
+    except (TypeError, ValueError):  # No or unknown current time: check all.
+        current = datetime.min
+    events = timeline.events_from(current)
+
+    checks = []
+    for event_date, event in events:
+        name = event.get("description", "")
+        if event.get("event_type") == "flight":
+            checks.append(
+                CheckItem(
+                    kind="flight",
+                    key=f"flight:{event.get('flight_number')}:{event_date}",
+                    name=event.get("flight_number", name),
+                    date=event_date,
+                    params={
+                        "flight_number": event.get("flight_number"),
+                        "boarding_time": event.get("boarding_time"),
+                        "departure_time": event.get("departure_time"),
+                    },
+                )
+            )
+        elif event.get("booking_required"):
+            checks.append(
+                CheckItem(
+                    kind="booking",
+                    key=f"booking:{event.get('booking_id') or name}:{event_date}",
+                    name=name,
+                    date=event_date,
+                    params={"booking_id": event.get("booking_id")},
+                )
+            )
+        if event.get("event_type") == "visit":
+            location = event.get("location") or {}
+            checks.append(
+                CheckItem(
+                    kind="weather",
+                    key=f"weather:{name}:{event_date}",
+                    name=name,
+                    date=event_date,
+                    params={
+                        "address": location.get("address"),
+                        "latitude": location.get("latitude"),
+                        "longitude": location.get("longitude"),
+                        "start_time": event.get("start_time"),
+                    },
+                )
+            )
+    return checks
+
+
+class TripMonitor:
+    """Runs batched, cached status checks over an itinerary."""
+
+    def __init__(
+        self,
+        providers: List[StatusProvider],
+        cache_ttl_secs: int = MONITOR_CACHE_TTL_SECS,
+        cache_max_entries: int = MONITOR_CACHE_MAX_ENTRIES,
+    ):
+        self.providers = {provider.kind: provider for provider in providers}
+        self.cache_ttl_secs = cache_ttl_secs
+        self.cache_max_entries = cache_max_entries
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _cache_put(self, fingerprint: str, expires: float, result: Dict[str, Any]):
+        """Caches a result, dropping expired entries and the least recently used ones."""
+        now = time.time()
+        for key in [key for key, (at, _) in self._cache.items() if at <= now]:
+            del self._cache[key]
+        self._cache[fingerprint] = (expires, result)
+        self._cache.move_to_end(fingerprint)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    async def _check(
+        self, provider: StatusProvider, items: List[CheckItem]
+    ) -> Dict[str, Dict[str, Any]]:
+        try:
+            results = await provider.check_many(items)
+        except Exception as e:  # One failing provider must not stop the pass.
+            return {
+                item.key: {"status": f"Check failed: {e}", "alert": False, "error": True}
+                for item in items
+            }
+        expires = time.time() + self.cache_ttl_secs
+        for item in items:
+            if item.key in results:
+                self._cache_put(item.fingerprint(), expires, results[item.key])
+        return results
+
+    async def run_once(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Checks all upcoming events once.
+
+        Args:
+            state: The session state, holding the itinerary and the results of
+                the previous pass.
+
+        Returns:
+            The state delta: empty if no status changed, otherwise the updated
+            constants.TRIP_STATUS and the constants.TRIP_ALERTS of this pass.
+            A pass without changes still clears the alerts of the previous one.
+        """
+        now = time.time()
+        results: Dict[str, Dict[str, Any]] = {}
+        batches: Dict[str, List[CheckItem]] = {}
+        checks = [c for c in collect_checks(state) if c.kind in self.providers]
+        for check in checks:
+            cached = self._cache.get(check.fingerprint())
+            if cached and cached[0] > now:
+                self._cache.move_to_end(check.fingerprint())
+                results[check.key] = cached[1]
+            else:
+                batches.setdefault(check.kind, []).append(check)
+
+        batch_results = await asyncio.gather(
+            *(self._check(self.providers[kind], items) for kind, items in batches.items())
+        )
+        for batch_result in batch_results:
+            results.update(batch_result)
+
+        previous = state.get(constants.TRIP_STATUS) or {}
+        status = {}
+        changed = []
+        for check in checks:
+            if check.key not in results:
+                continue
+            entry = {
+                "kind": check.kind,
+                "name": check.name,
+                "date": check.date,
+                **results[check.key],
+            }
+            status[check.key] = entry
+            if previous.get(check.key) != entry:
+                changed.append(entry)
+
+        if not changed and status.keys() == previous.keys():
+            if state.get(constants.TRIP_ALERTS):
+                return {constants.TRIP_ALERTS: []}
+            return {}
+        return {
+            constants.TRIP_STATUS: status,
+            constants.TRIP_ALERTS: [entry for entry in changed if entry["alert"]],
+        }
+
+
+async def monitor_session(
+    monitor: TripMonitor,
+    session_service: BaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    interval_secs: int = MONITOR_INTERVAL_SECS,
+    max_passes: Optional[int] = None,
+):
+    """
+    Monitors the itinerary of a session on a schedule, outside of any turn.
+
+    Each pass that changes a status or clears alerts appends one event to the
+    session, carrying only the state delta.
+
+    Args:
+        monitor: The trip monitor.
+        session_service: The session service holding the session.
+        app_name: The app name of the session.
+        user_id: The user id of the session.
+        session_id: The id of the session.
+        interval_secs: Seconds between passes.
+        max_passes: Stop after this many passes; run until cancelled if None.
+    """
+    passes = 0
+    while max_passes is None or passes < max_passes:
+        session = await session_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            return
+        delta = await monitor.run_once(session.state)
+        if delta:
+            await session_service.append_event(
+                session,
+                Event(author="trip_monitor", actions=EventActions(state_delta=delta)),
+            )
+        passes += 1
+        if max_passes is None or passes < max_passes:
+            await asyncio.sleep(interval_secs)
+
+
+# Swap in real providers with the same interface for production use.
+trip_monitor = TripMonitor(
+    [FakeFlightStatusProvider(), FakeBookingProvider(), FakeWeatherProvider()]
+)
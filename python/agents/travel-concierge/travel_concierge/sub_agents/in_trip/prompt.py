@@ -28,15 +28,13 @@ and the user profile:
 If the itinerary is empty, inform the user that you can help once there is an itinerary, and asks to transfer the user back to the `inspiration_agent`.
 Otherwise, follow the rest of the instruction.
 
-Identify these type of events, and note their details:
-- Flights: note flight number, date, check-in time and departure time.
-- Events that requires booking: note the event name, date and location.
-- Activities or visits that may be impacted by weather: note date, location and desired weather.
-
-For each identified events, checks their status using tools:s
-- flights delays or cancelations - use `flight_status_check`
-- events that requires booking - use `event_booking_check`
-- outdoor activities that may be affected by weather, weather forecasts - use `weather_impact`
+Check the status of the upcoming events by calling `trip_monitor_check` once. It checks all of them in one go:
+- flights delays or cancelations
+- events that requires booking
+- outdoor activities that may be affected by weather, weather forecasts
+
+Each check comes with a status, and an alert flag for checks that need the user's attention.
+Alerts under `new_alerts` have appeared since the previous check.
 
 Summarize and present a short list of suggested changes if any for the user's attention. For example:
 - Flight XX123 is cancelled, suggest rebooking.
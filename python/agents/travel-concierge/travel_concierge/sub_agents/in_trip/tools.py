@@ -15,55 +15,39 @@
 """Tools for the in_trip, trip_monitor and day_of agents."""
 
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools import ToolContext
 
 from travel_concierge.sub_agents.in_trip import prompt
 from travel_concierge.shared_libraries import constants
+from travel_concierge.sub_agents.in_trip.monitor import trip_monitor
+from travel_concierge.shared_libraries.timeline import event_time, get_timeline
 
 
-def flight_status_check(flight_number: str, flight_date: str, checkin_time: str, departure_time: str):
-    """Checks the status of a flight, given its flight_number, date, checkin_time and departure_time."""
-    print("Checking", flight_number, flight_date, checkin_time, departure_time)
-    return {"status": f"Flight {flight_number} checked"}
-
-
-def event_booking_check(event_name: str, event_date: str, event_location: str):
-    """Checks the status of an event that requires booking, given its event_name, date, and event_location."""
-    print("Checking", event_name, event_date, event_location)
-    if event_name.startswith("Space Needle"):  # Mocking an exception to illustrate
-        return {"status": f"{event_name} is closed."}
-    return {"status": f"{event_name} checked"}
-
-
-def weather_impact_check(activity_name: str, activity_date: str, activity_location: str):
+async def trip_monitor_check(tool_context: ToolContext):
     """
-    Checks the status of an outdoor activity that may be impacted by weather, given its name, date, and its location.
+    Checks the status of all upcoming flights, bookings and weather-sensitive activities of the itinerary at once.
 
     Args:
-        activity_name: The name of the activity.
-        activity_date: The date of the activity.
-        activity_location: The location of the activity.
+        tool_context: The ADK tool context.
 
     Returns:
-        A dictionary containing the status of the activity.
+        A dictionary with the status of every check, and the alerts that are new since the last check.
     """
-    print("Checking", activity_name, activity_date, activity_location)
-    return {"status": f"{activity_name} checked"}
+    delta = await trip_monitor.run_once(tool_context.state)
+    tool_context.state.update(delta)
+    status = tool_context.state.get(constants.TRIP_STATUS) or {}
+    return {
+        "checks": list(status.values()),
+        "new_alerts": delta.get(constants.TRIP_ALERTS, []),
+    }
 
 
 def get_event_time_as_destination(destin_json: Dict[str, Any], default_value: str):
     """Returns an event time appropriate for the location type."""
-    match destin_json["event_type"]:
-        case "flight":
-            return destin_json["boarding_time"]
-        case "hotel":
-            return destin_json["check_in_time"]
-        case "visit":
-            return destin_json["start_time"]
-        case _:
-            return default_value
+    return event_time(destin_json) or default_value
 
 
 def parse_as_origin(origin_json: Dict[str, Any]):
@@ -124,7 +108,12 @@ def parse_as_destin(destin_json: Dict[str, Any]):
             return "Local in the region", "as soon as possible"
 
 
-def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_datetime: str):
+def find_segment(
+    profile: Dict[str, Any],
+    itinerary: Dict[str, Any],
+    current_datetime: str,
+    itinerary_version: Optional[str] = None,
+):
     """
     Find the events to travel from A to B
     This follows the itinerary schema in types.Itinerary.
@@ -135,7 +124,9 @@ def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_dat
     Args:
         profile: A dictionary containing the user's profile.
         itinerary: A dictionary containing the user's itinerary.
-        current_datetime: A string containing the current date and time.   
+        current_datetime: A string containing the current date and time.
+        itinerary_version: The itinerary version token from the session state;
+            the itinerary's timeline index is reused while it is unchanged.
 
     Returns:
       from - capture information about the origin of this segment.
@@ -143,41 +134,14 @@ def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_dat
       arrive_by - an indication of the time we shall arrive at the destination.
     """
     # Expects current_datetime is in '2024-03-15 04:00:00' format
-    datetime_object = datetime.fromisoformat(current_datetime)
-    current_date = datetime_object.strftime("%Y-%m-%d")
-    current_time = datetime_object.strftime("%H:%M")
-    event_date = current_date
-    event_time = current_time
-
-    print("-----")
-    print("MATCH DATE", current_date, current_time)
-    print("-----")
-
-    # defaults
-    origin_json = profile["home"]
-    destin_json = profile["home"]
-
-    leave_by = "No movement required"
-    arrive_by = "No movement required"
-
-    # Go through the itinerary to find where we are base on the current date and time
-    for day in itinerary.get("days", []):
-        event_date = day["date"]
-        for event in day["events"]:
-            # for every event we update the origin and destination until
-            # we find one we need to pay attention
-            origin_json = destin_json
-            destin_json = event
-            event_time = get_event_time_as_destination(destin_json, current_time)
-            # The moment we find an event that's in the immediate future we stop to handle it
-            print(
-                event["event_type"], event_date, current_date, event_time, current_time
-            )
-            if event_date >= current_date and event_time >= current_time:
-                break
-        else:  # if inner loop not break, continue
-            continue
-        break  # else break too.
+    timeline = get_timeline(itinerary, itinerary_version)
+    origin_json, destin_json = timeline.find_segment(
+        datetime.fromisoformat(current_datetime)
+    )
+
+    # Default to home for the ends of the trip
+    origin_json = origin_json or profile["home"]
+    destin_json = destin_json or profile["home"]
 
     #
     # Construct prompt descriptions for travel_from, travel_to, arrive_by
@@ -193,7 +157,6 @@ def _inspect_itinerary(state: dict[str: Any]):
 
     itinerary = state[constants.ITIN_KEY]
     profile = state[constants.PROF_KEY]
-    print("itinerary", itinerary)
     current_datetime = itinerary["start_date"] + " 00:00"
     if state.get(constants.ITIN_DATETIME, ""):
         current_datetime = state[constants.ITIN_DATETIME]
@@ -212,19 +175,9 @@ def transit_coordination(readonly_context: ReadonlyContext):
 
     itinerary, profile, current_datetime = _inspect_itinerary(state)
     travel_from, travel_to, leave_by, arrive_by = find_segment(
-        profile, itinerary, current_datetime
+        profile, itinerary, current_datetime, state.get(constants.ITIN_VERSION)
     )
 
-    print("-----")
-    print(itinerary["trip_name"])
-    print(current_datetime)
-    print("-----")
-    print("-----")
-    print("TRIP EVENT")
-    print("FROM", travel_from, leave_by)
-    print("TO", travel_to, arrive_by)
-    print("-----")
-
     return prompt.LOGISTIC_INSTR_TEMPLATE.format(
         CURRENT_TIME=current_datetime,
         TRAVEL_FROM=travel_from,
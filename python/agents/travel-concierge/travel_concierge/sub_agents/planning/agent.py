@@ -18,8 +18,9 @@ from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 from google.genai.types import GenerateContentConfig
 from travel_concierge.shared_libraries import types
+from travel_concierge.shared_libraries.state_json import instruction_provider
 from travel_concierge.sub_agents.planning import prompt
-from travel_concierge.tools.memory import memorize
+from travel_concierge.tools.memory import bump_itinerary_version, memorize
 
 
 itinerary_agent = Agent(
@@ -32,6 +33,7 @@ itinerary_agent = Agent(
     output_schema=types.Itinerary,
     output_key="itinerary",
     generate_content_config=types.json_response_config,
+    after_agent_callback=bump_itinerary_version,
 )
 
 
@@ -39,7 +41,7 @@ hotel_room_selection_agent = Agent(
     model="gemini-2.5-flash",
     name="hotel_room_selection_agent",
     description="Help users with the room choices for a hotel",
-    instruction=prompt.HOTEL_ROOM_SELECTION_INSTR,
+    instruction=instruction_provider(prompt.HOTEL_ROOM_SELECTION_INSTR),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=types.RoomsSelection,
@@ -64,7 +66,7 @@ flight_seat_selection_agent = Agent(
     model="gemini-2.5-flash",
     name="flight_seat_selection_agent",
     description="Help users with the seat choices",
-    instruction=prompt.FLIGHT_SEAT_SELECTION_INSTR,
+    instruction=instruction_provider(prompt.FLIGHT_SEAT_SELECTION_INSTR),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=types.SeatsSelection,
@@ -89,7 +91,7 @@ planning_agent = Agent(
     model="gemini-2.5-flash",
     description="""Helps users with travel planning, complete a full itinerary for their vacation, finding best deals for flights and hotels.""",
     name="planning_agent",
-    instruction=prompt.PLANNING_AGENT_INSTR,
+    instruction=instruction_provider(prompt.PLANNING_AGENT_INSTR),
     tools=[
         AgentTool(agent=flight_search_agent),
         AgentTool(agent=flight_seat_selection_agent),
@@ -16,13 +16,14 @@
 
 from google.adk.agents import Agent
 
+from travel_concierge.shared_libraries.state_json import instruction_provider
 from travel_concierge.sub_agents.post_trip import prompt
-from travel_concierge.tools.memory import memorize
+from travel_concierge.tools.memory import forget_many, memorize, memorize_many
 
 post_trip_agent = Agent(
     model="gemini-2.5-flash",
     name="post_trip_agent",
     description="A follow up agent to learn from user's experience; In turn improves the user's future trips planning and in-trip experience.",
-    instruction=prompt.POSTTRIP_INSTR,
-    tools=[memorize],
+    instruction=instruction_provider(prompt.POSTTRIP_INSTR),
+    tools=[memorize, memorize_many, forget_many],
 )
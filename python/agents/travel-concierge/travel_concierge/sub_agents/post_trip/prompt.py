@@ -39,6 +39,9 @@ From user's answers, extract the following types of information and use it in th
 - Business reviews and recommendations
 
 For every individually identified preferences, store their values using the `memorize` tool.
+To add several values to a list of the user profile at once, use the `memorize_many` tool with the key `user_profile.likes`,
+`user_profile.dislikes`, `user_profile.allergies` or `user_profile.price_sensitivity`;
+to remove values the user no longer holds from those lists, use the `forget_many` tool with the same key.
 
 Finally, thank the user, and express that these feedback will be incorporated into their preferences for next time!
 """
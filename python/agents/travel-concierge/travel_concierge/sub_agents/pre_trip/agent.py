@@ -17,6 +17,7 @@
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 from travel_concierge.shared_libraries import types
+from travel_concierge.shared_libraries.state_json import instruction_provider
 from travel_concierge.sub_agents.pre_trip import prompt
 from travel_concierge.tools.search import google_search_grounding
 
@@ -36,6 +37,6 @@ pre_trip_agent = Agent(
     model="gemini-2.5-flash",
     name="pre_trip_agent",
     description="Given an itinerary, this agent keeps up to date and provides relevant travel information to the user before the trip.",
-    instruction=prompt.PRETRIP_AGENT_INSTR,
+    instruction=instruction_provider(prompt.PRETRIP_AGENT_INSTR),
     tools=[google_search_grounding, AgentTool(agent=what_to_pack_agent)],
 )
@@ -14,16 +14,25 @@
 
 """The 'memorize' tool for several agents to affect session states."""
 
+import copy
 from datetime import datetime
+import functools
 import json
 import os
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
 
 from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.list_memory import (
+    LIST_MEMORY_CAPACITY,
+    ListMemory,
+)
+from travel_concierge.shared_libraries.state_json import STRUCTURED_KEYS, parse_value
+from travel_concierge.shared_libraries.timeline import new_itinerary_version
 
 SAMPLE_SCENARIO_PATH = os.getenv(
     "TRAVEL_CONCIERGE_SCENARIO", "travel_concierge/profiles/itinerary_empty_default.json"
@@ -42,14 +51,64 @@ def memorize_list(key: str, value: str, tool_context: ToolContext):
     Returns:
         A status message.
     """
-    mem_dict = tool_context.state
-    if key not in mem_dict:
-        mem_dict[key] = []
-    if value not in mem_dict[key]:
-        mem_dict[key].append(value)
+    result = memorize_many(key, [value], tool_context)
+    if "error" in result:
+        return result
     return {"status": f'Stored "{key}": "{value}"'}
 
 
+def _get_list_value(state: State | dict[str, Any], key: str) -> Any:
+    """Returns the value of a key, or of a "parent.field" key, e.g. "user_profile.likes"."""
+    parent, _, field = key.partition(".")
+    if not field:
+        return state.get(key)
+    container = state.get(parent)
+    if container is not None and not isinstance(container, dict):
+        raise ValueError(f'"{parent}" is not a dictionary.')
+    return (container or {}).get(field)
+
+
+def _set_list_value(state: State | dict[str, Any], key: str, values: List[Any]):
+    parent, _, field = key.partition(".")
+    # Assign rather than mutate in place, so the change is part of the state delta.
+    if not field:
+        state[key] = values
+    else:
+        state[parent] = {**(state.get(parent) or {}), field: values}
+
+
+def _load_list_memory(
+    state: State | dict[str, Any], key: str, capacity: int | None = None
+) -> ListMemory:
+    value = _get_list_value(state, key)
+    if value is not None and not isinstance(value, (list, tuple)):
+        raise ValueError(f'"{key}" holds a single value, not a list; use memorize instead.')
+    return ListMemory.from_state(value, capacity)
+
+
+def memorize_many(key: str, values: List[str], tool_context: ToolContext):
+    """
+    Memorize many pieces of information in the same list at once.
+
+    Args:
+        key: the label indexing the list to store the values in, or
+            "user_profile.<field>" for a list of the user profile, e.g.
+            "user_profile.likes".
+        values: the pieces of information to be stored.
+        tool_context: The ADK tool context.
+
+    Returns:
+        A status message.
+    """
+    try:
+        memory = _load_list_memory(tool_context.state, key, LIST_MEMORY_CAPACITY)
+    except ValueError as e:
+        return {"status": "error", "error": str(e)}
+    added = memory.add_many(values)
+    _set_list_value(tool_context.state, key, memory.to_state())
+    return {"status": f'Stored {added} new value(s) under "{key}"'}
+
+
 def memorize(key: str, value: str, tool_context: ToolContext):
     """
     Memorize pieces of information, one key-value pair at a time.
@@ -63,7 +122,12 @@ def memorize(key: str, value: str, tool_context: ToolContext):
         A status message.
     """
     mem_dict = tool_context.state
+    if key in STRUCTURED_KEYS and isinstance(value, str):
+        # Keep structured values as dicts, like the agents' output_key does.
+        value = parse_value(value)
     mem_dict[key] = value
+    if key == constants.ITIN_KEY:
+        mem_dict[constants.ITIN_VERSION] = new_itinerary_version()
     return {"status": f'Stored "{key}": "{value}"'}
 
 
@@ -79,14 +143,57 @@ def forget(key: str, value: str, tool_context: ToolContext):
     Returns:
         A status message.
     """
-    if tool_context.state[key] is None:
-        tool_context.state[key] = []
-    if value in tool_context.state[key]:
-        tool_context.state[key].remove(value)
+    result = forget_many(key, [value], tool_context)
+    if "error" in result:
+        return result
     return {"status": f'Removed "{key}": "{value}"'}
 
 
-def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
+def forget_many(key: str, values: List[str], tool_context: ToolContext):
+    """
+    Forget many pieces of information from the same list at once.
+
+    Args:
+        key: the label indexing the list to remove the values from, or
+            "user_profile.<field>" for a list of the user profile, e.g.
+            "user_profile.dislikes".
+        values: the pieces of information to be removed.
+        tool_context: The ADK tool context.
+
+    Returns:
+        A status message.
+    """
+    try:
+        memory = _load_list_memory(tool_context.state, key)
+    except ValueError as e:
+        return {"status": "error", "error": str(e)}
+    removed = memory.remove_many(values)
+    if removed or _get_list_value(tool_context.state, key) is None:
+        _set_list_value(tool_context.state, key, memory.to_state())
+    return {"status": f'Removed {removed} value(s) from "{key}"'}
+
+
+@functools.lru_cache(maxsize=8)
+def _read_scenario(path: str, mtime: float) -> Mapping[str, Any]:
+    # The mtime is part of the cache key, so an edited file is read again.
+    with open(path, "r") as file:
+        return MappingProxyType(json.load(file)["state"])
+
+
+def load_scenario(path: str) -> Mapping[str, Any]:
+    """
+    Returns the initial states of a scenario file, parsed once per file version.
+
+    Args:
+        path: The path of the scenario JSON file.
+
+    Returns:
+        A read-only mapping of the states; do not modify the values.
+    """
+    return _read_scenario(path, os.path.getmtime(path))
+
+
+def _set_initial_states(source: Mapping[str, Any], target: State | dict[str, Any]):
     """
     Setting the initial session state given a JSON object of states.
 
@@ -100,13 +207,27 @@ def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
     if constants.ITIN_INITIALIZED not in target:
         target[constants.ITIN_INITIALIZED] = True
 
-        target.update(source)
+        # Tools update state values in place, so each session gets its own copy.
+        target.update(copy.deepcopy(dict(source)))
 
         itinerary = source.get(constants.ITIN_KEY, {})
         if itinerary:
             target[constants.ITIN_START_DATE] = itinerary[constants.START_DATE]
             target[constants.ITIN_END_DATE] = itinerary[constants.END_DATE]
             target[constants.ITIN_DATETIME] = itinerary[constants.START_DATE]
+            target[constants.ITIN_VERSION] = new_itinerary_version()
+
+
+def bump_itinerary_version(callback_context: CallbackContext):
+    """
+    Marks the itinerary as replaced.
+    Set this as the after_agent_callback of agents that write the itinerary
+    through their output_key.
+
+    Args:
+        callback_context: The callback context.
+    """
+    callback_context.state[constants.ITIN_VERSION] = new_itinerary_version()
 
 
 def _load_precreated_itinerary(callback_context: CallbackContext):
@@ -117,10 +238,10 @@ def _load_precreated_itinerary(callback_context: CallbackContext):
 
     Args:
         callback_context: The callback context.
-    """    
-    data = {}
-    with open(SAMPLE_SCENARIO_PATH, "r") as file:
-        data = json.load(file)
-        print(f"\nLoading Initial State: {data}\n")
+    """
+    state = callback_context.state
+    if constants.ITIN_INITIALIZED in state:
+        return  # Only the first turn of a session seeds the state.
 
-    _set_initial_states(data["state"], callback_context.state)
+    print(f"\nLoading Initial State: {SAMPLE_SCENARIO_PATH}\n")
+    _set_initial_states(load_scenario(SAMPLE_SCENARIO_PATH), state)
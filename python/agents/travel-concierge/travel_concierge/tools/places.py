@@ -14,16 +14,95 @@
 
 """Wrapper to Google Maps Places API."""
 
+import asyncio
+import json
 import os
-from typing import Dict, List, Any
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, List, Any, Optional
 
 from google.adk.tools import ToolContext
-import requests
+import httpx
+
+
+PLACES_API_URL = os.getenv(
+    "GOOGLE_PLACES_API_URL", "https://maps.googleapis.com/maps/api/place"
+)
+GEOCODE_CACHE_PATH = os.getenv(
+    "TRAVEL_CONCIERGE_GEOCODE_CACHE",
+    os.path.join(tempfile.gettempdir(), "travel_concierge_geocode.sqlite"),
+)
+GEOCODE_CACHE_TTL_SECS = int(
+    os.getenv("TRAVEL_CONCIERGE_GEOCODE_CACHE_TTL_SECS", str(30 * 24 * 3600))
+)
+MAX_CONCURRENT_REQUESTS = 8
+REQUEST_TIMEOUT_SECS = 10
+
+
+def normalize_query(query: str) -> str:
+    """Normalizes a "name, address" query so equivalent queries share a cache entry."""
+    parts = (" ".join(part.split()) for part in query.casefold().split(","))
+    return ", ".join(part for part in parts if part)
+
+
+class GeocodeCache:
+    """A persistent SQLite cache of place lookups, with a TTL per entry."""
+
+    def __init__(self, path: str, ttl_secs: int):
+        self.ttl_secs = ttl_secs
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode"
+                " (query TEXT PRIMARY KEY, place TEXT, expires REAL)"
+            )
+
+    def get_many(self, queries: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Returns the unexpired cached places for the given normalized queries."""
+        if not queries:
+            return {}
+        placeholders = ",".join("?" * len(queries))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT query, place FROM geocode"
+                f" WHERE query IN ({placeholders}) AND expires > ?",
+                [*queries, time.time()],
+            ).fetchall()
+        return {query: json.loads(place) for query, place in rows}
+
+    def put_many(self, places: Dict[str, Dict[str, Any]]):
+        """Stores places keyed by normalized query."""
+        expires = time.time() + self.ttl_secs
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?)",
+                [
+                    (query, json.dumps(place), expires)
+                    for query, place in places.items()
+                ],
+            )
 
 
 class PlacesService:
     """Wrapper to Placees API."""
 
+    def __init__(
+        self,
+        places_url: str = PLACES_API_URL,
+        cache: Optional[GeocodeCache] = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ):
+        self.places_url = places_url
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def _check_key(self):
         if (
             not hasattr(self, "places_api_key") or not self.places_api_key
@@ -31,49 +110,105 @@ class PlacesService:
             # https://developers.google.com/maps/documentation/places/web-service/get-api-key
             self.places_api_key = os.getenv("GOOGLE_PLACES_API_KEY")
 
-    def find_place_from_text(self, query: str) -> Dict[str, str]:
-        """Fetches place details using a text query."""
-        self._check_key()
-        places_url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
+    def _get_client(self) -> httpx.AsyncClient:
+        """Returns a pooled client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=REQUEST_TIMEOUT_SECS,
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def _fetch_place(self, query: str) -> Dict[str, Any]:
+        """Calls the Find Place API and returns the first candidate, uncached."""
         params = {
             "input": query,
             "inputtype": "textquery",
             "fields": "place_id,formatted_address,name,photos,geometry",
             "key": self.places_api_key,
         }
-
         try:
-            response = requests.get(places_url, params=params)
+            response = await self._get_client().get(
+                f"{self.places_url}/findplacefromtext/json", params=params
+            )
             response.raise_for_status()
             place_data = response.json()
-
-            if not place_data.get("candidates"):
-                return {"error": "No places found."}
-
-            # Extract data for the first candidate
-            place_details = place_data["candidates"][0]
-            place_id = place_details["place_id"]
-            place_name = place_details["name"]
-            place_address = place_details["formatted_address"]
-            photos = self.get_photo_urls(place_details.get("photos", []), maxwidth=400)
-            map_url = self.get_map_url(place_id)
-            location = place_details["geometry"]["location"]
-            lat = str(location["lat"])
-            lng = str(location["lng"])
-
-            return {
-                "place_id": place_id,
-                "place_name": place_name,
-                "place_address": place_address,
-                "photos": photos,
-                "map_url": map_url,
-                "lat": lat,
-                "lng": lng,
-            }
-
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             return {"error": f"Error fetching place data: {e}"}
 
+        if not place_data.get("candidates"):
+            return {"error": "No places found."}
+
+        # Extract data for the first candidate
+        place_details = place_data["candidates"][0]
+        location = place_details["geometry"]["location"]
+        return {
+            "place_id": place_details["place_id"],
+            "place_name": place_details["name"],
+            "place_address": place_details["formatted_address"],
+            # Photo references are cached rather than URLs, which embed the key.
+            "photo_references": [
+                photo["photo_reference"]
+                for photo in place_details.get("photos", [])
+            ],
+            "lat": str(location["lat"]),
+            "lng": str(location["lng"]),
+        }
+
+    def _to_result(self, place: Dict[str, Any]) -> Dict[str, Any]:
+        if "error" in place:
+            return place
+        result = {k: v for k, v in place.items() if k != "photo_references"}
+        result["photos"] = self.get_photo_urls(
+            [{"photo_reference": ref} for ref in place["photo_references"]],
+            maxwidth=400,
+        )
+        result["map_url"] = self.get_map_url(place["place_id"])
+        return result
+
+    async def find_places_from_text(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetches place details for many text queries at once.
+
+        Queries are deduplicated after normalization, served from the geocode
+        cache where possible, and the remaining ones are fetched concurrently.
+
+        Args:
+            queries: Text queries, e.g. "name, address".
+
+        Returns:
+            One result per query, in order; failed lookups hold an "error" key.
+        """
+        self._check_key()
+        keys = [normalize_query(q) for q in queries]
+        unique = dict(zip(keys, queries))
+        places = self.cache.get_many(list(unique)) if self.cache else {}
+
+        missing = [key for key in unique if key not in places]
+        if missing:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def fetch(key: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._fetch_place(unique[key])
+
+            fetched = dict(
+                zip(missing, await asyncio.gather(*(fetch(k) for k in missing)))
+            )
+            places.update(fetched)
+            if self.cache:
+                self.cache.put_many(
+                    {k: v for k, v in fetched.items() if "error" not in v}
+                )
+
+        return [self._to_result(places[key]) for key in keys]
+
+    async def find_place_from_text(self, query: str) -> Dict[str, Any]:
+        """Fetches place details using a text query."""
+        return (await self.find_places_from_text([query]))[0]
+
     def get_photo_urls(self, photos: List[Dict[str, Any]], maxwidth: int = 400) -> List[str]:
         """Extracts photo URLs from the 'photos' list."""
         photo_urls = []
@@ -88,18 +223,20 @@ class PlacesService:
 
 
 # Google Places API
-places_service = PlacesService()
+places_service = PlacesService(
+    cache=GeocodeCache(GEOCODE_CACHE_PATH, GEOCODE_CACHE_TTL_SECS)
+)
 
 
-def map_tool(key: str, tool_context: ToolContext):
+async def map_tool(key: str, tool_context: ToolContext):
     """
     This is going to inspect the pois stored under the specified key in the state.
-    One by one it will retrieve the accurate Lat/Lon from the Map API, if the Map API is available for use.
+    It will retrieve the accurate Lat/Lon of all of them from the Map API at once, if the Map API is available for use.
 
     Args:
         key: The key under which the POIs are stored.
         tool_context: The ADK tool context.
-        
+
     Returns:
         The updated state with the full JSON object under the key.
     """
@@ -111,9 +248,10 @@ def map_tool(key: str, tool_context: ToolContext):
         tool_context.state[key]["places"] = []
 
     pois = tool_context.state[key]["places"]
-    for poi in pois:  # The pydantic object types.POI
-        location = poi["place_name"] + ", " + poi["address"]
-        result = places_service.find_place_from_text(location)
+    results = await places_service.find_places_from_text(
+        [poi["place_name"] + ", " + poi["address"] for poi in pois]
+    )
+    for poi, result in zip(pois, results):  # The pydantic object types.POI
         # Fill the place holders with verified information.
         poi["place_id"] = result["place_id"] if "place_id" in result else None
         poi["map_url"] = result["map_url"] if "map_url" in result else None
@@ -14,11 +14,118 @@
 
 """Wrapper to Google Search Grounding with custom prompt."""
 
+from collections import OrderedDict
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
 from google.adk.agents import Agent
+from google.adk.tools import ToolContext
 from google.adk.tools.agent_tool import AgentTool
 
 from google.adk.tools.google_search_tool import google_search
 
+from travel_concierge.shared_libraries import constants
+
+SEARCH_CACHE_TTL_SECS = int(
+    os.getenv("TRAVEL_CONCIERGE_SEARCH_CACHE_TTL_SECS", str(6 * 3600))
+)
+SEARCH_CACHE_MAX_ENTRIES = int(
+    os.getenv("TRAVEL_CONCIERGE_SEARCH_CACHE_MAX_ENTRIES", "1024")
+)
+# Answers are only shared within the same date bucket, e.g. the same day.
+SEARCH_CACHE_BUCKET_SECS = 24 * 3600
+
+
+def normalize_question(question: str) -> str:
+    """Normalizes case, whitespace and trailing punctuation of a question."""
+    return " ".join(question.casefold().split()).rstrip(" ?.!")
+
+
+class AnswerCache:
+    """A thread-safe LRU cache of answers with a TTL, and hit/miss metrics."""
+
+    def __init__(self, ttl_secs: int, max_entries: int):
+        self.ttl_secs = ttl_secs
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, ...], Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple[str, ...]) -> Optional[Any]:
+        """Returns the unexpired answer for the key, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple[str, ...], answer: Any):
+        """Stores an answer, evicting the least recently used ones beyond max_entries."""
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_secs, answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit/miss metrics and the current size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+class CachedAgentTool(AgentTool):
+    """
+    An AgentTool whose answers are cached across sessions.
+
+    Answers are keyed by the normalized request, the user's locale and the
+    date bucket; only use it for agents that do not write session state.
+    """
+
+    def __init__(self, agent: Agent, cache: AnswerCache):
+        super().__init__(agent=agent)
+        self._cache = cache
+
+    @property
+    def cache(self) -> AnswerCache:
+        return self._cache
+
+    def cache_key(self, args: Dict[str, Any], tool_context: ToolContext) -> Tuple[str, ...]:
+        """Returns the cache key of a request."""
+        # Answers to e.g. visa questions depend on the traveler's nationality.
+        profile = tool_context.state.get(constants.PROF_KEY) or {}
+        locale = profile.get("passport_nationality", "") if isinstance(profile, dict) else ""
+        bucket = int(time.time() // SEARCH_CACHE_BUCKET_SECS)
+        return (
+            normalize_question(str(args.get("request", ""))),
+            str(locale),
+            str(bucket),
+        )
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: ToolContext) -> Any:
+        key = self.cache_key(args, tool_context)
+        answer = self._cache.get(key)
+        if answer is None:
+            answer = await super().run_async(args=args, tool_context=tool_context)
+            if answer:  # Do not cache failures to answer.
+                self._cache.put(key, answer)
+        return answer
+
+
 _search_agent = Agent(
     model="gemini-2.5-flash",
     name="google_search_grounding",
@@ -31,4 +138,6 @@ _search_agent = Agent(
     tools=[google_search],
 )
 
-google_search_grounding = AgentTool(agent=_search_agent)
+# The cache is shared by all sessions of the process.
+search_answer_cache = AnswerCache(SEARCH_CACHE_TTL_SECS, SEARCH_CACHE_MAX_ENTRIES)
+google_search_grounding = CachedAgentTool(agent=_search_agent, cache=search_answer_cache)